@@ -4,19 +4,22 @@ from typing import List
 from pydantic import BaseModel
 from typing import Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.account import GLAccountMaster, BudgetCodeMaster, CostCenterMaster
+from app.core.id_allocator import reserve_budget_code_ids
+from app.core.budget_code_cache import get_budget_code_tree, invalidate_budget_code_tree
+from app.core.versioning import etag_guard, bump_version
 from app.schemas.account import (
     GLAccount, GLAccountCreate, 
     BudgetCode, BudgetCodeCreate,
-    CostCenter, CostCenterCreate, BudgetCodeUpdatePayload
+    CostCenter, CostCenterCreate, BudgetCodeUpdatePayload, BudgetCodeNode
 )
 
 router = APIRouter()
 
 # --- G/L Account APIs ---
-@router.get("/gl", response_model=List[GLAccount])
-def read_gl_accounts(db: Session = Depends(get_db)):
+@router.get("/gl", response_model=List[GLAccount], dependencies=[Depends(etag_guard(GLAccountMaster.__tablename__))])
+def read_gl_accounts(db: Session = Depends(get_read_db)):
     return db.query(GLAccountMaster).filter(GLAccountMaster.is_active == 'Y').all()
 
 @router.post("/gl", response_model=GLAccount)
@@ -27,49 +30,30 @@ def create_gl_account(item: GLAccountCreate, db: Session = Depends(get_db)):
     
     new_item = GLAccountMaster(**item.model_dump())
     db.add(new_item)
+    bump_version(db, GLAccountMaster.__tablename__)
     db.commit()
     db.refresh(new_item)
     return new_item
 
 # --- Budget Code APIs ---
-@router.get("/budget-code", response_model=List[BudgetCode])
-def read_budget_codes(code_type: str = None, db: Session = Depends(get_db)):
-    query = db.query(BudgetCodeMaster).filter(BudgetCodeMaster.is_active == 'Y')
-    if code_type:
-        query = query.filter(BudgetCodeMaster.code_type == code_type)
-    return query.order_by(BudgetCodeMaster.sort_order).all()
+@router.get("/budget-code", response_model=List[BudgetCode], dependencies=[Depends(etag_guard(BudgetCodeMaster.__tablename__))])
+def read_budget_codes(code_type: str = None, db: Session = Depends(get_read_db)):
+    # 메모리 캐시에서 조회 (코드 변경 시에만 DB 재조회)
+    return get_budget_code_tree(db).flat_list(code_type=code_type)
+
+
+# 전체 계층 한 번에 조회 (L1 → L2, IT_TYPE 등)
+@router.get("/budget-code/tree", response_model=List[BudgetCodeNode], dependencies=[Depends(etag_guard(BudgetCodeMaster.__tablename__))])
+def read_budget_code_tree(include_inactive: bool = False, db: Session = Depends(get_read_db)):
+    return get_budget_code_tree(db).to_tree(active_only=not include_inactive)
 
 
 # BudgetCodeType에 따른 다음 코드 ID를 생성하는 헬퍼 함수
 def get_next_code_id(db: Session, code_type: str) -> str:
     """주어진 code_type에 기반하여 다음 순번의 code_id를 생성합니다."""
-    
-    # 해당 code_type의 가장 큰 code_id를 조회
-    # 예: code_type이 'BUDGET_L1'일 경우, 'BUDGET_L1_XXX' 형태에서 가장 큰 값을 찾습니다.
-    latest_code = db.query(BudgetCodeMaster).filter(
-        BudgetCodeMaster.code_type == code_type
-    ).order_by(
-        BudgetCodeMaster.code_id.desc()
-    ).first()
-
-    prefix = code_type.upper()
-    
-    if latest_code:
-        # 기존 ID에서 숫자 부분 추출 후 +1
-        try:
-            # 예: 'BUDGET_L1_005' -> 005 -> 6
-            last_num = int(latest_code.code_id.split('_')[-1])
-            next_num = last_num + 1
-        except ValueError:
-            # 파싱 실패 시 기본값 1
-            next_num = 1
-    else:
-        # 해당 type의 첫 번째 항목
-        next_num = 1
-        
-    # 새로운 ID 포맷: [TYPE]_[001]
-    # L1, L2, IT_TYPE 모두 동일한 포맷을 사용합니다.
-    return f"{prefix}_{next_num:03d}"
+    # 채번 테이블에서 원자적으로 발급 (동시 등록 시에도 중복 없음)
+    # 새로운 ID 포맷: [TYPE]_[001] - L1, L2, IT_TYPE 모두 동일한 포맷을 사용합니다.
+    return reserve_budget_code_ids(db, code_type, 1)[0]
 
 
 
@@ -96,13 +80,14 @@ def create_budget_code(item: BudgetCodeCreate, db: Session = Depends(get_db)):
     
     
     db.add(db_budget_code)
+    invalidate_budget_code_tree(db)
     db.commit()
     db.refresh(db_budget_code)
     return db_budget_code
 
 # --- [신규] Cost Center APIs ---
-@router.get("/cost-center", response_model=List[CostCenter])
-def read_cost_centers(db: Session = Depends(get_db)):
+@router.get("/cost-center", response_model=List[CostCenter], dependencies=[Depends(etag_guard(CostCenterMaster.__tablename__))])
+def read_cost_centers(db: Session = Depends(get_read_db)):
     return db.query(CostCenterMaster).filter(CostCenterMaster.is_active == 'Y').order_by(CostCenterMaster.cc_code).all()
 
 @router.post("/cost-center", response_model=CostCenter)
@@ -113,6 +98,7 @@ def create_cost_center(item: CostCenterCreate, db: Session = Depends(get_db)):
     
     new_item = CostCenterMaster(**item.model_dump())
     db.add(new_item)
+    bump_version(db, CostCenterMaster.__tablename__)
     db.commit()
     db.refresh(new_item)
     return new_item
@@ -145,6 +131,7 @@ def update_budget_code(
     if 'parent_code_id' in update_data:
         db_item.parent_code_id = update_data['parent_code_id']
 
+    invalidate_budget_code_tree(db)
     db.commit()
     db.refresh(db_item)
     return db_item
@@ -153,23 +140,21 @@ def update_budget_code(
 # 4. 예산 분류 코드 삭제 (DELETE)
 @router.delete("/budget-code/{code_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_budget_code(code_id: str, db: Session = Depends(get_db)):
-    db_item = db.query(BudgetCodeMaster).filter(BudgetCodeMaster.code_id == code_id).first()
+    tree = get_budget_code_tree(db)
+    node = tree.get(code_id)
     
-    if db_item is None:
+    if node is None:
         raise HTTPException(status_code=404, detail="Budget Code not found")
 
-    # L1 코드 삭제 시 하위 L2 코드가 있는지 확인하는 로직
-    if db_item.code_type == 'BUDGET_L1':
-        has_children = db.query(BudgetCodeMaster).filter(
-            BudgetCodeMaster.parent_code_id == code_id
-        ).first()
-        
-        if has_children:
+    # L1 코드 삭제 시 하위 L2 코드가 있는지 확인하는 로직 (캐시의 상위→하위 인덱스 사용)
+    if node["code_type"] == 'BUDGET_L1':
+        if tree.has_children(code_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"L1 코드 '{code_id}'는 하위 L2 코드를 가지고 있어 삭제할 수 없습니다. 하위 코드를 먼저 삭제하거나 수정하세요."
             )
 
-    db.delete(db_item)
+    db.query(BudgetCodeMaster).filter(BudgetCodeMaster.code_id == code_id).delete(synchronize_session=False)
+    invalidate_budget_code_tree(db)
     db.commit()
     return
\ No newline at end of file
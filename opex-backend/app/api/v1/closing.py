@@ -1,12 +1,18 @@
 # app/api/v1/closing.py
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Dict, Any
 from pydantic import BaseModel
 from datetime import datetime
+import time
 
-from app.core.database import get_db
-from app.models.closing import MonthlyClose
+from sqlalchemy import select, insert, update, delete, func, case, literal, union_all
+
+from app.core.database import get_db, get_read_db
+from app.core.writes import after_closing_write
+from app.models.closing import MonthlyClose, MonthlyCloseSnapshot
+from app.models.project import MonthlyData
+from app.models.sap import SapUploadRaw
 
 router = APIRouter()
 
@@ -17,7 +23,7 @@ class ClosingStatusUpdate(BaseModel):
 
 # 1. 특정 월 마감 상태 조회 (GET /closing/{yyyymm})
 @router.get("/status/{yyyymm}")
-def get_closing_status(yyyymm: str, db: Session = Depends(get_db)):
+def get_closing_status(yyyymm: str, db: Session = Depends(get_read_db)):
     status = db.query(MonthlyClose).filter(MonthlyClose.yyyymm == yyyymm).first()
     
     return {
@@ -49,7 +55,13 @@ def update_closing_status(req: ClosingStatusUpdate, db: Session = Depends(get_db
             # OPEN은 기본값이므로, OPEN으로 새로 만들 필요는 없음
             return {"status": "success", "message": f"{req.yyyymm}은 이미 OPEN 상태입니다."}
     
-    db.commit()
+    # 마감 시 스냅샷 생성, 해제 시 스냅샷 삭제 (같은 트랜잭션)
+    if req.status == 'CLOSED':
+        take_month_snapshot(db, req.yyyymm)
+    else:
+        db.execute(delete(MonthlyCloseSnapshot).where(MonthlyCloseSnapshot.yyyymm == req.yyyymm))
+
+    after_closing_write(db, req.yyyymm)  # 마감 스냅샷이 바뀌었으므로 예실 대비 집계 무효화
     return {"status": "success", "message": f"{req.yyyymm}가 {req.status}로 처리되었습니다."}
 
 
@@ -57,4 +69,203 @@ def update_closing_status(req: ClosingStatusUpdate, db: Session = Depends(get_db
 def is_month_closed(db: Session, yyyymm: str) -> bool:
     """해당 월이 마감되었는지 확인합니다."""
     status = db.query(MonthlyClose).filter(MonthlyClose.yyyymm == yyyymm).first()
-    return status and status.close_status == 'CLOSED'
\ No newline at end of file
+    return status and status.close_status == 'CLOSED'
+
+
+def take_month_snapshot(db: Session, yyyymm: str):
+    """
+    해당 월의 사업별 당월/누계(YTD) 금액을 INSERT ... SELECT 한 번으로 스냅샷에 기록합니다.
+    (commit은 호출하는 쪽에서 처리)
+    """
+    first_month = f"{yyyymm[:4]}01"
+    is_this_month = MonthlyData.yyyymm == yyyymm
+
+    def month_sum(col):
+        return func.coalesce(func.sum(case((is_this_month, col), else_=0)), 0)
+
+    def ytd_sum(col):
+        return func.coalesce(func.sum(col), 0)
+
+    snapshot_select = select(
+        literal(yyyymm),
+        MonthlyData.proj_id,
+        month_sum(MonthlyData.plan_amt),
+        month_sum(MonthlyData.actual_amt),
+        month_sum(MonthlyData.est_amt),
+        ytd_sum(MonthlyData.plan_amt),
+        ytd_sum(MonthlyData.actual_amt),
+        ytd_sum(MonthlyData.est_amt),
+    ).where(
+        MonthlyData.yyyymm.between(first_month, yyyymm)
+    ).group_by(MonthlyData.proj_id)
+
+    db.execute(delete(MonthlyCloseSnapshot).where(MonthlyCloseSnapshot.yyyymm == yyyymm))
+    db.execute(
+        insert(MonthlyCloseSnapshot).from_select(
+            ["yyyymm", "proj_id", "plan_amt", "actual_amt", "est_amt",
+             "ytd_plan_amt", "ytd_actual_amt", "ytd_est_amt"],
+            snapshot_select,
+        )
+    )
+
+
+# 3. 마감 스냅샷 조회 (GET /closing/snapshot/{yyyymm})
+@router.get("/snapshot/{yyyymm}")
+def get_closing_snapshot(yyyymm: str, db: Session = Depends(get_read_db)):
+    rows = db.query(MonthlyCloseSnapshot).filter(MonthlyCloseSnapshot.yyyymm == yyyymm)\
+             .order_by(MonthlyCloseSnapshot.proj_id).all()
+    return [
+        {
+            "proj_id": r.proj_id,
+            "plan_amt": int(r.plan_amt or 0),
+            "actual_amt": int(r.actual_amt or 0),
+            "est_amt": int(r.est_amt or 0),
+            "ytd_plan_amt": int(r.ytd_plan_amt or 0),
+            "ytd_actual_amt": int(r.ytd_actual_amt or 0),
+            "ytd_est_amt": int(r.ytd_est_amt or 0),
+        }
+        for r in rows
+    ]
+
+
+# ==========================================
+# 4. 마감 점검 + 실적 확정 + 마감 일괄 처리 (POST /closing/{yyyymm}/run)
+# ==========================================
+class ClosingRunRequest(BaseModel):
+    user_id: Optional[str] = "admin"
+    dry_run: bool = False   # True면 점검 결과만 반환 (DB 변경 없음)
+    force: bool = False     # True면 점검에 걸려도 마감 진행
+
+# 점검 결과에 포함할 사업 목록 최대 건수
+CHECK_DETAIL_LIMIT = 50
+
+
+def closing_readiness(db: Session, yyyymm: str) -> Dict[str, Any]:
+    """
+    마감 전 점검 (집계 쿼리 3회)
+    - unmapped_sap      : 미매핑 SAP 전표 건수/금액 (차단)
+    - actual_mismatch   : 월 실적과 매핑된 SAP 전표 합계가 다른 사업 (차단)
+    - actual_without_plan : 계획 없이 실적이 있는 사업 (경고)
+    """
+    # 1. 미매핑 SAP 전표
+    unmapped_count, unmapped_amt = db.execute(
+        select(func.count(), func.coalesce(func.sum(SapUploadRaw.amt_val), 0)).where(
+            SapUploadRaw.yyyymm == yyyymm,
+            SapUploadRaw.mapping_status == 'UNMAPPED',
+        )
+    ).one()
+
+    # 2. 월 실적 vs 매핑된 SAP 합계 (양쪽을 이어 붙여 사업별로 한 번에 비교)
+    both = union_all(
+        select(
+            MonthlyData.proj_id.label("proj_id"),
+            MonthlyData.actual_amt.label("actual_amt"),
+            literal(0).label("sap_amt"),
+        ).where(MonthlyData.yyyymm == yyyymm),
+        select(
+            SapUploadRaw.mapped_proj_id,
+            literal(0),
+            SapUploadRaw.amt_val,
+        ).where(SapUploadRaw.yyyymm == yyyymm, SapUploadRaw.mapping_status == 'MAPPED'),
+    ).subquery()
+    actual_total = func.coalesce(func.sum(both.c.actual_amt), 0)
+    sap_total = func.coalesce(func.sum(both.c.sap_amt), 0)
+    mismatches = db.execute(
+        select(both.c.proj_id, actual_total.label("actual_amt"), sap_total.label("sap_amt"))
+        .group_by(both.c.proj_id)
+        .having(actual_total != sap_total)
+        .order_by(func.abs(actual_total - sap_total).desc())
+    ).all()
+
+    # 3. 계획 없이 실적이 있는 사업
+    plan_total = func.coalesce(func.sum(MonthlyData.plan_amt), 0)
+    month_actual = func.coalesce(func.sum(MonthlyData.actual_amt), 0)
+    unplanned = db.execute(
+        select(MonthlyData.proj_id, month_actual.label("actual_amt"))
+        .where(MonthlyData.yyyymm == yyyymm)
+        .group_by(MonthlyData.proj_id)
+        .having(plan_total == 0, month_actual != 0)
+        .order_by(month_actual.desc())
+    ).all()
+
+    checks = {
+        "unmapped_sap": {
+            "blocking": True,
+            "passed": unmapped_count == 0,
+            "count": unmapped_count,
+            "amount": int(unmapped_amt),
+        },
+        "actual_mismatch": {
+            "blocking": True,
+            "passed": not mismatches,
+            "count": len(mismatches),
+            "amount": int(sum(abs(r.actual_amt - r.sap_amt) for r in mismatches)),
+            "items": [
+                {"proj_id": r.proj_id, "actual_amt": int(r.actual_amt), "sap_amt": int(r.sap_amt)}
+                for r in mismatches[:CHECK_DETAIL_LIMIT]
+            ],
+        },
+        "actual_without_plan": {
+            "blocking": False,
+            "passed": not unplanned,
+            "count": len(unplanned),
+            "amount": int(sum(r.actual_amt for r in unplanned)),
+            "items": [
+                {"proj_id": r.proj_id, "actual_amt": int(r.actual_amt)}
+                for r in unplanned[:CHECK_DETAIL_LIMIT]
+            ],
+        },
+    }
+    ready = all(c["passed"] for c in checks.values() if c["blocking"])
+    return {"ready": ready, "checks": checks}
+
+
+@router.post("/{yyyymm}/run")
+def run_closing(yyyymm: str, req: ClosingRunRequest, db: Session = Depends(get_db)):
+    """
+    마감 점검 → 실적 확정(is_actual_finalized) → 마감 스냅샷 → 마감 상태 변경을 한 트랜잭션으로 처리합니다.
+    점검은 실적 확정 UPDATE(쓰기 잠금) 이후 같은 트랜잭션에서 실행하므로, 점검과 마감 사이에 끼어드는 변경이 없습니다.
+    차단 항목이 있으면 전체를 취소하고 점검 결과만 반환합니다. (force=True면 그대로 마감)
+    """
+    if not (len(yyyymm) == 6 and yyyymm.isdigit() and 1 <= int(yyyymm[4:]) <= 12):
+        raise HTTPException(status_code=400, detail="마감 월은 YYYYMM 형식이어야 합니다.")
+    if is_month_closed(db, yyyymm):
+        raise HTTPException(status_code=409, detail=f"{yyyymm}은 이미 마감되었습니다.")
+
+    started = time.perf_counter()
+
+    if not req.dry_run:
+        # 1. 실적 확정 (이 월의 쓰기 잠금을 먼저 잡음)
+        finalized = db.execute(
+            update(MonthlyData).where(MonthlyData.yyyymm == yyyymm).values(is_actual_finalized='Y')
+        ).rowcount
+
+    # 2. 점검
+    report = closing_readiness(db, yyyymm)
+    closed = False
+
+    if req.dry_run or not (report["ready"] or req.force):
+        db.rollback()
+    else:
+        # 3. 스냅샷 + 마감 상태
+        take_month_snapshot(db, yyyymm)
+        status_record = db.query(MonthlyClose).filter(MonthlyClose.yyyymm == yyyymm).first()
+        if status_record is None:
+            status_record = MonthlyClose(yyyymm=yyyymm)
+            db.add(status_record)
+        status_record.close_status = 'CLOSED'
+        status_record.closed_by = req.user_id
+        status_record.closed_at = datetime.now()
+        after_closing_write(db, yyyymm)
+        closed = True
+
+    return {
+        "yyyymm": yyyymm,
+        "ready": report["ready"],
+        "closed": closed,
+        "forced": closed and not report["ready"],
+        "finalized_rows": finalized if closed else 0,
+        "checks": report["checks"],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
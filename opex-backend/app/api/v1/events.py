@@ -0,0 +1,60 @@
+# app/api/v1/events.py
+import asyncio
+import time
+from typing import Optional
+
+import orjson
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.events import broker
+
+router = APIRouter()
+
+
+def _format(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {orjson.dumps(event).decode()}\n\n"
+
+
+@router.get("")
+async def stream_events(request: Request, tables: Optional[str] = None, fiscal_year: Optional[str] = None):
+    """
+    데이터 변경 알림 스트림 (text/event-stream)
+    - change: {table, source, fiscal_year, yyyymm[], proj_ids[] | null}
+    - resync: 알림이 밀려 버려졌으므로 화면 전체를 다시 조회
+    tables(쉼표 구분), fiscal_year로 받을 알림을 거를 수 있습니다.
+    연결은 EVENT_STREAM_MAX_SECONDS 후 종료되며 브라우저(EventSource)가 자동 재접속합니다.
+    """
+    wanted = {t.strip() for t in tables.split(",") if t.strip()} if tables else None
+
+    def matches(event: dict) -> bool:
+        if event["type"] != "change":
+            return True
+        if wanted and event["table"] not in wanted:
+            return False
+        return not fiscal_year or event["fiscal_year"] in (None, fiscal_year)
+
+    async def event_stream():
+        queue = broker.subscribe()
+        deadline = time.monotonic() + settings.EVENT_STREAM_MAX_SECONDS
+        try:
+            yield f"retry: {settings.EVENT_RETRY_MS}\n\n"
+            while time.monotonic() < deadline:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"  # 프록시 유휴 타임아웃 방지
+                    continue
+                if matches(event):
+                    yield _format(event)
+        finally:
+            broker.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,11 +1,15 @@
 # app/api/v1/execution.py
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy import select
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.writes import after_monthly_write
+from app.core.history import set_change_context, monthly_as_of, normalize_as_of
+from app.core.cache import cached
 # ★ 중요: 모델 파일명이 project.py면 project, projects.py면 projects로 맞춰주세요.
 from app.models.project import ProjectMaster, MonthlyData 
 from app.api.v1.closing import is_month_closed
@@ -27,24 +31,36 @@ class MonthlyStatusDTO(BaseModel):
 
 # 2. 월별 현황 조회 API (GET /api/v1/execution/{yyyymm})
 @router.get("/{yyyymm}", response_model=List[MonthlyStatusDTO])
-def get_monthly_status(yyyymm: str, db: Session = Depends(get_db)):
+def get_monthly_status(yyyymm: str, as_of: Optional[datetime] = None, db: Session = Depends(get_read_db)):
+    return monthly_status_rows(db, yyyymm, as_of)
+
+
+# 월 데이터/사업 마스터가 바뀌면 무효화 (태그: monthly:{연도}, projects)
+@cached("execution.monthly_status", tags=lambda yyyymm, **_: (f"monthly:{yyyymm[:4]}", "projects"))
+def monthly_status_rows(db: Session, yyyymm: str, as_of: Optional[datetime] = None) -> List[dict]:
+    # as_of가 있으면 그 시점의 금액 (현재 값 - 이후 변경분)
+    monthly = MonthlyData.__table__ if as_of is None else monthly_as_of(as_of, yyyymm=yyyymm)
+
     # Project와 MonthlyData를 조인(Join)해서 가져옴
     results = db.query(
         ProjectMaster.proj_id,
         ProjectMaster.proj_name,
         ProjectMaster.dept_code,
         ProjectMaster.vendor_id, # 실제로는 Vendor 테이블 조인해서 이름을 가져와야 하지만 일단 ID 사용
-        MonthlyData.plan_amt,
-        MonthlyData.actual_amt,
-        MonthlyData.est_amt
-    ).outerjoin(MonthlyData, (ProjectMaster.proj_id == MonthlyData.proj_id) & (MonthlyData.yyyymm == yyyymm))\
-     .all()
+        monthly.c.plan_amt,
+        monthly.c.actual_amt,
+        monthly.c.est_amt
+    ).outerjoin(monthly, (ProjectMaster.proj_id == monthly.c.proj_id) & (monthly.c.yyyymm == yyyymm))
+    if as_of is not None:
+        # 기준 시각 이후에 등록된 사업은 제외
+        results = results.filter(ProjectMaster.created_at <= normalize_as_of(as_of))
+    results = results.all()
     
     # 조회된 데이터를 DTO 리스트로 변환
     response_data = []
     for r in results:
         # MonthlyData가 없는 경우(신규사업 등) 0으로 처리
-        response_data.append(MonthlyStatusDTO(
+        response_data.append(dict(
             proj_id=r.proj_id,
             proj_name=r.proj_name,
             dept_code=r.dept_code,
@@ -64,6 +80,7 @@ class ForecastUpdate(BaseModel):
 
 @router.post("/update-forecast")
 def update_forecast(data: ForecastUpdate, db: Session = Depends(get_db)):
+    set_change_context(db, source="update_forecast")
     # ▼▼▼ [통제 로직 추가] 마감된 월은 수정 불가 ▼▼▼
     if is_month_closed(db, data.yyyymm):
         raise HTTPException(status_code=403, detail="해당 월은 마감되어 수정할 수 없습니다.")
@@ -89,12 +106,97 @@ def update_forecast(data: ForecastUpdate, db: Session = Depends(get_db)):
             actual_amt=0
         )
         db.add(new_data)
-        
-    db.commit()
+
+    after_monthly_write(db, "update_forecast", [(data.proj_id, data.yyyymm)])
     return {"status": "success"}
 
 
 
+# 3. 잔여 월 추정치 일괄 계산 (미리보기 → 확정)
+class ForecastRequest(BaseModel):
+    fiscal_year: str
+    method: str = "run_rate"               # run_rate / plan_shape / last_n_avg
+    cutoff_yyyymm: Optional[str] = None    # 실적 기준월 (없으면 실적이 있는 마지막 월)
+    n_months: int = 3                      # last_n_avg 평균 개월 수
+    proj_ids: Optional[List[str]] = None   # 없으면 해당 연도 전체 사업
+
+class ForecastItem(BaseModel):
+    proj_id: str
+    yyyymm: str
+    est_amt: int
+
+class ForecastApplyRequest(BaseModel):
+    fiscal_year: str
+    items: List[ForecastItem]
+
+@router.post("/forecast/preview")
+def preview_forecast(req: ForecastRequest, db: Session = Depends(get_db)):
+    """
+    기준월 이후 월의 추정치를 계산해 현재 추정치와 함께 반환합니다. (DB 변경 없음)
+    """
+    # NumPy 엔진은 추정 계산 시에만 로드 (워커 기동 시간 단축)
+    from app.core.forecast import METHODS, load_year_matrix, default_cutoff, compute_estimates, closed_months, estimate_rows
+
+    if req.method not in METHODS:
+        raise HTTPException(status_code=400, detail=f"추정 방식은 {', '.join(METHODS)} 중 하나여야 합니다.")
+
+    matrix = load_year_matrix(db, req.fiscal_year, req.proj_ids)
+    if req.cutoff_yyyymm:
+        if not (req.cutoff_yyyymm.startswith(req.fiscal_year) and req.cutoff_yyyymm[4:].isdigit()
+                and 1 <= int(req.cutoff_yyyymm[4:]) <= 12):
+            raise HTTPException(status_code=400, detail="기준월은 해당 회계연도의 YYYYMM 형식이어야 합니다.")
+        cutoff = int(req.cutoff_yyyymm[4:])
+    else:
+        cutoff = default_cutoff(matrix)
+
+    estimates = compute_estimates(matrix, req.method, cutoff, req.n_months)
+    closed = closed_months(db, req.fiscal_year)
+    rows = estimate_rows(matrix, estimates, set(closed))
+
+    return {
+        "fiscal_year": req.fiscal_year,
+        "method": req.method,
+        "cutoff_yyyymm": f"{req.fiscal_year}{cutoff:02d}" if cutoff else None,
+        "closed_months": closed,
+        "total_current_est_amt": sum(r["current_est_amt"] for r in rows),
+        "total_est_amt": sum(r["est_amt"] for r in rows),
+        "rows": rows,
+    }
+
+@router.post("/forecast/apply")
+def apply_forecast(req: ForecastApplyRequest, db: Session = Depends(get_db)):
+    """
+    미리보기에서 승인한 추정치를 일괄 반영합니다. 마감된 월은 건너뜁니다.
+    """
+    from app.core.forecast import closed_months, bulk_upsert_estimates
+
+    if any(not item.yyyymm.startswith(req.fiscal_year) for item in req.items):
+        raise HTTPException(status_code=400, detail="해당 회계연도의 월만 반영할 수 있습니다.")
+
+    closed = set(closed_months(db, req.fiscal_year))
+    known = set(db.execute(
+        select(ProjectMaster.proj_id).where(ProjectMaster.proj_id.in_({item.proj_id for item in req.items}))
+    ).scalars())
+
+    # 같은 칸이 여러 번 오면 마지막 값 사용
+    accepted = {}
+    skipped_closed = skipped_unknown = 0
+    for item in req.items:
+        if item.yyyymm in closed:
+            skipped_closed += 1
+        elif item.proj_id not in known:
+            skipped_unknown += 1
+        else:
+            accepted[(item.proj_id, item.yyyymm)] = item.model_dump()
+
+    set_change_context(db, source="forecast_apply")
+    result = bulk_upsert_estimates(db, req.fiscal_year, list(accepted.values()))
+    after_monthly_write(db, "forecast_apply", accepted.keys())
+
+    return {"status": "success", **result, "skipped_closed": skipped_closed, "skipped_unknown": skipped_unknown}
+
+
+
 ##특정 월의 모든 실적을 **"최종 승인"*
 class MonthlyFinalizeRequest(BaseModel):
     yyyymm: str
@@ -0,0 +1,216 @@
+# app/api/v1/export.py
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from typing import Iterator, List, Optional
+import csv
+import itertools
+import io
+import tempfile
+
+
+from app.core.database import ReadSessionLocal
+from app.models.project import ProjectMaster, MonthlyData
+from app.models.sap import SapUploadRaw
+from app.api.v1.report import budget_vs_actual_stmt, budget_vs_actual_row
+from app.core.sap_archive import iter_archived_rows
+
+router = APIRouter()
+
+# DB 커서에서 한 번에 가져올 행 수 (메모리 상한)
+FETCH_CHUNK_SIZE = 2000
+# 응답 스트림 한 조각의 크기 (bytes)
+STREAM_CHUNK_BYTES = 64 * 1024
+# xlsx 임시파일이 이 크기를 넘으면 메모리 대신 디스크로 넘어감
+XLSX_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+# ==========================================
+# 공용 헬퍼: 커서 스트리밍 / CSV / XLSX 변환
+# ==========================================
+def _iter_rows(stmt, row_fn=None) -> Iterator[list]:
+    """
+    SELECT 문을 yield_per로 실행하여 FETCH_CHUNK_SIZE 단위로 행을 넘겨줍니다.
+    NOTE: FastAPI의 get_db 의존성은 응답 스트리밍 전에 세션을 닫으므로,
+          스트리밍 동안 사용할 세션을 여기서 직접 열고 닫습니다.
+    """
+    db = ReadSessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=FETCH_CHUNK_SIZE))
+        for partition in result.partitions():
+            for r in partition:
+                yield row_fn(r) if row_fn else list(r)
+    finally:
+        db.close()
+
+
+def _csv_stream(headers: List[str], rows: Iterator[list]) -> Iterator[bytes]:
+    """행 단위로 CSV를 만들어 STREAM_CHUNK_BYTES마다 내보냅니다. (엑셀 한글 깨짐 방지용 BOM 포함)"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    buf.write('\ufeff')
+    writer.writerow(headers)
+    for row in rows:
+        writer.writerow(row)
+        if buf.tell() >= STREAM_CHUNK_BYTES:
+            yield buf.getvalue().encode('utf-8')
+            buf.seek(0)
+            buf.truncate(0)
+    yield buf.getvalue().encode('utf-8')
+
+
+def _xlsx_stream(sheet_title: str, headers: List[str], rows: Iterator[list]) -> Iterator[bytes]:
+    """
+    openpyxl write-only 모드로 행을 바로 기록하고, 저장된 파일을 조각내어 내보냅니다.
+    (xlsx는 zip 구조라 완성 후에만 전송 가능하지만, 메모리 사용량은 행 수와 무관하게 일정합니다.)
+    """
+    # openpyxl은 엑셀 내보내기 시에만 로드 (워커 기동 시간 단축)
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_BYTES) as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while True:
+            chunk = tmp.read(STREAM_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _export_response(fmt: str, filename: str, sheet_title: str, headers: List[str], rows: Iterator[list]) -> StreamingResponse:
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {fmt} (csv, xlsx 중 선택)")
+
+    if fmt == "csv":
+        body = _csv_stream(headers, rows)
+    else:
+        body = _xlsx_stream(sheet_title, headers, rows)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+# ==========================================
+# 1. 예실 대비 현황 내보내기 (GET /export/budget-vs-actual)
+# ==========================================
+@router.get("/budget-vs-actual")
+def export_budget_vs_actual(year: str = "2025", fmt: str = "xlsx"):
+    keys = ["dept_code", "proj_id", "proj_name", "plan_amt", "actual_amt", "diff_amt", "burn_rate"]
+    headers = ["부서", "Index", "사업명", "계획", "실적", "잔여예산", "집행률(%)"]
+
+    def to_row(r):
+        data = budget_vs_actual_row(r)
+        return [data[k] for k in keys]
+
+    rows = _iter_rows(budget_vs_actual_stmt(year), to_row)
+    return _export_response(fmt, f"budget_vs_actual_{year}", "예실대비", headers, rows)
+
+
+# ==========================================
+# 2. 연간 집행 그리드 내보내기 (GET /export/execution/{year})
+# ==========================================
+@router.get("/execution/{year}")
+def export_execution_grid(year: str, fmt: str = "xlsx"):
+    """사업 x 월 단위의 계획/실적/추정 금액을 내보냅니다."""
+    stmt = select(
+        ProjectMaster.dept_code,
+        ProjectMaster.proj_id,
+        ProjectMaster.proj_name,
+        ProjectMaster.vendor_id,
+        MonthlyData.yyyymm,
+        MonthlyData.plan_amt,
+        MonthlyData.actual_amt,
+        MonthlyData.est_amt,
+        MonthlyData.is_actual_finalized,
+    ).join(
+        MonthlyData, ProjectMaster.proj_id == MonthlyData.proj_id
+    ).where(
+        MonthlyData.yyyymm.like(f"{year}%")
+    ).order_by(
+        ProjectMaster.dept_code, ProjectMaster.proj_id, MonthlyData.yyyymm
+    )
+
+    headers = ["부서", "Index", "사업명", "업체", "연월", "계획", "실적", "추정", "실적확정"]
+
+    def to_row(r):
+        return [
+            r.dept_code, r.proj_id, r.proj_name, r.vendor_id, r.yyyymm,
+            int(r.plan_amt or 0), int(r.actual_amt or 0), int(r.est_amt or 0),
+            r.is_actual_finalized,
+        ]
+
+    rows = _iter_rows(stmt, to_row)
+    return _export_response(fmt, f"execution_{year}", "집행현황", headers, rows)
+
+
+# ==========================================
+# 3. SAP 원장 내보내기 (GET /export/sap-ledger)
+# ==========================================
+SAP_LEDGER_COLUMNS = [
+    ("yyyymm", "기준년월"),
+    ("fiscal_year", "회계연도"),
+    ("slip_no", "전표 번호"),
+    ("line_item", "개별 항목"),
+    ("gl_account", "G/L 계정"),
+    ("gl_desc", "G/L 계정과목명"),
+    ("header_text", "텍스트"),
+    ("amt_val", "금액(현지 통화)"),
+    ("currency", "현지 통화"),
+    ("vendor_text", "상계계정 명칭"),
+    ("ref_key", "참조 키(헤더) 1"),
+    ("cost_center", "코스트 센터"),
+    ("mapped_proj_id", "매핑 사업"),
+    ("mapping_status", "매핑 상태"),
+]
+
+
+@router.get("/sap-ledger")
+def export_sap_ledger(
+    fiscal_year: Optional[str] = None,
+    yyyymm: Optional[str] = None,
+    mapping_status: Optional[str] = None,
+    fmt: str = "csv",
+):
+    """
+    SAP 업로드 원장을 조건별로 내보냅니다. (예: mapping_status=UNMAPPED → 미매핑 목록)
+    Parquet로 보관된 연도의 전표도 이어서 포함됩니다.
+    """
+    stmt = select(*[getattr(SapUploadRaw, col) for col, _ in SAP_LEDGER_COLUMNS])
+    if fiscal_year:
+        stmt = stmt.where(SapUploadRaw.fiscal_year == fiscal_year)
+    if yyyymm:
+        stmt = stmt.where(SapUploadRaw.yyyymm == yyyymm)
+    if mapping_status:
+        stmt = stmt.where(SapUploadRaw.mapping_status == mapping_status)
+    stmt = stmt.order_by(SapUploadRaw.yyyymm, SapUploadRaw.slip_no, SapUploadRaw.line_item)
+
+    headers = [label for _, label in SAP_LEDGER_COLUMNS]
+
+    amt_idx = [col for col, _ in SAP_LEDGER_COLUMNS].index("amt_val")
+
+    def to_row(r):
+        row = list(r)
+        row[amt_idx] = int(row[amt_idx]) if row[amt_idx] is not None else None
+        return row
+
+    archived = iter_archived_rows(
+        [col for col, _ in SAP_LEDGER_COLUMNS],
+        fiscal_year=fiscal_year, yyyymm=yyyymm, mapping_status=mapping_status,
+    )
+    rows = itertools.chain(archived, _iter_rows(stmt, to_row))
+    name_parts = ["sap_ledger"] + [p for p in (fiscal_year, yyyymm, mapping_status) if p]
+    return _export_response(fmt, "_".join(name_parts), "SAP원장", headers, rows)
@@ -1,23 +1,34 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, status
 from sqlalchemy.orm import Session
-from typing import List
-import pandas as pd
+from typing import List, Optional
 
 import io
 import re
-from sqlalchemy import func
+from sqlalchemy import func, select, insert, bindparam, union_all, literal, or_
 import logging
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.cube import mark_projects_dirty
+from app.core.writes import after_monthly_write, after_project_write
+from app.core.history import set_change_context, record_changes, HISTORY_FIELDS
+from app.models.alert import VarianceAlert
 from app.models.project import ProjectMaster, MonthlyData 
 from app.schemas.project import Project, ProjectCreate, ProjectUpdate
 
 from app.api.v1.closing import is_month_closed# 마감 체크용
 
 from app.models.transfer import BudgetTransfer
-from app.schemas.transfer import TransferRequest, TransferLog
+from app.schemas.transfer import (
+    TransferRequest, TransferLog, TransferBatchRequest, TransferBatchResult,
+    TransferHistory, TransferBalancePoint
+)
 from app.models.project import MonthlyData # MonthlyData 테이블 필요
 from app.models.account import BudgetCodeMaster # 기준정보 모델 임포트 필요
+from app.models.closing import MonthlyClose
+from app.core.id_allocator import next_project_id, reserve_project_ids
+from app.core.budget_code_cache import get_budget_code_tree
+from app.core.logging_setup import SkipSummary
+from app.core.lineage import refresh_lineage
 from collections import defaultdict
 
 
@@ -48,7 +59,7 @@ def derive_dept_code(cost_center_name):
 # 1. 사업 목록 조회 (GET /)
 # ==========================================
 @router.get("/", response_model=List[Project])
-def read_projects(fiscal_year: str, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_projects(fiscal_year: str, skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     # 1. **[수정]** 요청받은 연도에 해당하는 사업만 조회하도록 필터링
     db_projects = db.query(ProjectMaster)\
                  .filter(ProjectMaster.fiscal_year == fiscal_year)\
@@ -102,31 +113,16 @@ def read_projects(fiscal_year: str, skip: int = 0, limit: int = 100, db: Session
 # ==========================================
 @router.post("/", response_model=Project)
 def create_project(proj: ProjectCreate, db: Session = Depends(get_db)):
+    set_change_context(db, source="project_create")
     try:
-        # [Index 순차 채번 로직] - A-001, A-002 방식
-        last_proj = db.query(ProjectMaster).filter(ProjectMaster.dept_code == proj.dept_code).order_by(ProjectMaster.proj_id.desc()).first()
-
-        if last_proj:
-            last_num_str = last_proj.proj_id.split('-')[-1]
-            if last_num_str.isdigit():
-                new_num = int(last_num_str) + 1
-            else:
-                new_num = 1
-        else:
-            new_num = 1
-
-        new_id = f"{proj.dept_code}-{new_num:03d}"
+        # [Index 순차 채번 로직] - A-001, A-002 방식 (채번 테이블에서 원자적으로 발급)
+        new_id = next_project_id(db, proj.dept_code)
         
         
         # [수정] 1. 예산 성격(budget_nature) 유효성 검사
         if proj.budget_nature:
-            # IT_TYPE 코드 기준정보에서 해당 ID가 존재하는지 확인
-            it_code = db.query(BudgetCodeMaster).filter(
-                BudgetCodeMaster.code_id == proj.budget_nature,
-                BudgetCodeMaster.code_type == 'IT_TYPE' # IT 분류 타입에 해당하는지 확인
-            ).first()
-            
-            if not it_code:
+            # IT_TYPE 코드 기준정보에서 해당 ID가 존재하는지 확인 (메모리 캐시 사용)
+            if not get_budget_code_tree(db).exists(proj.budget_nature, 'IT_TYPE'): # IT 분류 타입에 해당하는지 확인
                 raise HTTPException(
                     status_code=400, 
                     detail=f"예산 성격 코드 '{proj.budget_nature}'는 유효한 IT 분류 코드에 해당하지 않습니다."
@@ -193,8 +189,11 @@ def create_project(proj: ProjectCreate, db: Session = Depends(get_db)):
                 plan_amt=amt
             )
             db.add(db_monthly)
+
+        # 사업 계보(lineage_root_id) 갱신
+        refresh_lineage(db, [new_id])
             
-        db.commit()
+        after_project_write(db, "project_create", proj.fiscal_year, [new_id])
         db.refresh(db_proj)
         return db_proj
         
@@ -208,6 +207,7 @@ def create_project(proj: ProjectCreate, db: Session = Depends(get_db)):
 # 3. 사업 수정 (PATCH /{proj_id})
 @router.patch("/{proj_id}", response_model=Project)
 def update_project(proj_id: str, proj: ProjectUpdate, db: Session = Depends(get_db)):
+    set_change_context(db, source="project_update")
     db_proj = db.query(ProjectMaster).filter(ProjectMaster.proj_id == proj_id).first()
     
     if db_proj is None:
@@ -255,7 +255,11 @@ def update_project(proj_id: str, proj: ProjectUpdate, db: Session = Depends(get_
             
             db.add(db_monthly)
 
-    db.commit()
+    # 전년도 Index가 바뀌면 이 사업과 후속 사업들의 계보 갱신
+    if "prev_proj_id" in update_data:
+        refresh_lineage(db, [proj_id])
+
+    after_project_write(db, "project_update", db_proj.fiscal_year, [proj_id])
     db.refresh(db_proj)
     return db_proj
 
@@ -274,13 +278,25 @@ def delete_project(proj_id: str, db: Session = Depends(get_db)):
     if is_month_closed(db, f"{db_proj.fiscal_year}01"):
         raise HTTPException(status_code=403, detail=f"{db_proj.fiscal_year}년 데이터는 이미 마감되어 삭제할 수 없습니다.")
 
+    fiscal_year = db_proj.fiscal_year
     try:
-        # 2. 연결된 월별 데이터(MonthlyData) 모두 삭제
+        # 2. 연결된 월별 데이터(MonthlyData) 모두 삭제 (삭제 전 금액을 이력에 기록)
+        set_change_context(db, source="project_delete")
+        record_changes(db, (
+            {"proj_id": m.proj_id, "yyyymm": m.yyyymm, "field": f, "old_value": getattr(m, f), "new_value": 0}
+            for m in db.execute(
+                select(MonthlyData.proj_id, MonthlyData.yyyymm, *[getattr(MonthlyData, f) for f in HISTORY_FIELDS])
+                .where(MonthlyData.proj_id == proj_id)
+            ).all()
+            for f in HISTORY_FIELDS
+        ))
+        mark_projects_dirty(db, [proj_id])  # 월 데이터 삭제 전에 대상 월 표시
         db.query(MonthlyData).filter(MonthlyData.proj_id == proj_id).delete(synchronize_session='fetch')
+        db.query(VarianceAlert).filter(VarianceAlert.proj_id == proj_id).delete(synchronize_session=False)
         
         # 3. 마스터 데이터 삭제
         db.delete(db_proj)
-        db.commit()
+        after_project_write(db, "project_delete", fiscal_year, [proj_id], mark=False)
         
     except Exception as e:
         db.rollback()
@@ -295,7 +311,7 @@ def delete_project(proj_id: str, db: Session = Depends(get_db)):
 # 3. 사업 계획 마스터 일괄 등록 (POST /master/bulk)
 # ==========================================
 @router.post("/master/bulk")
-async def upload_bulk_project_master(
+def upload_bulk_project_master(
     file: UploadFile = File(...), 
     year: str = Form(...),
     db: Session = Depends(get_db)
@@ -303,9 +319,13 @@ async def upload_bulk_project_master(
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="엑셀 파일만 업로드 가능합니다.")
 
+    set_change_context(db, source="project_bulk_upload")
     try:
         # 1. 파일 로드 및 데이터 정리
-        contents = await file.read()
+        # pandas(openpyxl 포함)는 업로드 시에만 로드 (워커 기동 시간 단축)
+        import pandas as pd
+        # 동기 함수로 두어 스레드풀에서 실행 (엑셀 파싱/적재 동안 이벤트 루프의 다른 요청이 멈추지 않음)
+        contents = file.file.read()
         df = pd.read_excel(io.BytesIO(contents))
         # Pandas DataFrame의 NaN(빈 값)은 None으로 처리
         df = df.where(pd.notnull(df), None) 
@@ -332,13 +352,33 @@ async def upload_bulk_project_master(
 
 
         results = {"total": 0, "inserted_proj": 0, "inserted_monthly": 0, "skipped": 0}
+        skips = SkipSummary(logger, "project_master_bulk")
+        saved_proj_ids = []
         
+        # Index가 비어 있는 신규 사업은 부서별로 번호 블록을 한 번에 예약
+        rows_without_index = defaultdict(list)
+        for idx, row in df.iterrows():
+            if row.get(INDEX_HEADER) or not row.get('사업명'):
+                continue
+            dept = derive_dept_code(str(row.get('CC명칭')) if row.get('CC명칭') else None)
+            if dept:
+                rows_without_index[dept].append(idx)
+
+        # 같은 파일에 Index로 직접 적힌 번호와 겹치는 번호는 건너뛰고 추가로 예약
+        explicit_ids = {str(row.get(INDEX_HEADER)) for _, row in df.iterrows() if row.get(INDEX_HEADER)}
+        auto_ids = {}
+        for dept, idxs in rows_without_index.items():
+            ids = []
+            while len(ids) < len(idxs):
+                ids += [pid for pid in reserve_project_ids(db, dept, len(idxs) - len(ids)) if pid not in explicit_ids]
+            auto_ids.update(zip(idxs, ids))
+
         # 3. 데이터 처리 및 삽입/업데이트
-        for _, row in df.iterrows():
+        for idx, row in df.iterrows():
             results["total"] += 1
             
             # 1. 필수값 파싱 및 유효성 검사
-            proj_id = str(row.get(INDEX_HEADER)) if row.get(INDEX_HEADER) else None
+            proj_id = str(row.get(INDEX_HEADER)) if row.get(INDEX_HEADER) else auto_ids.get(idx)
             proj_name = str(row.get('사업명')) if row.get('사업명') else None
             cost_center_name_raw = str(row.get('CC명칭')) if row.get('CC명칭') else None 
             
@@ -347,7 +387,7 @@ async def upload_bulk_project_master(
             # **[필수 체크] NOT NULL 컬럼 중 하나라도 없으면 스킵**
             if not proj_id or not fiscal_year or not proj_name or not final_dept_code:
                 results["skipped"] += 1
-                logger.warning(f"Skipped row {results['total']} due to missing required fields (Index, 사업명, CC명칭).")
+                skips.add(results['total'], "missing required fields (Index, 사업명, CC명칭)")
                 continue
 
             # **[핵심: 등록/업데이트 분기] 이미 존재하는 사업은 업데이트 (마스터 데이터 갱신 기능)**
@@ -388,7 +428,7 @@ async def upload_bulk_project_master(
             db_proj.status_prev_year = str(row.get('전년도 사업상태'))
             db_proj.svc_id = str(row.get('서비스명'))
             db_proj.contract_nature = str(row.get('계약 성격'))
-            db_proj.location_alloc = str(row.get('사업장 배분'))
+            db_proj.business_allocation = str(row.get('사업장 배분'))
             
             # 예산 분류 코드 (텍스트)
             db_proj.budget_l1_text = str(row.get('예산 분류(대2)'))
@@ -411,6 +451,7 @@ async def upload_bulk_project_master(
             db_proj.memo = str(row.get('사업 메모'))
             
             db.add(db_proj) # ORM 객체 추가/업데이트
+            saved_proj_ids.append(proj_id)
 
             # 3. Monthly Data (YYYYMM별 계획 금액) 삽입/업데이트
             for month_header in PLAN_MONTHS_HEADERS:
@@ -445,8 +486,12 @@ async def upload_bulk_project_master(
                     db.add(db_monthly)
                     results["inserted_monthly"] += 1
                 # 금액이 0이거나 None이면 업데이트/삽입을 건너뜁니다.
+
+        # 등록/갱신된 사업의 계보(lineage_root_id)를 한 번에 갱신
+        refresh_lineage(db, saved_proj_ids)
                 
-        db.commit()
+        after_project_write(db, "project_bulk", year, saved_proj_ids)
+        skips.log()
         return {"status": "success", "message": f"총 {results['total']}건 처리 완료. (신규 등록: {results['inserted_proj']}건, 월별 계획 갱신: {results['inserted_monthly']}건)"}
 
     except Exception as e:
@@ -464,6 +509,7 @@ async def upload_bulk_project_master(
 def execute_budget_transfer(req: TransferRequest, db: Session = Depends(get_db)):
     # 1. 월별 마감 상태 체크 (선택 월이 잠겨있으면 전용 불가능)
     from app.api.v1.closing import is_month_closed # 헬퍼 함수 임포트
+    set_change_context(db, user=req.transferred_by, source="transfer")
     if is_month_closed(db, req.transfer_yyyymm):
         raise HTTPException(status_code=403, detail="마감된 월의 예산은 전용할 수 없습니다.")
 
@@ -511,12 +557,235 @@ def execute_budget_transfer(req: TransferRequest, db: Session = Depends(get_db))
             transferred_by=req.transferred_by,
         )
         db.add(transfer_log)
-        
-        db.commit()
+
+        after_monthly_write(db, "transfer", [(req.from_proj_id, req.transfer_yyyymm), (req.to_proj_id, req.transfer_yyyymm)])
         
         db.refresh(transfer_log)
         return transfer_log
 
     except Exception as e:
         db.rollback()
-        raise HTTPException(status_code=500, detail=f"예산 전용 실패: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"예산 전용 실패: {str(e)}")
+
+
+
+# ==========================================
+# 5. 예산 전용 일괄 실행 (POST /projects/transfer/batch)
+# ==========================================
+@router.post("/transfer/batch", response_model=TransferBatchResult)
+def execute_budget_transfer_batch(req: TransferBatchRequest, db: Session = Depends(get_db)):
+    """
+    여러 건의 전용(leg)을 하나의 트랜잭션으로 처리합니다. 하나라도 실패하면 전체 취소됩니다.
+    - 마감 월/사업 존재/잔액 검증은 집합 단위 조회로 한 번에 처리
+    - 계획 금액은 사업-월별 순증감(net delta)으로 합산 후 일괄 반영
+    - 반영 시 조회 시점의 금액과 비교하여 그 사이 다른 사용자가 수정했으면 409 반환
+    """
+    if not req.legs:
+        raise HTTPException(status_code=400, detail="전용 내역이 없습니다.")
+
+    for i, leg in enumerate(req.legs, start=1):
+        if leg.transfer_amount <= 0:
+            raise HTTPException(status_code=400, detail=f"{i}번째 전용 금액은 0보다 커야 합니다.")
+        if leg.from_proj_id == leg.to_proj_id:
+            raise HTTPException(status_code=400, detail=f"{i}번째 전용의 보내는 사업과 받는 사업이 같습니다.")
+
+    months = {leg.transfer_yyyymm for leg in req.legs}
+    proj_ids = {leg.from_proj_id for leg in req.legs} | {leg.to_proj_id for leg in req.legs}
+
+    # 1. 마감 월 체크 (1회 조회)
+    closed_months = db.execute(
+        select(MonthlyClose.yyyymm).where(
+            MonthlyClose.yyyymm.in_(months),
+            MonthlyClose.close_status == 'CLOSED'
+        )
+    ).scalars().all()
+    if closed_months:
+        raise HTTPException(status_code=403, detail=f"마감된 월의 예산은 전용할 수 없습니다: {', '.join(sorted(closed_months))}")
+
+    # 2. 사업 존재 여부 체크 (1회 조회)
+    found_ids = set(db.execute(
+        select(ProjectMaster.proj_id).where(ProjectMaster.proj_id.in_(proj_ids))
+    ).scalars().all())
+    missing_ids = proj_ids - found_ids
+    if missing_ids:
+        raise HTTPException(status_code=404, detail=f"존재하지 않는 사업입니다: {', '.join(sorted(missing_ids))}")
+
+    # 3. 관련 월별 데이터 일괄 조회 후 사업-월별 순증감 계산
+    current = {}  # (proj_id, yyyymm) -> (data_id, plan_amt)
+    rows = db.execute(
+        select(MonthlyData.data_id, MonthlyData.proj_id, MonthlyData.yyyymm, MonthlyData.plan_amt)
+        .where(MonthlyData.proj_id.in_(proj_ids), MonthlyData.yyyymm.in_(months))
+        .order_by(MonthlyData.data_id)
+    ).all()
+    for data_id, proj_id, yyyymm, plan_amt in rows:
+        # 동일 사업-월에 행이 여러 개면 첫 행 기준 (단건 전용과 동일)
+        current.setdefault((proj_id, yyyymm), (data_id, plan_amt or 0))
+
+    deltas = defaultdict(int)
+    for leg in req.legs:
+        deltas[(leg.from_proj_id, leg.transfer_yyyymm)] -= leg.transfer_amount
+        deltas[(leg.to_proj_id, leg.transfer_yyyymm)] += leg.transfer_amount
+
+    shortages = []
+    for key, delta in deltas.items():
+        balance = current.get(key, (None, 0))[1]
+        if balance + delta < 0:
+            shortages.append(f"{key[0]}({key[1]}): 잔액 {int(balance):,} / 필요 {-delta:,}")
+    if shortages:
+        raise HTTPException(status_code=400, detail="보내는 사업의 해당 월 잔여 예산이 부족합니다. " + "; ".join(shortages))
+
+    # 4. 반영 (계획 금액 일괄 갱신/생성 + 이력 일괄 저장)
+    update_params = []
+    insert_params = []
+    changes = []  # 변경 이력
+    for (proj_id, yyyymm), delta in deltas.items():
+        if delta == 0:
+            continue
+        if (proj_id, yyyymm) in current:
+            data_id, old_amt = current[(proj_id, yyyymm)]  # NULL은 0으로 조회됨 (갱신 조건도 coalesce로 비교)
+            update_params.append({"b_id": data_id, "b_old": old_amt, "b_new": old_amt + delta})
+        else:
+            old_amt = 0
+            insert_params.append({"proj_id": proj_id, "yyyymm": yyyymm, "plan_amt": delta, "actual_amt": 0, "est_amt": 0})
+        changes.append({"proj_id": proj_id, "yyyymm": yyyymm, "field": "plan_amt", "old_value": old_amt, "new_value": old_amt + delta})
+
+    md_table = MonthlyData.__table__
+    try:
+        if update_params:
+            result = db.execute(
+                md_table.update()
+                .where(md_table.c.data_id == bindparam("b_id"), func.coalesce(md_table.c.plan_amt, 0) == bindparam("b_old"))
+                .values(plan_amt=bindparam("b_new")),
+                update_params,
+            )
+            # 조회 이후 다른 요청이 금액을 바꿨다면 갱신 건수가 모자람
+            if result.rowcount != len(update_params):
+                db.rollback()
+                raise HTTPException(status_code=409, detail="다른 사용자가 같은 사업의 계획 금액을 수정했습니다. 다시 시도해 주세요.")
+
+        if insert_params:
+            db.execute(insert(MonthlyData), insert_params)
+
+        set_change_context(db, user=req.transferred_by, source="transfer_batch")
+        record_changes(db, changes)
+
+        log_rows = db.execute(
+            insert(BudgetTransfer).returning(
+                BudgetTransfer.transfer_id,
+                BudgetTransfer.from_proj_id,
+                BudgetTransfer.to_proj_id,
+                BudgetTransfer.transfer_amount,
+                BudgetTransfer.transfer_yyyymm,
+                BudgetTransfer.transferred_at,
+            ),
+            [
+                {
+                    "from_proj_id": leg.from_proj_id,
+                    "to_proj_id": leg.to_proj_id,
+                    "transfer_amount": leg.transfer_amount,
+                    "transfer_yyyymm": leg.transfer_yyyymm,
+                    "reason": leg.reason or req.reason,
+                    "transferred_by": req.transferred_by,
+                }
+                for leg in req.legs
+            ],
+        ).all()
+
+        after_monthly_write(db, "transfer_batch", deltas.keys())
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.exception("Budget Transfer Batch Failed")
+        raise HTTPException(status_code=500, detail=f"예산 일괄 전용 실패: {str(e)}")
+
+    return TransferBatchResult(
+        leg_count=len(req.legs),
+        total_amount=sum(leg.transfer_amount for leg in req.legs),
+        transfers=[TransferLog.model_validate(r) for r in log_rows],
+    )
+
+
+
+# ==========================================
+# 6. 예산 전용 이력 조회
+# ==========================================
+def transfer_balance_stmt(year: str, proj_id: Optional[str] = None):
+    """
+    사업-월별 순전용액과 연초부터의 누계를 윈도우 함수로 한 번에 계산하는 SELECT 문
+    (보낸 금액은 -, 받은 금액은 +)
+    """
+    year_filter = BudgetTransfer.transfer_yyyymm.like(f"{year}%")
+    sent = select(
+        BudgetTransfer.from_proj_id.label("proj_id"),
+        BudgetTransfer.transfer_yyyymm.label("yyyymm"),
+        (literal(0) - BudgetTransfer.transfer_amount).label("amount"),
+    ).where(year_filter)
+    received = select(
+        BudgetTransfer.to_proj_id.label("proj_id"),
+        BudgetTransfer.transfer_yyyymm.label("yyyymm"),
+        BudgetTransfer.transfer_amount.label("amount"),
+    ).where(year_filter)
+    if proj_id:
+        sent = sent.where(BudgetTransfer.from_proj_id == proj_id)
+        received = received.where(BudgetTransfer.to_proj_id == proj_id)
+
+    legs = union_all(sent, received).subquery()
+    monthly = select(
+        legs.c.proj_id,
+        legs.c.yyyymm,
+        func.sum(legs.c.amount).label("net_amount"),
+    ).group_by(legs.c.proj_id, legs.c.yyyymm).subquery()
+
+    return select(
+        monthly.c.proj_id,
+        monthly.c.yyyymm,
+        monthly.c.net_amount,
+        func.sum(monthly.c.net_amount).over(
+            partition_by=monthly.c.proj_id, order_by=monthly.c.yyyymm
+        ).label("running_net_amount"),
+    ).order_by(monthly.c.proj_id, monthly.c.yyyymm)
+
+
+# 연도별 전용 대장 (GET /projects/transfers)
+@router.get("/transfers", response_model=List[TransferHistory])
+def read_transfer_register(
+    year: str,
+    yyyymm: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 500,
+    db: Session = Depends(get_read_db)
+):
+    query = db.query(BudgetTransfer).filter(BudgetTransfer.transfer_yyyymm.like(f"{year}%"))
+    if yyyymm:
+        query = query.filter(BudgetTransfer.transfer_yyyymm == yyyymm)
+    return query.order_by(BudgetTransfer.transfer_yyyymm, BudgetTransfer.transfer_id)\
+                .offset(skip).limit(limit).all()
+
+
+# 사업-월별 순전용 누계 (GET /projects/transfers/timeline)
+@router.get("/transfers/timeline", response_model=List[TransferBalancePoint])
+def read_transfer_timeline(year: str, proj_id: Optional[str] = None, db: Session = Depends(get_read_db)):
+    rows = db.execute(transfer_balance_stmt(year, proj_id)).all()
+    return [
+        TransferBalancePoint(
+            proj_id=r.proj_id,
+            yyyymm=r.yyyymm,
+            net_amount=int(r.net_amount or 0),
+            running_net_amount=int(r.running_net_amount or 0),
+        )
+        for r in rows
+    ]
+
+
+# 사업별 전용 이력 (GET /projects/{proj_id}/transfers)
+@router.get("/{proj_id}/transfers", response_model=List[TransferHistory])
+def read_project_transfers(proj_id: str, year: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """보낸/받은 전용 이력을 모두 반환합니다. (from_proj_id, to_proj_id 인덱스 사용)"""
+    query = db.query(BudgetTransfer).filter(
+        or_(BudgetTransfer.from_proj_id == proj_id, BudgetTransfer.to_proj_id == proj_id)
+    )
+    if year:
+        query = query.filter(BudgetTransfer.transfer_yyyymm.like(f"{year}%"))
+    return query.order_by(BudgetTransfer.transfer_yyyymm, BudgetTransfer.transfer_id).all()
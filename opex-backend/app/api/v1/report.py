@@ -1,57 +1,352 @@
 # app/api/v1/report.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from typing import List, Dict, Any
+from sqlalchemy import func, case, select, union_all
+from typing import List, Dict, Any, Optional
+from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.project import ProjectMaster, MonthlyData
+from app.models.closing import MonthlyCloseSnapshot
+from app.core.lineage import lineage_root_stmt, lineage_history_stmt
+from app.core.cube import CUBE_DIMENSIONS, mark_all_dirty, refresh_cube, cube_query_stmt
+from app.core.alerts import rebuild_alerts
+from app.models.alert import VarianceAlert
+from app.core.history import monthly_as_of, normalize_as_of, changes_stmt
+from app.core.cache import cached
 
 router = APIRouter()
 
-@router.get("/budget-vs-actual")
-def get_budget_vs_actual(year: str = "2025", db: Session = Depends(get_db)):
+
+def budget_vs_actual_stmt(year: str, as_of: Optional[datetime] = None):
     """
-    부서별/사업별 예실 대비 현황 집계
+    예실 대비 집계 SELECT 문 (조회 API와 엑셀/CSV 내보내기에서 공용)
+    마감 스냅샷이 있는 월은 스냅샷에서, 나머지(미마감) 월만 MonthlyData에서 집계합니다.
+    as_of가 있으면 그 시각까지 만들어진 스냅샷과, 변경 이력으로 되돌린 월 데이터를 사용합니다.
     """
-    # 1. 데이터 조회 (Project + MonthlyData Join)
-    # 월별 데이터를 연간 합계로 집계
-    results = db.query(
+    snapshot_filter = [MonthlyCloseSnapshot.yyyymm.like(f"{year}%")]
+    if as_of is not None:
+        snapshot_filter.append(MonthlyCloseSnapshot.created_at <= normalize_as_of(as_of))
+    snapshot_months = select(MonthlyCloseSnapshot.yyyymm).where(*snapshot_filter).distinct()
+
+    # 1. 미마감 월: 원천 데이터 집계
+    monthly = MonthlyData.__table__ if as_of is None else monthly_as_of(as_of, year=year)
+    live = select(
+        monthly.c.proj_id.label("proj_id"),
+        monthly.c.plan_amt.label("plan_amt"),
+        monthly.c.actual_amt.label("actual_amt"),
+        monthly.c.est_amt.label("est_amt"),
+    ).where(
+        monthly.c.yyyymm.like(f"{year}%"), # 해당 연도만
+        monthly.c.yyyymm.notin_(snapshot_months)
+    )
+
+    # 2. 마감 월: 스냅샷(당월 금액)
+    frozen = select(
+        MonthlyCloseSnapshot.proj_id.label("proj_id"),
+        MonthlyCloseSnapshot.plan_amt.label("plan_amt"),
+        MonthlyCloseSnapshot.actual_amt.label("actual_amt"),
+        MonthlyCloseSnapshot.est_amt.label("est_amt"),
+    ).where(*snapshot_filter)
+
+    amounts = union_all(live, frozen).subquery()
+
+    # 3. 사업 마스터와 Join하여 연간 합계로 집계
+    stmt = select(
         ProjectMaster.dept_code,
         ProjectMaster.proj_id,
         ProjectMaster.proj_name,
-        func.sum(MonthlyData.plan_amt).label("total_plan"),
-        func.sum(MonthlyData.actual_amt).label("total_actual"),
-        func.sum(MonthlyData.est_amt).label("total_est")
+        func.sum(amounts.c.plan_amt).label("total_plan"),
+        func.sum(amounts.c.actual_amt).label("total_actual"),
+        func.sum(amounts.c.est_amt).label("total_est")
     ).join(
-        MonthlyData, ProjectMaster.proj_id == MonthlyData.proj_id
-    ).filter(
-        MonthlyData.yyyymm.like(f"{year}%") # 해당 연도만
+        amounts, ProjectMaster.proj_id == amounts.c.proj_id
     ).group_by(
         ProjectMaster.dept_code,
         ProjectMaster.proj_id,
         ProjectMaster.proj_name
-    ).all()
+    ).order_by(
+        ProjectMaster.dept_code,
+        ProjectMaster.proj_id
+    )
+    if as_of is not None:
+        # 기준 시각 이후에 등록된 사업은 제외
+        stmt = stmt.where(ProjectMaster.created_at <= normalize_as_of(as_of))
+    return stmt
+
+
+def budget_vs_actual_row(r) -> Dict[str, Any]:
+    """집계 결과 한 행을 응답(JSON) 형태로 변환합니다."""
+    # 실적이 있으면 실적, 없으면 추정치를 사용해 집행액 계산 (Forecast View)
+    forecast_spend = int(r.total_actual or 0) # 여기선 확정 실적만 봄 (필요시 est 합산)
+    plan = int(r.total_plan or 0)
+
+    rate = 0.0
+    if plan > 0:
+        rate = (forecast_spend / plan) * 100
+
+    return {
+        "dept_code": r.dept_code,
+        "proj_id": r.proj_id,
+        "proj_name": r.proj_name,
+        "plan_amt": plan,
+        "actual_amt": forecast_spend,
+        "diff_amt": plan - forecast_spend, # 잔여 예산
+        "burn_rate": round(rate, 1)
+    }
+
+
+@router.get("/budget-vs-actual")
+def get_budget_vs_actual(year: str = "2025", as_of: Optional[datetime] = None, db: Session = Depends(get_read_db)):
+    """
+    부서별/사업별 예실 대비 현황 집계 (as_of: 해당 시각 기준으로 재현, UTC)
+    """
+    return budget_vs_actual_report(db, year, as_of)
+
+
+# 월 데이터/마감 스냅샷/사업 마스터가 바뀌면 무효화 (태그: monthly:{연도}, projects)
+@cached("report.budget_vs_actual", tags=("monthly:{year}", "projects"))
+def budget_vs_actual_report(db: Session, year: str, as_of: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    # 1. 데이터 조회
+    results = db.execute(budget_vs_actual_stmt(year, as_of)).all()
 
     # 2. 데이터 가공 (JSON 변환)
-    data = []
-    for r in results:
-        # 실적이 있으면 실적, 없으면 추정치를 사용해 집행액 계산 (Forecast View)
-        forecast_spend = int(r.total_actual or 0) # 여기선 확정 실적만 봄 (필요시 est 합산)
-        plan = int(r.total_plan or 0)
-        
-        rate = 0.0
-        if plan > 0:
-            rate = (forecast_spend / plan) * 100
-
-        data.append({
-            "dept_code": r.dept_code,
-            "proj_id": r.proj_id,
-            "proj_name": r.proj_name,
-            "plan_amt": plan,
-            "actual_amt": forecast_spend,
-            "diff_amt": plan - forecast_spend, # 잔여 예산
-            "burn_rate": round(rate, 1)
+    return [budget_vs_actual_row(r) for r in results]
+
+
+def _growth_pct(current: int, previous: int):
+    if not previous:
+        return None
+    return round((current - previous) / previous * 100, 1)
+
+
+@router.get("/changes")
+def get_monthly_changes(
+    proj_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    yyyymm: Optional[str] = None,
+    limit: int = 500,
+    db: Session = Depends(get_read_db),
+):
+    """
+    월별 계획/실적/추정 변경 이력 (기간: start ~ end, UTC / 최신순)
+    """
+    return [{
+        "proj_id": h.proj_id,
+        "yyyymm": h.yyyymm,
+        "field": h.field,
+        "old_value": int(h.old_value or 0),
+        "new_value": int(h.new_value or 0),
+        "changed_at": h.changed_at,
+        "changed_by": h.changed_by,
+        "source": h.source,
+    } for h in db.execute(changes_stmt(proj_id, start, end, yyyymm, min(limit, 5000))).scalars()]
+
+
+@router.get("/lineage/{proj_id}")
+def get_project_lineage(proj_id: str, db: Session = Depends(get_read_db)):
+    """
+    전년도 Index(prev_proj_id)로 이어진 연속 사업 전체의 연도별/월별 계획·실적 이력 (YoY 분석용)
+    """
+    row = db.query(ProjectMaster.lineage_root_id).filter(ProjectMaster.proj_id == proj_id).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    root_id = row.lineage_root_id
+    if root_id is None:
+        # 아직 계보가 계산되지 않은 사업 (서버 재시작 전 외부에서 적재된 경우)
+        root_id = db.execute(lineage_root_stmt([proj_id])).first().root_id
+
+    chain: Dict[str, Dict[str, Any]] = {}
+    for r in db.execute(lineage_history_stmt(root_id)).all():
+        proj = chain.get(r.proj_id)
+        if proj is None:
+            proj = chain[r.proj_id] = {
+                "proj_id": r.proj_id, "fiscal_year": r.fiscal_year, "proj_name": r.proj_name,
+                "dept_code": r.dept_code, "prev_proj_id": r.prev_proj_id,
+                "plan_amt": 0, "actual_amt": 0, "est_amt": 0, "monthly": [],
+            }
+        if r.yyyymm is None:
+            continue
+        plan, actual, est = int(r.plan_amt or 0), int(r.actual_amt or 0), int(r.est_amt or 0)
+        proj["plan_amt"] += plan
+        proj["actual_amt"] += actual
+        proj["est_amt"] += est
+        proj["monthly"].append({"yyyymm": r.yyyymm, "plan_amt": plan, "actual_amt": actual, "est_amt": est})
+
+    # 연도별 합계와 전년 대비 증감률 (한 해에 사업이 나뉜 경우 합산)
+    yearly: Dict[str, Dict[str, Any]] = {}
+    for proj in chain.values():
+        year = yearly.setdefault(proj["fiscal_year"], {"fiscal_year": proj["fiscal_year"], "plan_amt": 0, "actual_amt": 0, "proj_ids": []})
+        year["plan_amt"] += proj["plan_amt"]
+        year["actual_amt"] += proj["actual_amt"]
+        year["proj_ids"].append(proj["proj_id"])
+
+    yoy = []
+    prev = None
+    for fiscal_year in sorted(yearly):
+        year = yearly[fiscal_year]
+        year["plan_growth_pct"] = _growth_pct(year["plan_amt"], prev["plan_amt"]) if prev else None
+        year["actual_growth_pct"] = _growth_pct(year["actual_amt"], prev["actual_amt"]) if prev else None
+        yoy.append(year)
+        prev = year
+
+    return {"proj_id": proj_id, "root_proj_id": root_id, "chain": list(chain.values()), "yoy": yoy}
+
+
+def _split_filter(value: Optional[str]) -> Optional[List[Optional[str]]]:
+    """'V001,V002,null' -> ['V001', 'V002', None] (null은 미지정 값)"""
+    if value is None:
+        return None
+    return [None if v == "null" else v for v in (x.strip() for x in value.split(",")) if v]
+
+
+@router.get("/allocation")
+def get_allocation_report(year: str = "2025", by: str = "site_dept", monthly: bool = False, db: Session = Depends(get_read_db)):
+    """
+    공통비(Shared비율) 배분 후 사업장/부서별 계획·실적
+    by: site(사업장) / dept(부서) / site_dept(사업장×부서)
+    """
+    # numpy는 배분 계산 시에만 로드 (워커 기동 시간 단축)
+    from app.core.allocation import get_allocation
+
+    if by not in ("site", "dept", "site_dept"):
+        raise HTTPException(status_code=400, detail="by는 site, dept, site_dept 중 하나여야 합니다.")
+
+    result = get_allocation(db, year)
+    return {"year": year, "by": by, "version": result.version, "rows": result.rows(by, monthly)}
+
+
+@router.get("/alerts")
+def get_variance_alerts(
+    year: Optional[str] = None,
+    severity: Optional[str] = None,
+    alert_type: Optional[str] = None,
+    dept_code: Optional[str] = None,
+    proj_id: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    활성 예실 차이 경보 목록 (쓰기 작업 시 갱신된 경보 테이블만 조회, CRITICAL 우선)
+    """
+    stmt = select(
+        VarianceAlert, ProjectMaster.proj_name, ProjectMaster.dept_code
+    ).join(
+        ProjectMaster, ProjectMaster.proj_id == VarianceAlert.proj_id
+    )
+    if year:
+        stmt = stmt.where(VarianceAlert.fiscal_year == year)
+    if severity:
+        stmt = stmt.where(VarianceAlert.severity == severity)
+    if alert_type:
+        stmt = stmt.where(VarianceAlert.alert_type == alert_type)
+    if dept_code:
+        stmt = stmt.where(ProjectMaster.dept_code == dept_code)
+    if proj_id:
+        stmt = stmt.where(VarianceAlert.proj_id == proj_id)
+    stmt = stmt.order_by(
+        case((VarianceAlert.severity == "CRITICAL", 0), else_=1),
+        VarianceAlert.metric_pct.desc().nulls_last(),
+        VarianceAlert.proj_id,
+        VarianceAlert.period,
+    )
+
+    return [{
+        "alert_id": a.alert_id,
+        "proj_id": a.proj_id,
+        "proj_name": proj_name,
+        "dept_code": dept,
+        "fiscal_year": a.fiscal_year,
+        "period": a.period,
+        "alert_type": a.alert_type,
+        "severity": a.severity,
+        "metric_pct": a.metric_pct,
+        "threshold_pct": a.threshold_pct,
+        "plan_amt": int(a.plan_amt or 0),
+        "actual_amt": int(a.actual_amt or 0),
+        "forecast_amt": int(a.forecast_amt or 0),
+        "detected_at": a.detected_at,
+        "updated_at": a.updated_at,
+    } for a, proj_name, dept in db.execute(stmt).all()]
+
+
+@router.post("/alerts/rebuild")
+def rebuild_variance_alerts(year: str, db: Session = Depends(get_db)):
+    """
+    해당 연도 경보 전체 재계산 (경보 기준 변경, 사업 일괄 업로드 이후 등)
+    """
+    cells = rebuild_alerts(db, year)
+    db.commit()
+    return {"status": "success", "year": year, "evaluated": cells}
+
+
+@router.get("/cube")
+def get_spend_cube(
+    year: str = "2025",
+    dims: str = Query("dept_code", description=f"묶을 차원 (쉼표 구분): {', '.join(CUBE_DIMENSIONS)}"),
+    month_from: Optional[str] = Query(None, description="시작 월 (YYYYMM)"),
+    month_to: Optional[str] = Query(None, description="종료 월 (YYYYMM)"),
+    dept_code: Optional[str] = None,
+    budget_l2: Optional[str] = None,
+    budget_nature_type: Optional[str] = None,
+    report_class_type: Optional[str] = None,
+    vendor_id: Optional[str] = None,
+    svc_id: Optional[str] = None,
+    cost_center_code: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    다차원 지출 분석 (예산 분류/예산 성격/보고 분류/협력업체/서비스/CC/월 조합)
+    필터는 쉼표로 여러 값 지정, 'null'은 미지정 값. 사전 집계된 큐브에서만 조회합니다. (재집계는 백그라운드에서, 쓰기 직후 잠시 이전 값일 수 있음)
+    """
+    group_dims = [d.strip() for d in dims.split(",") if d.strip()]
+    invalid = [d for d in group_dims if d not in CUBE_DIMENSIONS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 차원입니다: {', '.join(invalid)}")
+    group_dims = list(dict.fromkeys(group_dims))
+
+    raw_filters = {
+        "dept_code": dept_code, "budget_l2": budget_l2, "budget_nature_type": budget_nature_type,
+        "report_class_type": report_class_type, "vendor_id": vendor_id, "svc_id": svc_id,
+        "cost_center_code": cost_center_code,
+    }
+    filters = {k: v for k, v in ((k, _split_filter(v)) for k, v in raw_filters.items()) if v}
+
+    rows = []
+    total = {"plan_amt": 0, "actual_amt": 0, "est_amt": 0}
+    for r in db.execute(cube_query_stmt(year, group_dims, filters, month_from, month_to)).all():
+        plan, actual, est = int(r.plan_amt or 0), int(r.actual_amt or 0), int(r.est_amt or 0)
+        if r.plan_amt is None and r.actual_amt is None:
+            continue  # 조건에 맞는 데이터 없음 (차원 없이 합계만 요청한 경우)
+        row = {d: getattr(r, d) for d in group_dims}
+        row.update({
+            "plan_amt": plan, "actual_amt": actual, "est_amt": est,
+            "diff_amt": plan - actual,
+            "burn_rate": round(actual / plan * 100, 1) if plan > 0 else 0.0,
         })
-    
-    return data
\ No newline at end of file
+        rows.append(row)
+        total["plan_amt"] += plan
+        total["actual_amt"] += actual
+        total["est_amt"] += est
+
+    return {"year": year, "dims": group_dims, "filters": filters, "rows": rows, "total": total}
+
+
+@router.post("/cube/refresh")
+def refresh_spend_cube(db: Session = Depends(get_db)):
+    """
+    변경 표시된 월만 재집계 (트리거로 표시된 직접 수정분 반영 등)
+    """
+    months = refresh_cube(db)
+    return {"status": "success", "months": months}
+
+
+@router.post("/cube/rebuild")
+def rebuild_spend_cube(db: Session = Depends(get_db)):
+    """
+    큐브 전체 재집계 (API를 거치지 않고 DB를 직접 수정한 경우 등)
+    """
+    mark_all_dirty(db)
+    months = refresh_cube(db)
+    return {"status": "success", "months": months}
@@ -1,16 +1,18 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
-import pandas as pd
 import io
 import re
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.writes import after_monthly_write
+from app.core.history import set_change_context
 # 모델 import (파일명이 projects.py 인지 project.py 인지 확인하여 맞게 수정하세요)
 from app.models.sap import SapUploadRaw
 from app.models.project import ProjectMaster, MonthlyData 
+from app.core.sap_archive import archive_fiscal_year, archived_years, iter_archived_rows
 
 # ▼▼▼ 이 줄이 반드시 @router 데코레이터보다 위에 있어야 합니다! ▼▼▼
 router = APIRouter() 
@@ -19,16 +21,21 @@ router = APIRouter()
 # 1. SAP 엑셀 업로드 API
 # ==========================================
 @router.post("/upload")
-async def upload_sap_excel(file: UploadFile = File(...), db: Session = Depends(get_db)):
+def upload_sap_excel(file: UploadFile = File(...), db: Session = Depends(get_db)):
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="엑셀 파일만 업로드 가능합니다.")
 
     try:
-        contents = await file.read()
+        # pandas(openpyxl 포함)는 업로드 시에만 로드 (워커 기동 시간 단축)
+        import pandas as pd
+        # 동기 함수로 두어 스레드풀에서 실행 (엑셀 파싱/적재 동안 이벤트 루프의 다른 요청이 멈추지 않음)
+        contents = file.file.read()
         df = pd.read_excel(io.BytesIO(contents))
         df = df.where(pd.notnull(df), None)
 
         results = {"total": 0, "inserted": 0, "skipped": 0}
+        # Parquet로 보관된(마감 완료) 연도는 다시 적재하지 않음
+        archived = set(archived_years())
         
         for _, row in df.iterrows():
             if not row.get('전표 번호') or row.get('금액(현지 통화)') is None:
@@ -55,6 +62,11 @@ async def upload_sap_excel(file: UploadFile = File(...), db: Session = Depends(g
 
             fiscal_year = str(row.get('회계연도', ''))
             
+            if fiscal_year in archived:
+                results["skipped"] += 1
+                results["total"] += 1
+                continue
+
             # 중복 체크
             exists = db.query(SapUploadRaw).filter(
                 SapUploadRaw.fiscal_year == fiscal_year,
@@ -142,6 +154,7 @@ def sync_monthly_actuals(db: Session):
     """
     Raw 데이터(MAPPED)를 집계하여 TB_MONTHLY_DATA.actual_amt 업데이트
     """
+    set_change_context(db, source="sync_monthly_actuals")
     # 1. Raw 테이블에서 프로젝트별/월별 합계 계산
     aggs = db.query(
         SapUploadRaw.mapped_proj_id,
@@ -155,6 +168,7 @@ def sync_monthly_actuals(db: Session):
     ).all()
     
     # 2. TB_MONTHLY_DATA 업데이트
+    touched = []  # 실적이 바뀐 (사업, 월): 경보 재계산 대상
     for proj_id, yyyymm, total_amt in aggs:
         # 해당 월 데이터 조회
         m_data = db.query(MonthlyData).filter(
@@ -163,8 +177,11 @@ def sync_monthly_actuals(db: Session):
         ).first()
         
         if m_data:
+            if m_data.actual_amt != total_amt:
+                touched.append((proj_id, yyyymm))
             m_data.actual_amt = total_amt
         else:
+            touched.append((proj_id, yyyymm))
             # 데이터가 없으면 생성
             new_data = MonthlyData(
                 proj_id=proj_id,
@@ -174,8 +191,8 @@ def sync_monthly_actuals(db: Session):
                 actual_amt=total_amt
             )
             db.add(new_data)
-            
-    db.commit()
+
+    after_monthly_write(db, "sync_monthly_actuals", touched)
 
 
 
@@ -186,7 +203,7 @@ def sync_monthly_actuals(db: Session):
 
 # 미매핑된 SAP 전표 조회
 @router.get("/unmapped")
-def get_unmapped_data(db: Session = Depends(get_db)):
+def get_unmapped_data(db: Session = Depends(get_read_db)):
     return db.query(SapUploadRaw)\
              .filter(SapUploadRaw.mapping_status == 'UNMAPPED')\
              .order_by(SapUploadRaw.slip_no)\
@@ -213,4 +230,78 @@ def manual_map_sap_data(req: ManualMapRequest, db: Session = Depends(get_db)):
     # 2. 월별 실적 집계 갱신 (중요!)
     sync_monthly_actuals(db)
     
-    return {"status": "success", "message": "수동 매핑 완료"}
\ No newline at end of file
+    return {"status": "success", "message": "수동 매핑 완료"}
+
+
+
+# ---------------------------------------------------------
+# 4. 원장 조회 및 마감 연도 보관 (Parquet)
+# ---------------------------------------------------------
+
+LEDGER_COLUMNS = [
+    "raw_id", "yyyymm", "fiscal_year", "slip_no", "line_item", "gl_account", "gl_desc",
+    "header_text", "amt_val", "currency", "vendor_text", "cost_center",
+    "mapped_proj_id", "mapping_status",
+]
+
+# SAP 원장 조회 (운영 테이블 + 보관 파일)
+@router.get("/ledger")
+def search_ledger(
+    fiscal_year: Optional[str] = None,
+    yyyymm: Optional[str] = None,
+    mapping_status: Optional[str] = None,
+    mapped_proj_id: Optional[str] = None,
+    limit: int = 1000,
+    db: Session = Depends(get_read_db),
+):
+    """
+    조건에 맞는 SAP 전표를 조회합니다.
+    보관(Parquet) 처리된 연도도 같은 형식으로 함께 반환합니다. (archived=True)
+    """
+    query = db.query(*[getattr(SapUploadRaw, c) for c in LEDGER_COLUMNS])
+    if fiscal_year:
+        query = query.filter(SapUploadRaw.fiscal_year == fiscal_year)
+    if yyyymm:
+        query = query.filter(SapUploadRaw.yyyymm == yyyymm)
+    if mapping_status:
+        query = query.filter(SapUploadRaw.mapping_status == mapping_status)
+    if mapped_proj_id:
+        query = query.filter(SapUploadRaw.mapped_proj_id == mapped_proj_id)
+
+    rows = []
+    for r in query.order_by(SapUploadRaw.yyyymm, SapUploadRaw.slip_no).limit(limit).all():
+        item = dict(zip(LEDGER_COLUMNS, r))
+        item["amt_val"] = int(item["amt_val"] or 0)
+        item["archived"] = False
+        rows.append(item)
+
+    if len(rows) < limit:
+        archived_rows = iter_archived_rows(
+            LEDGER_COLUMNS, fiscal_year=fiscal_year, yyyymm=yyyymm,
+            mapping_status=mapping_status, mapped_proj_id=mapped_proj_id,
+        )
+        for r in archived_rows:
+            item = dict(zip(LEDGER_COLUMNS, r))
+            item["archived"] = True
+            rows.append(item)
+            if len(rows) >= limit:
+                break
+
+    return rows
+
+
+class ArchiveRequest(BaseModel):
+    fiscal_year: str
+
+# 마감 완료 연도 원장 보관 실행
+@router.post("/archive")
+def archive_closed_year(req: ArchiveRequest, db: Session = Depends(get_db)):
+    """12개월이 모두 마감된 연도의 원장을 Parquet 파일로 옮기고 운영 테이블에서 삭제합니다."""
+    try:
+        result = archive_fiscal_year(db, req.fiscal_year)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"보관 실패: {str(e)}")
+
+    return {"status": "success", "message": f"{req.fiscal_year}년 원장 {result['archived_rows']}건 보관 완료", **result}
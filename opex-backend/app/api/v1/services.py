@@ -4,15 +4,16 @@ from sqlalchemy.orm import Session
 from typing import List
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.service import ServiceMaster
 from app.schemas.service import Service, ServiceCreate
+from app.core.versioning import etag_guard, bump_version
 
 router = APIRouter()
 
 # 1. 목록 조회
-@router.get("/", response_model=List[Service])
-def read_services(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/", response_model=List[Service], dependencies=[Depends(etag_guard(ServiceMaster.__tablename__))])
+def read_services(skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     return db.query(ServiceMaster).offset(skip).limit(limit).all()
 
 # 2. 신규 등록
@@ -30,6 +31,7 @@ def create_service(service: ServiceCreate, db: Session = Depends(get_db)):
         is_active=service.is_active
     )
     db.add(db_obj)
+    bump_version(db, ServiceMaster.__tablename__)
     db.commit()
     db.refresh(db_obj)
     return db_obj
\ No newline at end of file
@@ -1,24 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from typing import List
-import pandas as pd
 import io
 import logging
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.vendor import VendorMaster
 from app.schemas.vendor import Vendor, VendorCreate, BulkUploadResult
+from app.core.versioning import etag_guard, bump_version
+from app.core.cache import cached, invalidate
+from app.core.logging_setup import SkipSummary
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # [기존] 1. 업체 목록 조회 (GET /)
-@router.get("/", response_model=List[Vendor])
-def read_vendors(db: Session = Depends(get_db)):
+@router.get("/", response_model=List[Vendor], dependencies=[Depends(etag_guard(VendorMaster.__tablename__))])
+def read_vendors(db: Session = Depends(get_read_db)):
     """등록된 모든 계약 업체 목록을 조회합니다."""
-    vendors = db.query(VendorMaster).order_by(VendorMaster.vendor_name).all()
-    return vendors
+    return vendor_list(db)
+
+
+@cached("vendors.list", tags=("vendors",))
+def vendor_list(db: Session) -> List[Vendor]:
+    return [Vendor.model_validate(v) for v in db.query(VendorMaster).order_by(VendorMaster.vendor_name).all()]
 
 # [신규] 2. 신규 업체 등록 (POST /) - 단건 등록용
 @router.post("/", response_model=Vendor)
@@ -38,6 +44,8 @@ def create_vendor(vendor: VendorCreate, db: Session = Depends(get_db)):
     
     try:
         db.add(db_vendor)
+        bump_version(db, VendorMaster.__tablename__)
+        invalidate(db, "vendors")
         db.commit()
         db.refresh(db_vendor)
         return db_vendor
@@ -59,6 +67,8 @@ def upload_bulk_vendor(
 
     try:
         # 1. 파일 읽기
+        # pandas(openpyxl 포함)는 업로드 시에만 로드 (워커 기동 시간 단축)
+        import pandas as pd
         contents = file.file.read()
         df = pd.read_excel(io.BytesIO(contents))
         
@@ -72,6 +82,7 @@ def upload_bulk_vendor(
         
         # 3. 데이터 검증 및 Pydantic 객체 생성
         uploaded_vendors = []
+        skips = SkipSummary(logger, "vendor_bulk")
         
         for index, row in df.iterrows():
             rec = row.to_dict()
@@ -87,7 +98,8 @@ def upload_bulk_vendor(
                 
                 uploaded_vendors.append(VendorCreate(**vendor_data_with_biz_reg))
             except Exception as e:
-                logger.warning(f"Invalid record skipped: {rec}, Error: {e}")
+                skips.add(index, "invalid record", f"{rec}, Error: {e}")
+        skips.log()
         
         # ▼▼▼ [핵심 수정] NameError를 해결하기 위한 uploaded_ids 셋 생성 ▼▼▼
         uploaded_ids = {v.vendor_id for v in uploaded_vendors}
@@ -129,6 +141,8 @@ def upload_bulk_vendor(
                 db.add(db_vendor)
                 success_count += 1
         
+        bump_version(db, VendorMaster.__tablename__)
+        invalidate(db, "vendors")
         db.commit()
         
         return BulkUploadResult(
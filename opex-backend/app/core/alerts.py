@@ -0,0 +1,168 @@
+# app/core/alerts.py
+"""
+예실 차이 경보 (tb_variance_alert).
+
+월 데이터를 바꾸는 쓰기 작업(추정 수정, SAP 실적 반영, 예산 전용)이 변경한 (사업, 월) 목록을
+evaluate_alerts()에 넘기면, 그 사업-월과 해당 사업의 연간 합계만 다시 계산해 경보를 추가/갱신/해소합니다.
+(사업별 월 데이터는 (proj_id, yyyymm) 인덱스로 읽으므로 전체 테이블 집계가 없습니다.)
+
+- MONTH_OVER_PLAN    : 월 실적 / 월 계획 ≥ ALERT_MONTH_OVER_WARN_PCT
+- UNPLANNED_SPEND    : 월 계획 없이 실적 발생
+- BURN_RATE          : 연간 누적 실적 / 연간 계획 ≥ ALERT_BURN_WARN_PCT
+- FORECAST_OVER_PLAN : (실적 + 실적 없는 월의 추정) / 연간 계획 ≥ ALERT_FORECAST_WARN_PCT
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, delete, update, insert, func, bindparam
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.alert import VarianceAlert
+from app.models.project import MonthlyData
+
+# IN 절 바인딩 개수 제한(SQLite) 대비
+_CHUNK_SIZE = 500
+
+_alert = VarianceAlert.__table__
+
+_VALUE_FIELDS = ("severity", "metric_pct", "threshold_pct", "plan_amt", "actual_amt", "forecast_amt")
+
+
+def _chunks(ids: List[str]) -> Iterator[List[str]]:
+    for i in range(0, len(ids), _CHUNK_SIZE):
+        yield ids[i:i + _CHUNK_SIZE]
+
+
+def _pct(value: float, base: float) -> float:
+    return round(value / base * 100, 1)
+
+
+def _graded(alert_type: str, metric: float, warn: float, critical: float, **amounts) -> Optional[Dict]:
+    if metric < warn:
+        return None
+    severity = "CRITICAL" if metric >= critical else "WARNING"
+    return {"alert_type": alert_type, "severity": severity, "metric_pct": metric,
+            "threshold_pct": critical if severity == "CRITICAL" else warn, **amounts}
+
+
+def month_alert(plan: float, actual: float) -> Optional[Dict]:
+    """한 사업-월의 경보 (없으면 None)"""
+    if plan > 0:
+        return _graded("MONTH_OVER_PLAN", _pct(actual, plan),
+                       settings.ALERT_MONTH_OVER_WARN_PCT, settings.ALERT_MONTH_OVER_CRITICAL_PCT,
+                       plan_amt=plan, actual_amt=actual, forecast_amt=0)
+    if actual > 0:
+        return {"alert_type": "UNPLANNED_SPEND", "severity": "WARNING", "metric_pct": None,
+                "threshold_pct": None, "plan_amt": plan, "actual_amt": actual, "forecast_amt": 0}
+    return None
+
+
+def year_alerts(months: List[Tuple[float, float, float]]) -> List[Dict]:
+    """한 사업의 연간 경보 (months: 월별 (계획, 실적, 추정))"""
+    plan = sum(m[0] for m in months)
+    if plan <= 0:
+        return []
+    actual = sum(m[1] for m in months)
+    forecast = sum(m[1] if m[1] else m[2] for m in months)
+
+    amounts = {"plan_amt": plan, "actual_amt": actual, "forecast_amt": forecast}
+    found = [
+        _graded("BURN_RATE", _pct(actual, plan),
+                settings.ALERT_BURN_WARN_PCT, settings.ALERT_BURN_CRITICAL_PCT, **amounts),
+        _graded("FORECAST_OVER_PLAN", _pct(forecast, plan),
+                settings.ALERT_FORECAST_WARN_PCT, settings.ALERT_FORECAST_CRITICAL_PCT, **amounts),
+    ]
+    return [a for a in found if a]
+
+
+def evaluate_alerts(db: Session, cells: Iterable[Tuple[str, str]]):
+    """
+    변경된 (proj_id, yyyymm) 목록의 경보를 다시 계산합니다. (commit은 호출한 쪽에서)
+    해당 월 경보와, 그 사업의 연간 경보(누적 소진율/예상 초과)가 대상입니다.
+    """
+    cells = {(p, m) for p, m in cells if p and m and len(m) == 6}
+    if not cells:
+        return
+
+    # 세션이 autoflush=False이므로 방금 수정한 월 데이터를 먼저 반영
+    db.flush()
+
+    years_by_proj = defaultdict(set)
+    for proj_id, yyyymm in cells:
+        years_by_proj[proj_id].add(yyyymm[:4])
+    years = {y for ys in years_by_proj.values() for y in ys}
+    proj_ids = sorted(years_by_proj)
+
+    # 1. 대상 사업의 해당 연도 월 데이터 (사업 인덱스 조회)
+    monthly: Dict[Tuple[str, str], Dict[str, Tuple[float, float, float]]] = defaultdict(dict)
+    existing: Dict[Tuple[str, str, str], Dict] = {}
+    for chunk in _chunks(proj_ids):
+        for proj_id, yyyymm, plan, actual, est in db.execute(
+            select(
+                MonthlyData.proj_id, MonthlyData.yyyymm,
+                func.sum(MonthlyData.plan_amt), func.sum(MonthlyData.actual_amt), func.sum(MonthlyData.est_amt),
+            ).where(
+                MonthlyData.proj_id.in_(chunk),
+                func.substr(MonthlyData.yyyymm, 1, 4).in_(years),
+            ).group_by(MonthlyData.proj_id, MonthlyData.yyyymm)
+        ):
+            if yyyymm[:4] in years_by_proj[proj_id]:
+                monthly[(proj_id, yyyymm[:4])][yyyymm] = (float(plan or 0), float(actual or 0), float(est or 0))
+
+        for row in db.execute(
+            select(_alert).where(_alert.c.proj_id.in_(chunk), _alert.c.fiscal_year.in_(years))
+        ).mappings():
+            existing[(row["proj_id"], row["alert_type"], row["period"])] = dict(row)
+
+    # 2. 이번 변경 범위(변경된 월 + 해당 사업-연도)의 경보 계산
+    desired: Dict[Tuple[str, str, str], Dict] = {}
+    for proj_id, yyyymm in cells:
+        plan, actual, _ = monthly[(proj_id, yyyymm[:4])].get(yyyymm, (0.0, 0.0, 0.0))
+        alert = month_alert(plan, actual)
+        if alert:
+            desired[(proj_id, alert["alert_type"], yyyymm)] = {"proj_id": proj_id, "fiscal_year": yyyymm[:4], "period": yyyymm, **alert}
+    for proj_id, ys in years_by_proj.items():
+        for year in ys:
+            for alert in year_alerts(list(monthly[(proj_id, year)].values())):
+                desired[(proj_id, alert["alert_type"], year)] = {"proj_id": proj_id, "fiscal_year": year, "period": year, **alert}
+
+    def in_scope(key) -> bool:
+        proj_id, _, period = key
+        return period in years_by_proj[proj_id] or (proj_id, period) in cells
+
+    # 3. 해소된 경보 삭제 / 값이 바뀐 경보 갱신 / 새 경보 추가
+    stale = [row["alert_id"] for key, row in existing.items() if in_scope(key) and key not in desired]
+    changed = [
+        {"b_id": existing[key]["alert_id"], **{f"b_{f}": alert[f] for f in _VALUE_FIELDS}}
+        for key, alert in desired.items()
+        if key in existing and any(_differs(existing[key][f], alert[f]) for f in _VALUE_FIELDS)
+    ]
+    new = [alert for key, alert in desired.items() if key not in existing]
+
+    for chunk in _chunks(stale):
+        db.execute(delete(_alert).where(_alert.c.alert_id.in_(chunk)))
+    if changed:
+        db.execute(
+            update(_alert).where(_alert.c.alert_id == bindparam("b_id"))
+            .values(**{f: bindparam(f"b_{f}") for f in _VALUE_FIELDS}, updated_at=func.now()),
+            changed,
+        )
+    if new:
+        db.execute(insert(_alert), new)
+
+
+def _differs(old, new) -> bool:
+    if old is None or new is None or isinstance(new, str):
+        return old != new
+    return float(old) != float(new)
+
+
+def rebuild_alerts(db: Session, fiscal_year: str) -> int:
+    """해당 연도 경보를 전체 재계산합니다. (기준값 변경/일괄 업로드 후 관리자용, commit은 호출한 쪽에서)"""
+    db.execute(delete(_alert).where(_alert.c.fiscal_year == fiscal_year))
+    cells = db.execute(
+        select(MonthlyData.proj_id, MonthlyData.yyyymm).where(MonthlyData.yyyymm.like(f"{fiscal_year}%")).distinct()
+    ).tuples().all()
+    evaluate_alerts(db, cells)
+    return len(cells)
@@ -0,0 +1,165 @@
+# app/core/allocation.py
+"""
+공통비(Shared) 배분 엔진.
+
+사업별 월 금액을 (사업 수 × 12개월) 배열로 읽어(forecast.load_year_matrix) 한 번의 벡터 연산으로
+사업장(business_allocation) × 부서(dept_code)별 직접비/배분액을 계산합니다.
+
+- 사업 금액 중 shared_ratio 만큼은 공통비 풀, 나머지는 해당 사업의 사업장/부서 직접비
+  (사업장이 '공통'이면 전액 공통비, shared_ratio가 1보다 크면 % 값으로 간주)
+- 월별 공통비 풀은 연간 직접비(계획) 비중으로 사업장/부서에 배분 (계획·실적 모두 같은 비중 사용)
+- 결과는 회계연도별로 캐시하고, 월 데이터/사업 마스터 버전(app.core.versioning)이 바뀌면 다시 계산
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.forecast import load_year_matrix
+from app.core.versioning import get_versions
+from app.models.project import ProjectMaster, MonthlyData
+
+COMMON_SITE = "공통"
+UNASSIGNED = "미지정"
+_EMPTY_VALUES = {"", "None", "nan", "NaN"}
+
+
+def _site_of(value: Optional[str]) -> str:
+    value = (value or "").strip()
+    return UNASSIGNED if value in _EMPTY_VALUES else value
+
+
+def _ratio_of(value) -> float:
+    ratio = float(value or 0.0)
+    if ratio > 1:
+        ratio /= 100  # 35.8(%) 형태로 입력된 경우
+    return min(max(ratio, 0.0), 1.0)
+
+
+class AllocationResult:
+    """사업장 × 부서 × 월 배분 결과 (행: targets 순서, 열: 1~12월)"""
+    def __init__(self, fiscal_year: str, version: str, targets: List[Tuple[str, str]],
+                 direct_plan: np.ndarray, direct_actual: np.ndarray,
+                 alloc_plan: np.ndarray, alloc_actual: np.ndarray, weights: np.ndarray):
+        self.fiscal_year = fiscal_year
+        self.version = version
+        self.targets = targets
+        self.months = [f"{fiscal_year}{m:02d}" for m in range(1, 13)]
+        self.direct_plan = direct_plan
+        self.direct_actual = direct_actual
+        self.alloc_plan = alloc_plan
+        self.alloc_actual = alloc_actual
+        self.weights = weights
+
+    def rows(self, by: str = "site_dept", monthly: bool = False) -> List[Dict]:
+        """by: site / dept / site_dept 단위 합계 (monthly=True면 월별 행)"""
+        if by == "site":
+            keys = [(site,) for site, _ in self.targets]
+            names = ("site",)
+        elif by == "dept":
+            keys = [(dept,) for _, dept in self.targets]
+            names = ("dept_code",)
+        else:
+            keys = list(self.targets)
+            names = ("site", "dept_code")
+
+        groups = sorted(set(keys))
+        position = {k: i for i, k in enumerate(groups)}
+        g_idx = np.array([position[k] for k in keys], dtype=np.int64)
+
+        def group_sum(values: np.ndarray) -> np.ndarray:
+            out = np.zeros((len(groups), 12))
+            np.add.at(out, g_idx, values)
+            return out
+
+        direct_plan, direct_actual = group_sum(self.direct_plan), group_sum(self.direct_actual)
+        alloc_plan, alloc_actual = group_sum(self.alloc_plan), group_sum(self.alloc_actual)
+        weights = np.zeros(len(groups))
+        np.add.at(weights, g_idx, self.weights)
+
+        def amounts(i: int, sl: slice) -> Dict:
+            dp, da = int(round(direct_plan[i, sl].sum())), int(round(direct_actual[i, sl].sum()))
+            ap, aa = int(round(alloc_plan[i, sl].sum())), int(round(alloc_actual[i, sl].sum()))
+            return {
+                "direct_plan_amt": dp, "direct_actual_amt": da,
+                "allocated_plan_amt": ap, "allocated_actual_amt": aa,
+                "total_plan_amt": dp + ap, "total_actual_amt": da + aa,
+            }
+
+        result = []
+        for i, key in enumerate(groups):
+            base = dict(zip(names, key))
+            base["alloc_weight"] = round(float(weights[i]), 6)
+            if monthly:
+                for m, yyyymm in enumerate(self.months):
+                    result.append({**base, "yyyymm": yyyymm, **amounts(i, slice(m, m + 1))})
+            else:
+                result.append({**base, **amounts(i, slice(0, 12))})
+        return result
+
+
+def compute_allocation(db: Session, fiscal_year: str, version: str = "") -> AllocationResult:
+    matrix = load_year_matrix(db, fiscal_year)
+    attrs = {
+        proj_id: (dept_code, business_allocation, shared_ratio)
+        for proj_id, dept_code, business_allocation, shared_ratio in db.execute(
+            select(ProjectMaster.proj_id, ProjectMaster.dept_code,
+                   ProjectMaster.business_allocation, ProjectMaster.shared_ratio)
+            .where(ProjectMaster.fiscal_year == fiscal_year)
+        )
+    }
+
+    n_proj = len(matrix.proj_ids)
+    sites = [_site_of(attrs[pid][1]) for pid in matrix.proj_ids]
+    ratio = np.fromiter((_ratio_of(attrs[pid][2]) for pid in matrix.proj_ids), dtype=float, count=n_proj)
+    is_common = np.fromiter((s == COMMON_SITE for s in sites), dtype=bool, count=n_proj)
+    ratio[is_common] = 1.0
+
+    # 배분 대상: 공통이 아닌 (사업장, 부서)
+    targets = sorted({(s, attrs[pid][0]) for pid, s in zip(matrix.proj_ids, sites) if s != COMMON_SITE})
+    t_index = {t: i for i, t in enumerate(targets)}
+    t_idx = np.array([t_index.get((s, attrs[pid][0]), -1) for pid, s in zip(matrix.proj_ids, sites)], dtype=np.int64)
+    direct_mask = t_idx >= 0
+
+    keep = (1.0 - ratio)[:, None]
+    direct_plan = np.zeros((len(targets), 12))
+    direct_actual = np.zeros((len(targets), 12))
+    np.add.at(direct_plan, t_idx[direct_mask], (matrix.plan * keep)[direct_mask])
+    np.add.at(direct_actual, t_idx[direct_mask], (matrix.actual * keep)[direct_mask])
+
+    # 월별 공통비 풀
+    pool_plan = (matrix.plan * ratio[:, None]).sum(axis=0)
+    pool_actual = (matrix.actual * ratio[:, None]).sum(axis=0)
+
+    # 배분 비중: 연간 직접비(계획) 비중, 직접비가 전혀 없으면 균등
+    basis = direct_plan.sum(axis=1)
+    if basis.sum() > 0:
+        weights = basis / basis.sum()
+    else:
+        weights = np.full(len(targets), 1.0 / len(targets)) if targets else np.zeros(0)
+
+    return AllocationResult(
+        fiscal_year, version, targets,
+        direct_plan, direct_actual,
+        weights[:, None] * pool_plan[None, :],
+        weights[:, None] * pool_actual[None, :],
+        weights,
+    )
+
+
+_cache: Dict[str, AllocationResult] = {}
+
+
+def get_allocation(db: Session, fiscal_year: str) -> AllocationResult:
+    """캐시된 배분 결과를 반환합니다. (월 데이터/사업 마스터 버전이 바뀐 뒤 첫 호출에서 재계산)"""
+    versions = get_versions(db, MonthlyData.__tablename__, ProjectMaster.__tablename__)
+    version = f"{versions[MonthlyData.__tablename__]}.{versions[ProjectMaster.__tablename__]}"
+    cached = _cache.get(fiscal_year)
+    if cached is not None and cached.version == version:
+        return cached
+
+    # 버전을 먼저 읽고 계산하므로, 그 사이 변경이 있으면 다음 호출에서 다시 계산됨
+    result = compute_allocation(db, fiscal_year, version)
+    _cache[fiscal_year] = result
+    return result
@@ -0,0 +1,101 @@
+# app/core/budget_code_cache.py
+"""
+예산 분류 코드(tb_budget_code_master) 메모리 캐시.
+
+코드 전체를 한 번 읽어 id → 노드, 상위 → 하위 목록 인덱스를 만들어 두고,
+등록/수정/삭제 시 invalidate_budget_code_tree(db)로 버전을 올려 다음 조회 때 다시 읽습니다.
+버전은 app.core.versioning의 테이블 버전을 사용하므로 다른 워커의 변경도 반영됩니다.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.account import BudgetCodeMaster
+from app.core.versioning import get_version, bump_version
+
+_CODE_FIELDS = [c.name for c in BudgetCodeMaster.__table__.columns]
+
+
+class BudgetCodeTree:
+    def __init__(self, rows: List[BudgetCodeMaster], version: int):
+        self.version = version
+        self.nodes: Dict[str, dict] = {}
+        self.children: Dict[str, List[str]] = defaultdict(list)
+
+        for row in rows:
+            self.nodes[row.code_id] = {f: getattr(row, f) for f in _CODE_FIELDS}
+
+        def sort_key(code_id):
+            node = self.nodes[code_id]
+            return (node["sort_order"] or 0, code_id)
+
+        roots = []
+        for code_id, node in self.nodes.items():
+            parent_id = node["parent_code_id"]
+            if parent_id and parent_id in self.nodes:
+                self.children[parent_id].append(code_id)
+            else:
+                roots.append(code_id)
+
+        for ids in self.children.values():
+            ids.sort(key=sort_key)
+        self.roots = sorted(roots, key=lambda cid: (self.nodes[cid]["code_type"], sort_key(cid)))
+        self.ordered_ids = sorted(self.nodes, key=sort_key)
+
+    def get(self, code_id: str) -> Optional[dict]:
+        return self.nodes.get(code_id)
+
+    def exists(self, code_id: str, code_type: Optional[str] = None) -> bool:
+        node = self.nodes.get(code_id)
+        return node is not None and (code_type is None or node["code_type"] == code_type)
+
+    def has_children(self, code_id: str) -> bool:
+        return bool(self.children.get(code_id))
+
+    def flat_list(self, code_type: Optional[str] = None, active_only: bool = True) -> List[dict]:
+        """read_budget_codes와 같은 형태의 평면 목록 (sort_order 순)"""
+        return [
+            self.nodes[cid] for cid in self.ordered_ids
+            if (not active_only or self.nodes[cid]["is_active"] == 'Y')
+            and (code_type is None or self.nodes[cid]["code_type"] == code_type)
+        ]
+
+    def to_tree(self, active_only: bool = True) -> List[dict]:
+        """상위 → 하위 중첩 구조 (비활성 코드는 하위까지 제외)"""
+        def build(code_id):
+            node = self.nodes[code_id]
+            return {
+                **node,
+                "children": [
+                    build(child) for child in self.children.get(code_id, [])
+                    if not active_only or self.nodes[child]["is_active"] == 'Y'
+                ],
+            }
+
+        return [
+            build(cid) for cid in self.roots
+            if not active_only or self.nodes[cid]["is_active"] == 'Y'
+        ]
+
+
+_tree: Optional[BudgetCodeTree] = None
+
+
+def get_budget_code_tree(db: Session) -> BudgetCodeTree:
+    """캐시된 트리를 반환합니다. (버전이 바뀐 뒤 첫 호출에서 DB를 한 번 읽어 재구성)"""
+    global _tree
+    version = get_version(db, BudgetCodeMaster.__tablename__)
+    tree = _tree
+    if tree is not None and tree.version == version:
+        return tree
+
+    # 버전을 먼저 읽고 데이터를 읽으므로, 그 사이 변경이 있으면 다음 호출에서 다시 재구성됨
+    tree = BudgetCodeTree(db.query(BudgetCodeMaster).all(), version)
+    _tree = tree
+    return tree
+
+
+def invalidate_budget_code_tree(db: Session):
+    """코드 등록/수정/삭제 시 db.commit() 직전에 호출 (같은 트랜잭션에서 버전 증가)"""
+    bump_version(db, BudgetCodeMaster.__tablename__)
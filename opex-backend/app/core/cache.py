@@ -0,0 +1,261 @@
+# app/core/cache.py
+"""
+조회 결과 캐시 (@cached 데코레이터 + 태그 기반 무효화).
+
+- 1차: 워커 프로세스 메모리 LRU (CACHE_MEMORY_MAX_ENTRIES개)
+- 2차: 같은 서버의 워커끼리 공유하는 SQLite 파일 (CACHE_SHARED_PATH, 비우면 메모리만 사용)
+- 무효화: 결과에 붙인 태그(monthly:2025, projects, vendors ...)의 버전을 쓰기 작업 commit 직전에 invalidate(db, ...)로 올림
+
+태그 버전은 app.core.versioning의 버전 테이블을 그대로 사용하므로 쓰기와 함께 commit되어 다른 워커에서도 바로 보이고,
+캐시 키에 태그 버전이 들어가므로 무효화된 결과는 지우지 않아도 다시 쓰이지 않습니다. (LRU/용량 제한으로 정리)
+TTL(CACHE_DEFAULT_TTL_SECONDS)은 무효화를 빠뜨린 쓰기 경로에 대한 안전장치입니다.
+
+    @cached("report.budget_vs_actual", tags=("monthly:{year}", "projects"))
+    def budget_vs_actual_rows(db: Session, year: str) -> list: ...
+
+    invalidate(db, "monthly:2025", "projects")
+    db.commit()
+
+NOTE: 메모리 캐시는 같은 객체를 돌려주므로 결과를 수정하지 말 것.
+      적중/실패/축출 횟수는 GET /metrics의 opex_cache_* 지표 또는 cache_stats()로 확인합니다.
+"""
+import functools
+import inspect
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS, CACHE_EVICTIONS
+from app.core.database import ReadSessionLocal
+from app.core.versioning import bump_version, get_versions
+
+logger = logging.getLogger("app.cache")
+
+_MISSING = object()
+
+# 공유 캐시 용량 정리 주기 (set 횟수 기준)
+_PRUNE_EVERY = 50
+
+
+# ==========================================
+# 1. 태그 버전
+# ==========================================
+def _tag_key(tag: str) -> str:
+    # 테이블 버전과 이름이 겹치지 않도록 접두어
+    return "tag:" + tag
+
+
+def invalidate(db: Session, *tags: str):
+    """쓰기 작업의 db.commit() 직전에 호출: commit되면 이 태그가 붙은 캐시 결과를 모든 워커에서 무효화"""
+    bump_version(db, *[_tag_key(t) for t in tags if t])
+
+
+def monthly_tags(yyyymms: Iterable[str]):
+    """월(YYYYMM) 목록을 monthly:{연도} 태그로 (중복 제거)"""
+    return sorted({f"monthly:{m[:4]}" for m in yyyymms if m})
+
+
+def _tag_versions(db: Optional[Session], tags: Tuple[str, ...]) -> str:
+    if not tags:
+        return ""
+    if db is None:
+        with ReadSessionLocal() as session:
+            return _tag_versions(session, tags)
+    versions = get_versions(db, *[_tag_key(t) for t in tags])
+    return ",".join(f"{t}={versions[_tag_key(t)]}" for t in tags)
+
+
+# ==========================================
+# 2. 저장소
+# ==========================================
+class MemoryLRU:
+    """워커 프로세스 메모리 LRU (키 → (캐시 이름, 만료 시각, 값))"""
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float, Any]]" = OrderedDict()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[1] < time.time():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, name: str, key: str, value: Any, expires_at: float):
+        evicted = []
+        with self._lock:
+            self._entries[key] = (name, expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, (evicted_name, _, _) = self._entries.popitem(last=False)
+                evicted.append(evicted_name)
+        for evicted_name in evicted:
+            CACHE_EVICTIONS.inc((evicted_name, "memory"))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SharedStore:
+    """
+    워커 간 공유 캐시 (SQLite 파일, 스레드별 연결).
+    캐시이므로 오류가 나면 경고만 남기고 캐시 없이 동작합니다.
+    """
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._sets = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")  # 잃어도 다시 계산하면 되는 데이터
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                " key TEXT PRIMARY KEY, name TEXT NOT NULL, value BLOB NOT NULL,"
+                " expires_at REAL NOT NULL, stored_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entry_stored_at ON cache_entry (stored_at)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Tuple[Any, float]:
+        """(값, 만료 시각), 없으면 (_MISSING, 0)"""
+        try:
+            row = self._conn().execute(
+                "SELECT value, expires_at FROM cache_entry WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+            return (pickle.loads(row[0]), row[1]) if row else (_MISSING, 0)
+        except (sqlite3.Error, pickle.PickleError) as e:
+            logger.warning(f"shared cache read failed: {e}")
+            return _MISSING, 0
+
+    def set(self, name: str, key: str, value: Any, expires_at: float):
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entry (key, name, value, expires_at, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (key, name, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at, time.time()),
+            )
+            self._sets += 1
+            if self._sets % _PRUNE_EVERY == 0:
+                self.prune()
+        except (sqlite3.Error, pickle.PickleError) as e:
+            logger.warning(f"shared cache write failed: {e}")
+
+    def prune(self):
+        """만료된 항목과, max_entries를 넘는 오래된 항목 삭제"""
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entry WHERE expires_at < ?", (time.time(),))
+        evicted = conn.execute(
+            "DELETE FROM cache_entry WHERE key IN ("
+            " SELECT key FROM cache_entry ORDER BY stored_at DESC LIMIT -1 OFFSET ?"
+            ") RETURNING name",
+            (self.max_entries,),
+        ).fetchall()
+        for (name,) in evicted:
+            CACHE_EVICTIONS.inc((name, "shared"))
+
+    def clear(self):
+        try:
+            self._conn().execute("DELETE FROM cache_entry")
+        except sqlite3.Error as e:
+            logger.warning(f"shared cache clear failed: {e}")
+
+
+memory_cache = MemoryLRU(settings.CACHE_MEMORY_MAX_ENTRIES)
+shared_cache: Optional[SharedStore] = (
+    SharedStore(settings.CACHE_SHARED_PATH, settings.CACHE_SHARED_MAX_ENTRIES) if settings.CACHE_SHARED_PATH else None
+)
+
+
+# ==========================================
+# 3. 데코레이터
+# ==========================================
+TagSpec = Union[Iterable[str], Callable[..., Iterable[str]]]
+
+
+def cached(name: str, tags: TagSpec = (), ttl: Optional[float] = None):
+    """
+    함수 결과를 (인자, 태그 버전) 단위로 캐시합니다.
+    - tags: "monthly:{year}"처럼 인자 이름으로 채우는 문자열 목록, 또는 인자를 받아 태그 목록을 돌려주는 함수
+    - DB 세션(Session) 인자는 캐시 키에서 제외 (태그 버전은 그 세션으로 조회)
+    """
+    ttl = settings.CACHE_DEFAULT_TTL_SECONDS if ttl is None else ttl
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        def resolve_tags(arguments: Dict[str, Any]) -> Tuple[str, ...]:
+            if callable(tags):
+                return tuple(tags(**arguments))
+            return tuple(t.format(**arguments) for t in tags)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not settings.CACHE_ENABLED:
+                return fn(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            db = next((v for v in bound.arguments.values() if isinstance(v, Session)), None)
+            key_args = {k: v for k, v in bound.arguments.items() if not isinstance(v, Session)}
+            key = f"{name}|{sorted(key_args.items())!r}|{_tag_versions(db, resolve_tags(bound.arguments))}"
+
+            value = memory_cache.get(key)
+            if value is not _MISSING:
+                CACHE_REQUESTS.inc((name, "memory", "hit"))
+                return value
+            CACHE_REQUESTS.inc((name, "memory", "miss"))
+
+            if shared_cache is not None:
+                value, expires_at = shared_cache.get(key)
+                if value is not _MISSING:
+                    CACHE_REQUESTS.inc((name, "shared", "hit"))
+                    memory_cache.set(name, key, value, expires_at)
+                    return value
+                CACHE_REQUESTS.inc((name, "shared", "miss"))
+
+            # 태그 버전을 계산 전에 읽었으므로, 계산 중 무효화가 있으면 다음 호출은 새 키로 다시 계산됨
+            expires_at = time.time() + ttl
+            value = fn(*args, **kwargs)
+            memory_cache.set(name, key, value, expires_at)
+            if shared_cache is not None:
+                shared_cache.set(name, key, value, expires_at)
+            return value
+
+        wrapper.cache_name = name
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """캐시 이름별 적중/실패/축출 횟수 (이 워커 기준)"""
+    stats: Dict[str, Dict[str, int]] = {}
+    for (name, layer, result), count in CACHE_REQUESTS.snapshot().items():
+        stats.setdefault(name, {})[f"{layer}_{result}"] = count
+    for (name, layer), count in CACHE_EVICTIONS.snapshot().items():
+        stats.setdefault(name, {})[f"{layer}_evictions"] = count
+    return stats
@@ -1,4 +1,6 @@
 # app/core/config.py
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -8,6 +10,50 @@ class Settings(BaseSettings):
     # SQLite URL
     DATABASE_URL: str
 
+    # 조회(GET) 전용 DB 주소 (예: Postgres 읽기 복제본). 비우면 DATABASE_URL의 SQLite 파일을 읽기 전용으로 사용
+    READ_DATABASE_URL: Optional[str] = None
+
+    # SQLite 쓰기 잠금 대기 시간 (동시 등록이 몰려도 잠금 오류 대신 순서대로 처리)
+    SQLITE_BUSY_TIMEOUT_SECONDS: float = 30
+
+    # 마감 연도 SAP 원장 Parquet 보관 경로
+    SAP_ARCHIVE_DIR: str = "./archive/sap_raw"
+
+    # 이 크기(bytes) 이상인 응답만 gzip/br 압축
+    COMPRESSION_MIN_SIZE: int = 1000
+
+    # 한 요청에서 같은 SQL이 이 횟수 이상 실행되면 N+1 의심 경고 로그
+    QUERY_REPEAT_WARN_THRESHOLD: int = 10
+
+    # 로그 출력 형식: json (한 줄 JSON) / text
+    LOG_FORMAT: str = "json"
+
+    # 예실 차이 경보 기준 (계획 대비 %, WARNING / CRITICAL)
+    ALERT_MONTH_OVER_WARN_PCT: float = 110      # 월 실적 / 월 계획
+    ALERT_MONTH_OVER_CRITICAL_PCT: float = 150
+    ALERT_BURN_WARN_PCT: float = 90             # 연간 누적 실적 / 연간 계획
+    ALERT_BURN_CRITICAL_PCT: float = 100
+    ALERT_FORECAST_WARN_PCT: float = 100        # (실적 + 잔여 추정) / 연간 계획
+    ALERT_FORECAST_CRITICAL_PCT: float = 110
+
+    # 데이터 변경 알림(SSE, /api/v1/events)
+    EVENT_QUEUE_SIZE: int = 100           # 클라이언트별 대기 알림 수 (넘치면 resync)
+    EVENT_KEEPALIVE_SECONDS: float = 15   # 알림이 없을 때 keep-alive 주석 전송 간격
+    EVENT_STREAM_MAX_SECONDS: float = 300 # 연결 최대 유지 시간 (이후 클라이언트 자동 재접속)
+    EVENT_RETRY_MS: int = 3000            # 재접속 대기 시간
+    EVENT_MAX_PROJ_IDS: int = 200         # 이보다 많으면 proj_ids를 null로 전송
+
+    # 지출 분석 큐브 백그라운드 재집계 (app/core/cube.py)
+    CUBE_REFRESH_INTERVAL_SECONDS: float = 5   # 쓰기 알림이 없어도 변경 표시를 확인하는 주기 (다른 워커/직접 수정분)
+    CUBE_REFRESH_DELAY_SECONDS: float = 0.2    # 쓰기 알림 후 이만큼 모았다가 한 번에 재집계
+
+    # 조회 결과 캐시 (app/core/cache.py)
+    CACHE_ENABLED: bool = True
+    CACHE_MEMORY_MAX_ENTRIES: int = 256                  # 워커별 메모리 LRU 크기
+    CACHE_SHARED_PATH: str = "./.cache/opex_cache.db"    # 워커 간 공유 캐시(SQLite 파일), 비우면 메모리만 사용
+    CACHE_SHARED_MAX_ENTRIES: int = 2000
+    CACHE_DEFAULT_TTL_SECONDS: float = 600               # 무효화를 빠뜨린 쓰기 경로 대비 최대 보관 시간
+
     # SQLAlchemy 접속 주소 (SQLite는 그대로 사용)
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
@@ -0,0 +1,305 @@
+# app/core/cube.py
+"""
+지출 분석 큐브 (tb_spend_cube).
+
+월 × (부서, 예산 분류(대2), 예산 성격, 예산보고 분류, 협력업체, 서비스, CC) 최소 단위로 미리 집계해 두고,
+/report/cube는 어떤 차원/필터 조합이든 이 요약 테이블만 GROUP BY 합니다. (원천 월 데이터 재스캔 없음)
+
+- 금액 기준은 예실 대비(budget_vs_actual_stmt)와 같습니다: 마감 스냅샷이 있는 월은 스냅샷, 나머지는 MonthlyData
+- 월 데이터/스냅샷/사업 분석 속성을 바꾸는 쓰기 API는 commit 전에 mark_dirty()/mark_projects_dirty()로
+  해당 월을 tb_spend_cube_dirty에 기록 (모든 DB 공통)
+- SQLite는 같은 내용을 DB 트리거로도 기록하므로 API를 거치지 않은 직접 수정도 반영됨
+  (그 외 DB는 트리거가 없으므로 직접 수정한 경우 mark_all_dirty()로 전체 재집계)
+- 변경된 월의 재집계는 요청 경로 밖의 백그라운드 스레드(CubeRefresher)가 담당
+  (쓰기 API는 commit 후 request_cube_refresh()로 깨우기만 하며, 몰린 쓰기는 월별로 한 번만 재집계)
+- 서버 시작 시 한 번 동기로 집계, 이후에는 CUBE_REFRESH_INTERVAL_SECONDS마다도 확인 (다른 워커/직접 수정분)
+- /report/cube 조회는 큐브만 읽음 (읽기 세션, 재집계 없음)
+"""
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import select, insert, delete, func, union_all, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import engine, SessionLocal
+from app.models.project import ProjectMaster, MonthlyData
+from app.models.closing import MonthlyCloseSnapshot
+from app.models.cube import SpendCube, SpendCubeDirty
+
+logger = logging.getLogger("app.cube")
+
+# 조회 가능한 차원 (yyyymm 외에는 사업 마스터 속성)
+ATTR_DIMENSIONS = (
+    "dept_code", "budget_l2", "budget_nature_type", "report_class_type",
+    "vendor_id", "svc_id", "cost_center_code",
+)
+CUBE_DIMENSIONS = ("yyyymm",) + ATTR_DIMENSIONS
+
+# IN 절 바인딩 개수 제한(SQLite) 대비
+_CHUNK_SIZE = 200
+
+_cube = SpendCube.__table__
+_dirty = SpendCubeDirty.__table__
+
+_MARK = "INSERT OR IGNORE INTO tb_spend_cube_dirty (yyyymm)"
+
+# 변경된 월 기록 트리거 (SQLite)
+_TRIGGERS = {
+    "trg_cube_monthly_ins": f"""
+        AFTER INSERT ON tb_monthly_data
+        BEGIN {_MARK} VALUES (NEW.yyyymm); END""",
+    "trg_cube_monthly_upd": f"""
+        AFTER UPDATE ON tb_monthly_data
+        WHEN OLD.plan_amt IS NOT NEW.plan_amt OR OLD.actual_amt IS NOT NEW.actual_amt
+          OR OLD.est_amt IS NOT NEW.est_amt OR OLD.proj_id IS NOT NEW.proj_id OR OLD.yyyymm IS NOT NEW.yyyymm
+        BEGIN {_MARK} VALUES (OLD.yyyymm); {_MARK} VALUES (NEW.yyyymm); END""",
+    "trg_cube_monthly_del": f"""
+        AFTER DELETE ON tb_monthly_data
+        BEGIN {_MARK} VALUES (OLD.yyyymm); END""",
+    "trg_cube_snapshot_ins": f"""
+        AFTER INSERT ON tb_monthly_close_snapshot
+        BEGIN {_MARK} VALUES (NEW.yyyymm); END""",
+    "trg_cube_snapshot_upd": f"""
+        AFTER UPDATE ON tb_monthly_close_snapshot
+        BEGIN {_MARK} VALUES (OLD.yyyymm); {_MARK} VALUES (NEW.yyyymm); END""",
+    "trg_cube_snapshot_del": f"""
+        AFTER DELETE ON tb_monthly_close_snapshot
+        BEGIN {_MARK} VALUES (OLD.yyyymm); END""",
+    "trg_cube_project_upd": f"""
+        AFTER UPDATE OF {", ".join(ATTR_DIMENSIONS)} ON tb_project_master
+        BEGIN {_MARK} SELECT DISTINCT yyyymm FROM tb_monthly_data WHERE proj_id = NEW.proj_id; END""",
+    "trg_cube_project_del": f"""
+        AFTER DELETE ON tb_project_master
+        BEGIN {_MARK} SELECT DISTINCT yyyymm FROM tb_monthly_data WHERE proj_id = OLD.proj_id; END""",
+}
+
+
+def _insert_ignore(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(SpendCubeDirty)
+
+
+def _mark(conn, months: Iterable[str]):
+    """conn: Connection 또는 Session"""
+    rows = [{"yyyymm": m} for m in sorted({m for m in months if m})]
+    dialect_name = (conn.dialect if hasattr(conn, "dialect") else conn.get_bind().dialect).name
+    for i in range(0, len(rows), _CHUNK_SIZE):
+        conn.execute(
+            _insert_ignore(dialect_name).values(rows[i:i + _CHUNK_SIZE])
+            .on_conflict_do_nothing(index_elements=["yyyymm"])
+        )
+
+
+def ensure_cube():
+    """
+    변경 추적 트리거를 만들고, 큐브에 아직 없는 월을 재계산 대상으로 표시합니다. (서버 시작 시)
+    처음 실행할 때는 모든 월이 대상이 되어 다음 갱신에서 전체 집계됩니다.
+    """
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            for name, body in _TRIGGERS.items():
+                conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+        else:
+            logger.warning(
+                f"spend cube: change-tracking triggers are not supported on {engine.dialect.name}; "
+                "only writes through the API mark cube months dirty. "
+                "After direct SQL changes, rebuild with POST /api/v1/report/cube/rebuild."
+            )
+        missing = conn.execute(
+            select(MonthlyData.yyyymm).distinct()
+            .where(MonthlyData.yyyymm.notin_(select(_cube.c.yyyymm).distinct()))
+        ).scalars().all()
+        _mark(conn, missing)
+
+
+def mark_dirty(db: Session, months: Iterable[str]):
+    """월 데이터/마감 스냅샷이 바뀐 월을 재집계 대상으로 표시 (쓰기 작업의 commit 전에 호출)"""
+    _mark(db, months)
+
+
+def mark_projects_dirty(db: Session, proj_ids: Iterable[str]):
+    """
+    사업의 월 데이터가 있는 모든 월을 재집계 대상으로 표시 (사업 등록/분석 속성 변경/삭제 시, 삭제는 월 데이터 삭제 전에 호출)
+    아직 flush되지 않은 ORM 변경(신규 월 데이터 등)도 포함되도록 먼저 flush합니다.
+    """
+    db.flush()
+    ids = sorted(set(proj_ids))
+    months = set()
+    for i in range(0, len(ids), _CHUNK_SIZE):
+        months.update(db.execute(
+            select(MonthlyData.yyyymm).distinct().where(MonthlyData.proj_id.in_(ids[i:i + _CHUNK_SIZE]))
+        ).scalars())
+    _mark(db, months)
+
+
+def mark_all_dirty(db: Session):
+    """전체 재집계 (commit은 호출한 쪽에서)"""
+    months = set(db.execute(select(MonthlyData.yyyymm).distinct()).scalars())
+    months.update(db.execute(select(_cube.c.yyyymm).distinct()).scalars())
+    _mark(db, months)
+
+
+def _month_rows_stmt(months: List[str]):
+    """주어진 월들의 최소 단위 집계 (큐브 INSERT ... SELECT 원본)"""
+    snapshot_months = select(MonthlyCloseSnapshot.yyyymm).where(
+        MonthlyCloseSnapshot.yyyymm.in_(months)
+    ).distinct()
+
+    live = select(
+        MonthlyData.proj_id.label("proj_id"),
+        MonthlyData.yyyymm.label("yyyymm"),
+        MonthlyData.plan_amt.label("plan_amt"),
+        MonthlyData.actual_amt.label("actual_amt"),
+        MonthlyData.est_amt.label("est_amt"),
+    ).where(
+        MonthlyData.yyyymm.in_(months),
+        MonthlyData.yyyymm.notin_(snapshot_months),
+    )
+    frozen = select(
+        MonthlyCloseSnapshot.proj_id,
+        MonthlyCloseSnapshot.yyyymm,
+        MonthlyCloseSnapshot.plan_amt,
+        MonthlyCloseSnapshot.actual_amt,
+        MonthlyCloseSnapshot.est_amt,
+    ).where(MonthlyCloseSnapshot.yyyymm.in_(months))
+    amounts = union_all(live, frozen).subquery()
+
+    attrs = [getattr(ProjectMaster, d) for d in ATTR_DIMENSIONS]
+    return select(
+        func.substr(amounts.c.yyyymm, 1, 4),
+        amounts.c.yyyymm,
+        *attrs,
+        func.sum(amounts.c.plan_amt),
+        func.sum(amounts.c.actual_amt),
+        func.sum(amounts.c.est_amt),
+        func.count(func.distinct(amounts.c.proj_id)),
+    ).join(
+        ProjectMaster, ProjectMaster.proj_id == amounts.c.proj_id
+    ).group_by(amounts.c.yyyymm, *attrs)
+
+
+def refresh_cube(db: Session) -> int:
+    """
+    변경 표시된 월만 다시 집계하고 commit합니다. 재집계한 월 수를 반환합니다.
+    표시 삭제(DELETE ... RETURNING)를 가장 먼저 실행해 쓰기 잠금을 잡으므로,
+    집계 도중 커밋되는 다른 변경은 끼어들 수 없고 이후 변경은 다음 갱신에서 반영됩니다.
+    """
+    months = sorted(db.execute(delete(_dirty).returning(_dirty.c.yyyymm)).scalars())
+    if not months:
+        db.rollback()
+        return 0
+
+    columns = ["year", "yyyymm", *ATTR_DIMENSIONS, "plan_amt", "actual_amt", "est_amt", "proj_count"]
+    for i in range(0, len(months), _CHUNK_SIZE):
+        chunk = months[i:i + _CHUNK_SIZE]
+        db.execute(delete(_cube).where(_cube.c.yyyymm.in_(chunk)))
+        db.execute(insert(_cube).from_select(columns, _month_rows_stmt(chunk)))
+    db.commit()
+    return len(months)
+
+
+def has_dirty_months(db: Session) -> bool:
+    return db.execute(select(_dirty.c.yyyymm).limit(1)).first() is not None
+
+
+# ==========================================
+# 백그라운드 재집계 (요청 경로 밖)
+# ==========================================
+class CubeRefresher:
+    """
+    변경 표시된 월을 백그라운드 스레드에서 재집계합니다.
+    - 깨운 뒤 delay만큼 기다렸다가 그 사이 쌓인 표시를 한 번에 처리 (같은 월의 연속 쓰기는 한 번만 재집계)
+    - 재집계가 실패해도 표시는 그대로 남으므로 다음 주기에 다시 시도
+    - 워커가 여러 개여도 표시 삭제(DELETE ... RETURNING)로 나눠 가지므로 같은 월을 중복 집계하지 않음
+    """
+
+    def __init__(self, interval: float, delay: float):
+        self.interval = interval
+        self.delay = delay
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cube-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def request(self):
+        """어느 스레드에서든 호출 가능 (DB 접근 없음)"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._wake.wait(self.interval):
+                self._stop.wait(self.delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.refresh_once()
+
+    def refresh_once(self) -> int:
+        db = SessionLocal()
+        try:
+            if not has_dirty_months(db):
+                return 0
+            db.rollback()  # 읽기 트랜잭션 종료 후 표시 삭제로 쓰기 시작
+            return refresh_cube(db)
+        except Exception:
+            db.rollback()
+            logger.exception("spend cube refresh failed; dirty months are kept for the next refresh")
+            return 0
+        finally:
+            db.close()
+
+
+cube_refresher = CubeRefresher(settings.CUBE_REFRESH_INTERVAL_SECONDS, settings.CUBE_REFRESH_DELAY_SECONDS)
+
+
+def request_cube_refresh():
+    """쓰기 작업의 commit 후 호출: 백그라운드 재집계를 깨움"""
+    cube_refresher.request()
+
+
+def cube_query_stmt(year: str, dims: Sequence[str], filters: Dict[str, List[Optional[str]]],
+                    month_from: Optional[str] = None, month_to: Optional[str] = None):
+    """요약 테이블에서 dims로 묶은 합계 (filters: 차원 → 허용 값 목록, None은 미지정)"""
+    group_cols = [_cube.c[d] for d in dims]
+    stmt = select(
+        *group_cols,
+        func.sum(_cube.c.plan_amt).label("plan_amt"),
+        func.sum(_cube.c.actual_amt).label("actual_amt"),
+        func.sum(_cube.c.est_amt).label("est_amt"),
+    ).where(_cube.c.year == year)
+
+    if month_from:
+        stmt = stmt.where(_cube.c.yyyymm >= month_from)
+    if month_to:
+        stmt = stmt.where(_cube.c.yyyymm <= month_to)
+    for dim, values in filters.items():
+        col = _cube.c[dim]
+        named = [v for v in values if v is not None]
+        conds = []
+        if named:
+            conds.append(col.in_(named))
+        if len(named) != len(values):
+            conds.append(col.is_(None))
+        stmt = stmt.where(conds[0] if len(conds) == 1 else (conds[0] | conds[1]))
+
+    if group_cols:
+        stmt = stmt.group_by(*group_cols).order_by(*group_cols)
+    return stmt
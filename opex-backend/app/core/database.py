@@ -1,16 +1,70 @@
 # app/core/database.py
-from sqlalchemy import create_engine
+import os
+import time
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.query_stats import record_query
+
+def _is_sqlite_file(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
 
-# 1. 엔진 생성 (SQLite 전용 옵션 추가)
+def _read_only_uri(url: str) -> str:
+    """SQLite 파일 DB를 읽기 전용(mode=ro)으로 여는 URI"""
+    path = os.path.abspath(make_url(url).database).replace(os.sep, "/")
+    return f"sqlite:///file:{path}?mode=ro&uri=true"
+
+
+# 1. 엔진 생성
+#    - engine      : 쓰기(읽기/쓰기) 전용. 업로드/수정/마감 등
+#    - read_engine : 조회(GET) 전용. READ_DATABASE_URL(복제본)이 있으면 그쪽, 없으면 같은 SQLite 파일을 읽기 전용으로 연결
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    connect_args={"check_same_thread": False}  # <-- SQLite 필수 옵션!
+    connect_args={"check_same_thread": False,  # <-- SQLite 필수 옵션!
+                  "timeout": settings.SQLITE_BUSY_TIMEOUT_SECONDS},
 )
 
-# 2. 세션 관리자
+if settings.READ_DATABASE_URL:
+    read_engine = create_engine(
+        settings.READ_DATABASE_URL,
+        connect_args={"check_same_thread": False} if make_url(settings.READ_DATABASE_URL).get_backend_name() == "sqlite" else {},
+    )
+elif _is_sqlite_file(settings.SQLALCHEMY_DATABASE_URI):
+    read_engine = create_engine(
+        _read_only_uri(settings.SQLALCHEMY_DATABASE_URI),
+        connect_args={"check_same_thread": False},
+    )
+else:
+    read_engine = engine
+
+# 1-1. SQLite WAL 모드: 쓰기 트랜잭션(일괄 업로드 등)이 진행 중이어도 조회가 기다리지 않음
+#      (DB 파일에 기록되는 설정이라 쓰기 연결에서만 지정, 읽기 전용 연결은 그대로 따름)
+if _is_sqlite_file(settings.SQLALCHEMY_DATABASE_URI):
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")  # WAL에서는 NORMAL로도 손상 없음 (커밋 시 fsync 감소)
+        cursor.close()
+
+# 1-2. SQL 실행 계측 (요청별 쿼리 수/시간 집계, app/core/query_stats.py)
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start_time = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    record_query(statement, time.perf_counter() - context._query_start_time)
+
+for _engine in {engine, read_engine}:
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+
+# 2. 세션 관리자 (ReadSessionLocal은 commit하지 않음)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # 3. 모델 베이스
 Base = declarative_base()
@@ -21,4 +75,41 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# 4-1. 조회 전용 세션 (GET 라우터용, 쓰기 트랜잭션과 잠금을 다투지 않음)
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# 5. 인덱스 보강 (create_all은 기존 테이블에 새 인덱스를 만들지 않으므로 별도 생성)
+def ensure_indexes():
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+# 6. 컬럼 보강 (create_all은 기존 테이블에 새 컬럼을 추가하지 않으므로 nullable 컬럼만 ALTER TABLE로 추가)
+def ensure_columns():
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    col_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+
+
+# 7. 테이블/컬럼/인덱스 생성 (import 시점이 아니라 앱 시작 시 1회 실행)
+def init_db():
+    Base.metadata.create_all(bind=engine)
+    ensure_columns()
+    ensure_indexes()
@@ -0,0 +1,96 @@
+# app/core/events.py
+"""
+데이터 변경 알림 (Server-Sent Events, GET /api/v1/events).
+
+쓰기 작업이 commit 후 publish()/publish_cells()로 변경 내용(테이블, 연도, 월, 사업 Index)을 알리면
+이벤트 루프에서 접속 중인 클라이언트별 큐(크기 EVENT_QUEUE_SIZE)로 나눠 넣습니다.
+- 동기 라우터(스레드풀)에서도 호출할 수 있도록 call_soon_threadsafe로 루프에 전달
+- 큐가 가득 찬(느린) 클라이언트는 밀린 알림을 버리고 resync(전체 재조회) 알림 하나만 받음
+
+NOTE: 알림은 워커 프로세스 단위입니다. (워커가 여러 개면 같은 워커에 접속한 클라이언트만 받음)
+"""
+import asyncio
+import itertools
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+class EventBroker:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._clients: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._seq = itertools.count(1)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def subscribe(self) -> asyncio.Queue:
+        """SSE 응답(이벤트 루프)에서 호출"""
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._clients.discard(queue)
+
+    def publish(self, event: Dict):
+        """어느 스레드에서든 호출 가능 (접속한 클라이언트가 없으면 바로 반환)"""
+        loop = self._loop
+        if not self._clients or loop is None:
+            return
+        event = {"id": next(self._seq), "ts": round(time.time(), 3), **event}
+        try:
+            loop.call_soon_threadsafe(self._fanout, event)
+        except RuntimeError:
+            pass  # 루프 종료 중
+
+    def _fanout(self, event: Dict):
+        for queue in list(self._clients):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # 느린 클라이언트: 밀린 알림 대신 전체 재조회 요청 하나만 남김
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"id": event["id"], "ts": event["ts"], "type": "resync"})
+
+
+broker = EventBroker(settings.EVENT_QUEUE_SIZE)
+
+
+def publish(table: str, source: str, fiscal_year: Optional[str] = None,
+            yyyymm: Optional[Iterable[str]] = None, proj_ids: Optional[Iterable[str]] = None):
+    """
+    변경 알림 발행 (commit 이후 호출).
+    proj_ids가 EVENT_MAX_PROJ_IDS를 넘으면 null로 보내며, 클라이언트는 해당 연도/월 전체를 다시 읽습니다.
+    """
+    ids = sorted(set(proj_ids)) if proj_ids is not None else None
+    if ids is not None and len(ids) > settings.EVENT_MAX_PROJ_IDS:
+        ids = None
+    broker.publish({
+        "type": "change",
+        "table": table,
+        "source": source,
+        "fiscal_year": fiscal_year,
+        "yyyymm": sorted(set(yyyymm)) if yyyymm is not None else None,
+        "proj_ids": ids,
+    })
+
+
+def publish_cells(table: str, source: str, cells: Iterable[Tuple[str, str]]):
+    """변경된 (proj_id, yyyymm) 목록을 회계연도별 알림으로 묶어 발행"""
+    if not broker.client_count:
+        return
+    by_year: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    for proj_id, yyyymm in cells:
+        if yyyymm:
+            by_year[yyyymm[:4]].append((proj_id, yyyymm))
+    for year, year_cells in sorted(by_year.items()):
+        publish(table, source, fiscal_year=year,
+                yyyymm=[m for _, m in year_cells], proj_ids=[p for p, _ in year_cells])
@@ -0,0 +1,177 @@
+# app/core/forecast.py
+"""
+잔여 월 추정(est_amt) 계산 엔진.
+
+한 회계연도의 사업별 계획/실적/추정을 (사업 수 × 12개월) NumPy 배열로 한 번에 읽어
+기준월(cutoff) 이후 월의 추정치를 벡터 연산 한 번으로 계산합니다.
+
+- run_rate   : 연초~기준월 실적 월평균
+- plan_shape : 잔여 월 계획 × (누적 실적 / 누적 계획)  (계획의 월별 모양 유지)
+- last_n_avg : 기준월 포함 최근 N개월 실적 평균
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select, func, bindparam, update, insert
+from sqlalchemy.orm import Session
+
+from app.models.project import ProjectMaster, MonthlyData
+from app.models.closing import MonthlyClose
+from app.core.history import record_changes
+
+METHODS = ("run_rate", "plan_shape", "last_n_avg")
+
+
+class YearMatrix:
+    """사업 × 월 배열 (행: proj_ids 순서, 열: 1~12월)"""
+    def __init__(self, fiscal_year: str, proj_ids: List[str], plan: np.ndarray, actual: np.ndarray, est: np.ndarray):
+        self.fiscal_year = fiscal_year
+        self.proj_ids = proj_ids
+        self.months = [f"{fiscal_year}{m:02d}" for m in range(1, 13)]
+        self.plan = plan
+        self.actual = actual
+        self.est = est
+
+
+def load_year_matrix(db: Session, fiscal_year: str, proj_ids: Optional[List[str]] = None) -> YearMatrix:
+    """해당 연도 사업의 월별 금액을 한 번의 조회로 읽어 배열로 만듭니다."""
+    proj_query = select(ProjectMaster.proj_id).where(ProjectMaster.fiscal_year == fiscal_year)
+    if proj_ids:
+        proj_query = proj_query.where(ProjectMaster.proj_id.in_(proj_ids))
+    ids = list(db.execute(proj_query.order_by(ProjectMaster.proj_id)).scalars())
+    index = {pid: i for i, pid in enumerate(ids)}
+
+    rows = db.execute(
+        select(
+            MonthlyData.proj_id,
+            MonthlyData.yyyymm,
+            func.sum(MonthlyData.plan_amt),
+            func.sum(MonthlyData.actual_amt),
+            func.sum(MonthlyData.est_amt),
+        ).where(
+            MonthlyData.proj_id.in_(proj_query.scalar_subquery()),
+            MonthlyData.yyyymm.like(f"{fiscal_year}%"),
+        ).group_by(MonthlyData.proj_id, MonthlyData.yyyymm)
+    ).all()
+
+    shape = (len(ids), 12)
+    plan, actual, est = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    if rows:
+        # 잘못된 월(예: 999912 등)은 제외
+        valid = [r for r in rows if r[0] in index and r[1][4:6].isdigit() and 1 <= int(r[1][4:6]) <= 12]
+        if valid:
+            r_idx = np.fromiter((index[r[0]] for r in valid), dtype=np.int64, count=len(valid))
+            m_idx = np.fromiter((int(r[1][4:6]) - 1 for r in valid), dtype=np.int64, count=len(valid))
+            values = np.array([[float(r[2] or 0), float(r[3] or 0), float(r[4] or 0)] for r in valid])
+            plan[r_idx, m_idx] = values[:, 0]
+            actual[r_idx, m_idx] = values[:, 1]
+            est[r_idx, m_idx] = values[:, 2]
+
+    return YearMatrix(fiscal_year, ids, plan, actual, est)
+
+
+def default_cutoff(matrix: YearMatrix) -> int:
+    """실적이 한 건이라도 있는 마지막 월 (1~12, 없으면 0)"""
+    has_actual = np.flatnonzero((matrix.actual != 0).any(axis=0))
+    return int(has_actual[-1]) + 1 if has_actual.size else 0
+
+
+def compute_estimates(matrix: YearMatrix, method: str, cutoff: int, n_months: int = 3) -> np.ndarray:
+    """
+    기준월(cutoff, 1~12) 이후 월의 추정치 배열 (사업 수 × 12).
+    기준월 이전(실적 확정) 열은 NaN.
+    """
+    if method not in METHODS:
+        raise ValueError(f"지원하지 않는 추정 방식입니다: {method}")
+    if not 0 <= cutoff <= 12:
+        raise ValueError("기준월은 0~12 사이여야 합니다.")
+
+    n_proj = len(matrix.proj_ids)
+    result = np.full((n_proj, 12), np.nan)
+    if cutoff == 12 or n_proj == 0:
+        return result
+
+    remaining = slice(cutoff, 12)
+    ytd_actual = matrix.actual[:, :cutoff].sum(axis=1)
+
+    if cutoff == 0:
+        # 실적이 없으면 모든 방식이 계획 그대로
+        est = matrix.plan[:, remaining]
+    elif method == "run_rate":
+        est = np.repeat((ytd_actual / cutoff)[:, None], 12 - cutoff, axis=1)
+    elif method == "plan_shape":
+        ytd_plan = matrix.plan[:, :cutoff].sum(axis=1)
+        # 누적 계획이 0이면(실적 기준 없음) 계획 그대로
+        ratio = np.divide(ytd_actual, ytd_plan, out=np.ones(n_proj), where=ytd_plan != 0)
+        est = matrix.plan[:, remaining] * ratio[:, None]
+    else:
+        n = max(1, min(n_months, cutoff))
+        recent = matrix.actual[:, cutoff - n:cutoff].mean(axis=1)
+        est = np.repeat(recent[:, None], 12 - cutoff, axis=1)
+
+    # 원 단위 반올림, 음수(역분개 영향)는 0
+    result[:, remaining] = np.clip(np.rint(est), 0, None)
+    return result
+
+
+def closed_months(db: Session, fiscal_year: str) -> List[str]:
+    return list(db.execute(
+        select(MonthlyClose.yyyymm).where(
+            MonthlyClose.yyyymm.like(f"{fiscal_year}%"),
+            MonthlyClose.close_status == 'CLOSED',
+        )
+    ).scalars())
+
+
+def bulk_upsert_estimates(db: Session, fiscal_year: str, items: List[Dict]) -> Dict[str, int]:
+    """
+    {proj_id, yyyymm, est_amt} 목록을 기존 행은 UPDATE executemany 한 번, 없는 행은 INSERT 한 번으로 반영합니다.
+    변경 이력도 함께 일괄 기록합니다. (commit은 호출한 쪽에서)
+    """
+    # (사업, 월) -> (행 수, 현재 추정 합계)
+    existing = {
+        (proj_id, yyyymm): (rows, est or 0)
+        for proj_id, yyyymm, rows, est in db.execute(
+            select(MonthlyData.proj_id, MonthlyData.yyyymm, func.count(), func.sum(MonthlyData.est_amt))
+            .where(MonthlyData.yyyymm.like(f"{fiscal_year}%"))
+            .group_by(MonthlyData.proj_id, MonthlyData.yyyymm)
+        )
+    }
+
+    to_update = [{"b_proj": i["proj_id"], "b_month": i["yyyymm"], "b_est": i["est_amt"]}
+                 for i in items if (i["proj_id"], i["yyyymm"]) in existing]
+    to_insert = [{"proj_id": i["proj_id"], "yyyymm": i["yyyymm"], "est_amt": i["est_amt"], "plan_amt": 0, "actual_amt": 0}
+                 for i in items if (i["proj_id"], i["yyyymm"]) not in existing]
+
+    if to_update:
+        db.execute(
+            update(MonthlyData.__table__)
+            .where(MonthlyData.proj_id == bindparam("b_proj"), MonthlyData.yyyymm == bindparam("b_month"))
+            .values(est_amt=bindparam("b_est")),
+            to_update,
+        )
+    if to_insert:
+        db.execute(insert(MonthlyData.__table__), to_insert)
+
+    # 같은 사업-월에 행이 여러 개면 모든 행이 같은 값으로 바뀜
+    record_changes(db, (
+        {"proj_id": i["proj_id"], "yyyymm": i["yyyymm"], "field": "est_amt",
+         "old_value": existing.get((i["proj_id"], i["yyyymm"]), (1, 0))[1],
+         "new_value": i["est_amt"] * existing.get((i["proj_id"], i["yyyymm"]), (1, 0))[0]}
+        for i in items
+    ))
+
+    return {"updated": len(to_update), "inserted": len(to_insert)}
+
+
+def estimate_rows(matrix: YearMatrix, estimates: np.ndarray, closed: set) -> List[Dict]:
+    """추정치가 있는 (사업, 월) 칸을 미리보기 행 목록으로 변환"""
+    r_idx, m_idx = np.nonzero(~np.isnan(estimates))
+    return [{
+        "proj_id": matrix.proj_ids[r],
+        "yyyymm": matrix.months[m],
+        "plan_amt": int(matrix.plan[r, m]),
+        "current_est_amt": int(matrix.est[r, m]),
+        "est_amt": int(estimates[r, m]),
+        "closed": matrix.months[m] in closed,
+    } for r, m in zip(r_idx.tolist(), m_idx.tolist())]
@@ -0,0 +1,178 @@
+# app/core/history.py
+"""
+월별 데이터 변경 이력 (tb_monthly_data_history)과 시점(as_of) 조회.
+
+- ORM으로 수정/추가/삭제한 MonthlyData는 flush 직전(before_flush)에 변경된 금액 필드를 모아 한 번에 INSERT
+- ORM을 거치지 않는 일괄 UPDATE/INSERT 경로는 record_changes()로 직접 기록
+- 변경자/출처는 set_change_context(db, user, source)로 세션에 지정
+
+시점 조회는 현재 값에서 기준 시각 이후 변경분(new - old)을 빼서 복원합니다.
+(최근 시점일수록 되돌릴 이력이 적어 빠르며, 같은 사업-월에 행이 여러 개여도 합계 기준으로 맞음)
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import event, insert, select, func, case, literal, union_all, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.history import MonthlyDataHistory
+from app.models.project import MonthlyData
+
+HISTORY_FIELDS = ("plan_amt", "actual_amt", "est_amt")
+
+# IN 절 바인딩 개수 제한(SQLite) 대비
+_CHUNK_SIZE = 500
+
+_hist = MonthlyDataHistory.__table__
+
+
+def set_change_context(db: Session, user: Optional[str] = None, source: Optional[str] = None):
+    """이 세션에서 기록되는 이력의 변경자/출처"""
+    db.info["change_user"] = user
+    db.info["change_source"] = source
+
+
+def _amount(value) -> int:
+    return int(round(float(value or 0)))
+
+
+def record_changes(db: Session, changes: Iterable[Dict]):
+    """
+    {proj_id, yyyymm, field, old_value, new_value} 목록을 한 번에 기록합니다. (값이 같은 항목은 제외)
+    commit은 호출한 쪽에서 (같은 트랜잭션으로 반영)
+    """
+    rows = [
+        {
+            "proj_id": c["proj_id"], "yyyymm": c["yyyymm"], "field": c["field"],
+            "old_value": _amount(c["old_value"]), "new_value": _amount(c["new_value"]),
+            "changed_by": db.info.get("change_user"), "source": db.info.get("change_source"),
+        }
+        for c in changes
+    ]
+    rows = [r for r in rows if r["old_value"] != r["new_value"]]
+    if rows:
+        db.connection().execute(insert(_hist), rows)
+
+
+def _stored_rows(session: Session, data_ids) -> Dict:
+    """data_id → DB에 저장된 (proj_id, yyyymm, 금액 필드) 행"""
+    ids = sorted(data_ids)
+    stored = {}
+    for i in range(0, len(ids), _CHUNK_SIZE):
+        stored.update((row.data_id, row) for row in session.connection().execute(
+            select(MonthlyData.data_id, MonthlyData.proj_id, MonthlyData.yyyymm,
+                   *[getattr(MonthlyData, f) for f in HISTORY_FIELDS])
+            .where(MonthlyData.data_id.in_(ids[i:i + _CHUNK_SIZE]))
+        ))
+    return stored
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _capture_orm_changes(session: Session, flush_context, instances):
+    changes: List[Dict] = []
+    for obj in session.new:
+        if isinstance(obj, MonthlyData):
+            changes.extend(
+                {"proj_id": obj.proj_id, "yyyymm": obj.yyyymm, "field": f, "old_value": 0, "new_value": getattr(obj, f)}
+                for f in HISTORY_FIELDS
+            )
+    unloaded = []  # 이전 값을 로드하지 않고 수정한 항목 (commit 후 만료된 객체, load_only 조회 등)
+    for obj in session.dirty:
+        if isinstance(obj, MonthlyData):
+            attrs = sa_inspect(obj).attrs
+            for f in HISTORY_FIELDS:
+                hist = attrs[f].history
+                if not hist.added:
+                    continue
+                if hist.deleted:
+                    # 조회 후 수정한 경우 이전 값은 deleted에 있음
+                    changes.append({"proj_id": obj.proj_id, "yyyymm": obj.yyyymm, "field": f,
+                                    "old_value": hist.deleted[0], "new_value": hist.added[0]})
+                else:
+                    unloaded.append((sa_inspect(obj).identity[0], f, hist.added[0]))
+    if unloaded:
+        # flush 전이므로 DB에는 아직 이전 값이 있음 (한 번에 조회)
+        stored = _stored_rows(session, {data_id for data_id, _, _ in unloaded})
+        for data_id, f, new_value in unloaded:
+            row = stored.get(data_id)
+            if row is not None:
+                changes.append({"proj_id": row.proj_id, "yyyymm": row.yyyymm, "field": f,
+                                "old_value": getattr(row, f), "new_value": new_value})
+    for obj in session.deleted:
+        if isinstance(obj, MonthlyData):
+            changes.extend(
+                {"proj_id": obj.proj_id, "yyyymm": obj.yyyymm, "field": f, "old_value": getattr(obj, f), "new_value": 0}
+                for f in HISTORY_FIELDS
+            )
+    if changes:
+        record_changes(session, changes)
+
+
+def normalize_as_of(as_of: datetime) -> datetime:
+    """DB 시각(UTC, 시간대 없음)과 비교할 수 있도록 변환 (시간대가 없으면 UTC로 간주)"""
+    if as_of.tzinfo is not None:
+        as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+    return as_of
+
+
+def monthly_as_of(as_of: datetime, year: Optional[str] = None, yyyymm: Optional[str] = None):
+    """
+    as_of 시점의 월별 데이터 (proj_id, yyyymm, plan_amt, actual_amt, est_amt) 서브쿼리.
+    현재 값과 '기준 시각 이후 변경분의 음수'를 이어 붙여 사업-월별로 합산합니다.
+    (그 뒤에 삭제된 행은 이력의 old 값으로 되살아나고, 그 뒤에 생긴 행은 0이 됨)
+    """
+    as_of = normalize_as_of(as_of)
+
+    def month_filter(col):
+        if yyyymm:
+            return col == yyyymm
+        if year:
+            return col.like(f"{year}%")
+        return literal(True)
+
+    def undo(field):
+        return func.sum(case((_hist.c.field == field, _hist.c.old_value - _hist.c.new_value), else_=0))
+
+    current = select(
+        MonthlyData.proj_id.label("proj_id"),
+        MonthlyData.yyyymm.label("yyyymm"),
+        MonthlyData.plan_amt.label("plan_amt"),
+        MonthlyData.actual_amt.label("actual_amt"),
+        MonthlyData.est_amt.label("est_amt"),
+    ).where(month_filter(MonthlyData.yyyymm))
+
+    reverted = select(
+        _hist.c.proj_id,
+        _hist.c.yyyymm,
+        undo("plan_amt"),
+        undo("actual_amt"),
+        undo("est_amt"),
+    ).where(
+        _hist.c.changed_at > as_of,
+        month_filter(_hist.c.yyyymm),
+    ).group_by(_hist.c.proj_id, _hist.c.yyyymm)
+
+    both = union_all(current, reverted).subquery()
+    return select(
+        both.c.proj_id,
+        both.c.yyyymm,
+        func.sum(both.c.plan_amt).label("plan_amt"),
+        func.sum(both.c.actual_amt).label("actual_amt"),
+        func.sum(both.c.est_amt).label("est_amt"),
+    ).group_by(both.c.proj_id, both.c.yyyymm).subquery("monthly_as_of")
+
+
+def changes_stmt(proj_id: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                 yyyymm: Optional[str] = None, limit: int = 500):
+    """변경 이력 기간 조회 (최신순)"""
+    stmt = select(MonthlyDataHistory)
+    if proj_id:
+        stmt = stmt.where(MonthlyDataHistory.proj_id == proj_id)
+    if start:
+        stmt = stmt.where(MonthlyDataHistory.changed_at >= normalize_as_of(start))
+    if end:
+        stmt = stmt.where(MonthlyDataHistory.changed_at <= normalize_as_of(end))
+    if yyyymm:
+        stmt = stmt.where(MonthlyDataHistory.yyyymm == yyyymm)
+    return stmt.order_by(MonthlyDataHistory.changed_at.desc(), MonthlyDataHistory.hist_id.desc()).limit(limit)
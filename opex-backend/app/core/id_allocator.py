@@ -0,0 +1,157 @@
+# app/core/id_allocator.py
+"""
+채번 테이블(tb_id_sequence) 기반 ID 발급기.
+
+- 번호 발급은 UPDATE ... RETURNING 한 문장으로 원자적으로 처리합니다.
+- 요청 트랜잭션과 분리된 짧은 트랜잭션에서 발급하므로 잠금 시간이 최소화됩니다.
+  (대신 요청이 실패하면 해당 번호는 재사용되지 않습니다.)
+- N건이 필요한 일괄 등록은 reserve 한 번으로 연속된 번호 블록을 받습니다.
+- 번호를 직접 지정해 등록한 사업/예산 코드(엑셀 Index 등)는 flush 직전(before_flush)에
+  같은 트랜잭션에서 채번 테이블을 그 번호 이상으로 올려, 이후 발급 번호와 겹치지 않게 합니다.
+"""
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.sequence import IdSequence
+from app.models.project import ProjectMaster
+from app.models.account import BudgetCodeMaster
+
+
+def _insert_ignore(conn: Connection):
+    """시퀀스 최초 생성용 INSERT (동시에 생성되어도 한 건만 들어가도록)"""
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(IdSequence)
+
+
+def reserve_ids(db: Session, seq_key: str, count: int = 1,
+                seed: Optional[Callable[[Connection], int]] = None) -> List[int]:
+    """seq_key의 다음 번호 count개를 한 번에 예약하여 반환합니다."""
+    if count < 1:
+        return []
+
+    bump = update(IdSequence)\
+        .where(IdSequence.seq_key == seq_key)\
+        .values(last_value=IdSequence.last_value + count)\
+        .returning(IdSequence.last_value)
+
+    with db.get_bind().connect() as conn:
+        with conn.begin():
+            row = conn.execute(bump).first()
+            if row is None:
+                # 최초 사용: 기존 데이터의 최대 번호부터 이어서 발급
+                start = seed(conn) if seed else 0
+                conn.execute(
+                    _insert_ignore(conn)
+                    .values(seq_key=seq_key, last_value=start)
+                    .on_conflict_do_nothing(index_elements=["seq_key"])
+                )
+                row = conn.execute(bump).first()
+
+    last_value = row[0]
+    return list(range(last_value - count + 1, last_value + 1))
+
+
+def advance_sequence(db: Session, seq_key: str, value: int,
+                     seed: Optional[Callable[[Connection], int]] = None):
+    """
+    seq_key의 마지막 번호를 최소 value로 올립니다. (호출한 쪽 트랜잭션에서 실행, commit은 호출한 쪽에서)
+    채번 테이블에 아직 없는 키는 seed(기존 데이터의 최대 번호)와 value 중 큰 값으로 만듭니다.
+    """
+    conn = db.connection()
+    raised = conn.execute(
+        update(IdSequence)
+        .where(IdSequence.seq_key == seq_key, IdSequence.last_value < value)
+        .values(last_value=value)
+    )
+    if raised.rowcount:
+        return
+    if conn.execute(select(IdSequence.last_value).where(IdSequence.seq_key == seq_key)).first() is not None:
+        return  # 이미 value 이상
+
+    start = max(value, seed(conn) if seed else 0)
+    stmt = _insert_ignore(conn).values(seq_key=seq_key, last_value=start)
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=["seq_key"],
+        set_={"last_value": stmt.excluded.last_value},
+        where=IdSequence.last_value < stmt.excluded.last_value,
+    ))
+
+
+def _max_suffix(ids, sep: str) -> int:
+    max_num = 0
+    for value in ids:
+        suffix = str(value).rsplit(sep, 1)[-1]
+        if suffix.isdigit():
+            max_num = max(max_num, int(suffix))
+    return max_num
+
+
+# ==========================================
+# 사업 Index (A-001 형식)
+# ==========================================
+def _project_seed(dept_code: str) -> Callable[[Connection], int]:
+    def seed(conn: Connection) -> int:
+        ids = conn.execute(
+            select(ProjectMaster.proj_id).where(ProjectMaster.dept_code == dept_code)
+        ).scalars()
+        return _max_suffix(ids, '-')
+    return seed
+
+
+def reserve_project_ids(db: Session, dept_code: str, count: int = 1) -> List[str]:
+    nums = reserve_ids(db, f"PROJ:{dept_code}", count, _project_seed(dept_code))
+    return [f"{dept_code}-{n:03d}" for n in nums]
+
+
+def next_project_id(db: Session, dept_code: str) -> str:
+    return reserve_project_ids(db, dept_code, 1)[0]
+
+
+# ==========================================
+# 예산 분류 코드 ([TYPE]_001 형식)
+# ==========================================
+def _budget_code_seed(code_type: str) -> Callable[[Connection], int]:
+    def seed(conn: Connection) -> int:
+        ids = conn.execute(
+            select(BudgetCodeMaster.code_id).where(BudgetCodeMaster.code_type == code_type)
+        ).scalars()
+        return _max_suffix(ids, '_')
+    return seed
+
+
+def reserve_budget_code_ids(db: Session, code_type: str, count: int = 1) -> List[str]:
+    prefix = code_type.upper()
+    nums = reserve_ids(db, f"CODE:{prefix}", count, _budget_code_seed(code_type))
+    return [f"{prefix}_{n:03d}" for n in nums]
+
+
+# ==========================================
+# 직접 지정한 번호 반영 (before_flush)
+# ==========================================
+def _inserted_numbers(session: Session) -> Dict[str, tuple]:
+    """이번 flush로 추가되는 사업/예산 코드의 채번 키별 (최대 번호, seed)"""
+    found = {}
+    for obj in session.new:
+        if isinstance(obj, ProjectMaster) and obj.dept_code:
+            key, num, seed = f"PROJ:{obj.dept_code}", _max_suffix([obj.proj_id], '-'), _project_seed(obj.dept_code)
+        elif isinstance(obj, BudgetCodeMaster) and obj.code_type:
+            key, num, seed = f"CODE:{obj.code_type.upper()}", _max_suffix([obj.code_id], '_'), _budget_code_seed(obj.code_type)
+        else:
+            continue
+        if num > found.get(key, (0, None))[0]:
+            found[key] = (num, seed)
+    return found
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _advance_for_explicit_ids(session: Session, flush_context, instances):
+    # 발급받은 번호는 이미 채번 테이블 이하이므로 UPDATE 조건에 걸리지 않음
+    for key, (num, seed) in sorted(_inserted_numbers(session).items()):
+        advance_sequence(session, key, num, seed)
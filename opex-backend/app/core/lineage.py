@@ -0,0 +1,131 @@
+# app/core/lineage.py
+"""
+사업 계보(연도 간 연속 사업) 인덱스.
+
+ProjectMaster.prev_proj_id(전년도 Index)를 따라 올라간 최초 사업의 Index를 lineage_root_id에 저장해 두고,
+계보 전체 조회는 lineage_root_id 인덱스 한 번으로 처리합니다.
+- 사업 등록/수정/일괄 등록 시 refresh_lineage()로 해당 사업과 그 후속 사업들의 root를 다시 계산
+- 서버 시작 시 backfill_lineage_roots()로 root가 비어 있는 사업을 채움
+- 순환 참조(A → B → A)는 MAX_LINEAGE_DEPTH에서 끊습니다.
+"""
+from typing import Iterable, Iterator, List
+
+from sqlalchemy import select, update, func, literal, bindparam
+from sqlalchemy.orm import Session
+
+from app.models.project import ProjectMaster, MonthlyData
+
+MAX_LINEAGE_DEPTH = 30
+# IN 절 바인딩 개수 제한(SQLite) 대비
+_CHUNK_SIZE = 500
+
+_pm = ProjectMaster.__table__
+
+
+def _chunks(ids: List[str]) -> Iterator[List[str]]:
+    for i in range(0, len(ids), _CHUNK_SIZE):
+        yield ids[i:i + _CHUNK_SIZE]
+
+
+def lineage_root_stmt(proj_ids: List[str]):
+    """각 사업에서 prev_proj_id를 따라 올라간 최상위 사업 (start_id, root_id)"""
+    chain = select(
+        _pm.c.proj_id.label("start_id"),
+        _pm.c.proj_id.label("cur_id"),
+        _pm.c.prev_proj_id.label("prev_id"),
+        literal(0).label("depth"),
+    ).where(_pm.c.proj_id.in_(proj_ids)).cte("lineage_up", recursive=True)
+
+    prev = _pm.alias("prev")
+    chain = chain.union_all(
+        select(chain.c.start_id, prev.c.proj_id, prev.c.prev_proj_id, chain.c.depth + 1)
+        .where(
+            prev.c.proj_id == chain.c.prev_id,
+            chain.c.prev_id != chain.c.cur_id,   # 자기 자신을 가리키는 경우
+            chain.c.depth < MAX_LINEAGE_DEPTH,
+        )
+    )
+
+    ranked = select(
+        chain.c.start_id,
+        chain.c.cur_id,
+        func.row_number().over(partition_by=chain.c.start_id, order_by=chain.c.depth.desc()).label("rn"),
+    ).subquery()
+    return select(ranked.c.start_id, ranked.c.cur_id.label("root_id")).where(ranked.c.rn == 1)
+
+
+def _descendants_stmt(proj_ids: List[str]):
+    """주어진 사업과, prev_proj_id로 이어지는 모든 후속 사업"""
+    down = select(
+        _pm.c.proj_id.label("proj_id"),
+        literal(0).label("depth"),
+    ).where(_pm.c.proj_id.in_(proj_ids)).cte("lineage_down", recursive=True)
+
+    nxt = _pm.alias("next")
+    down = down.union_all(
+        select(nxt.c.proj_id, down.c.depth + 1)
+        .where(
+            nxt.c.prev_proj_id == down.c.proj_id,
+            nxt.c.proj_id != nxt.c.prev_proj_id,
+            down.c.depth < MAX_LINEAGE_DEPTH,
+        )
+    )
+    return select(down.c.proj_id).distinct()
+
+
+def refresh_lineage(db: Session, proj_ids: Iterable[str]):
+    """
+    사업(과 후속 사업)의 lineage_root_id를 다시 계산합니다. (commit은 호출한 쪽에서)
+    prev_proj_id가 바뀐 사업을 넘기면 됩니다.
+    """
+    ids = sorted({pid for pid in proj_ids if pid})
+    if not ids:
+        return
+
+    # 세션이 autoflush=False이므로 방금 추가/수정한 사업을 먼저 반영
+    db.flush()
+
+    affected = set()
+    for chunk in _chunks(ids):
+        affected.update(db.execute(_descendants_stmt(chunk)).scalars())
+
+    params = []
+    for chunk in _chunks(sorted(affected)):
+        params.extend({"b_id": start_id, "b_root": root_id} for start_id, root_id in db.execute(lineage_root_stmt(chunk)))
+
+    if params:
+        db.execute(
+            update(_pm).where(_pm.c.proj_id == bindparam("b_id")).values(lineage_root_id=bindparam("b_root")),
+            params,
+        )
+
+
+def backfill_lineage_roots(db: Session):
+    """lineage_root_id가 비어 있는 사업을 채웁니다. (서버 시작 시)"""
+    missing = list(db.execute(select(_pm.c.proj_id).where(_pm.c.lineage_root_id.is_(None))).scalars())
+    if missing:
+        refresh_lineage(db, missing)
+        db.commit()
+
+
+def lineage_history_stmt(root_id: str):
+    """계보에 속한 모든 사업의 월별 계획/실적/추정 (lineage_root_id 인덱스 + 월 데이터 인덱스 조인 한 번)"""
+    return select(
+        ProjectMaster.proj_id,
+        ProjectMaster.fiscal_year,
+        ProjectMaster.proj_name,
+        ProjectMaster.dept_code,
+        ProjectMaster.prev_proj_id,
+        MonthlyData.yyyymm,
+        func.sum(MonthlyData.plan_amt).label("plan_amt"),
+        func.sum(MonthlyData.actual_amt).label("actual_amt"),
+        func.sum(MonthlyData.est_amt).label("est_amt"),
+    ).select_from(ProjectMaster).outerjoin(
+        MonthlyData, MonthlyData.proj_id == ProjectMaster.proj_id
+    ).where(
+        ProjectMaster.lineage_root_id == root_id
+    ).group_by(
+        ProjectMaster.proj_id, MonthlyData.yyyymm
+    ).order_by(
+        ProjectMaster.fiscal_year, ProjectMaster.proj_id, MonthlyData.yyyymm
+    )
@@ -1,32 +1,104 @@
 # app/core/logging_setup.py
+"""
+로깅 설정
+
+- 요청 처리 스레드/이벤트 루프는 QueueHandler로 레코드를 큐에 넣기만 하고,
+  실제 출력(stdout)은 QueueListener 백그라운드 스레드가 담당합니다.
+- 출력 형식은 한 줄 JSON (LOG_FORMAT=text 이면 기존 텍스트 형식)
+- RequestIdMiddleware가 요청마다 request_id를 정하고(X-Request-ID 헤더가 있으면 그대로 사용),
+  해당 요청에서 남긴 모든 로그에 request_id가 붙습니다.
+"""
+import atexit
+import copy
+import logging
 import logging.config
+import queue
 import sys
+import uuid
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+import orjson
+
+from app.core.config import settings
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 넘긴 값이므로 JSON 필드로 출력)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """로그를 남긴 스레드/태스크의 request_id를 레코드에 기록 (큐에 넣기 전에 실행)"""
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class _PreparedQueueHandler(QueueHandler):
+    """
+    다른 스레드에서 포맷되므로 메시지/예외를 큐에 넣기 전에 문자열로 확정합니다.
+    (기본 QueueHandler.prepare는 traceback까지 메시지에 합쳐 버려 JSON 필드로 분리할 수 없음)
+    """
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        record.stack_info = None
+        return record
+
+
+_log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+
+
+def build_queue_handler():
+    handler = _PreparedQueueHandler(_log_queue)
+    handler.addFilter(RequestIdFilter())
+    return handler
+
 
 LOGGING_CONFIG = {
     'version': 1,
     'disable_existing_loggers': False,
-    'formatters': {
-        'default': {
-            # ▼▼▼ [수정됨] 로그 레벨, 시간, 모듈 이름, 메시지 포맷 지정 ▼▼▼
-            'fmt': '[%(levelname)s] %(asctime)s | %(name)s | %(message)s',
-            'datefmt': '%Y-%m-%d %H:%M:%S', # 시간 포맷 지정
-        },
-    },
     'handlers': {
-        'console': {
-            'class': 'logging.StreamHandler',
-            'formatter': 'default',
-            'stream': sys.stdout,
+        # 실제 출력은 setup_logging()에서 시작하는 QueueListener가 처리
+        'queue': {
+            '()': build_queue_handler,
         },
     },
     # ▼▼▼ [수정된 부분] 로거 설정 추가 - Uvicorn 접근 로그를 재정의합니다. ▼▼▼
     'loggers': {
         'root': {
-            'handlers': ['console'],
+            'handlers': ['queue'],
             'level': 'INFO',
         },
         'uvicorn.access': { # Uvicorn의 Access Logger 이름
-            'handlers': ['console'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': False, # 상위 로거(root)로 전파되는 것을 막음
         },
@@ -35,5 +107,84 @@ LOGGING_CONFIG = {
 }
 
 def setup_logging():
-    """로깅 설정을 적용합니다."""
-    logging.config.dictConfig(LOGGING_CONFIG)
\ No newline at end of file
+    """로깅 설정을 적용하고 출력 스레드(QueueListener)를 시작합니다."""
+    global _listener
+    if _listener is not None:
+        return
+
+    console = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "text":
+        # 로그 레벨, 시간, 모듈 이름, 메시지 포맷 지정
+        console.setFormatter(logging.Formatter('[%(levelname)s] %(asctime)s | %(name)s | %(message)s', '%Y-%m-%d %H:%M:%S'))
+    else:
+        console.setFormatter(JsonFormatter())
+
+    logging.config.dictConfig(LOGGING_CONFIG)
+    _listener = QueueListener(_log_queue, console, respect_handler_level=True)
+    _listener.start()
+    # 종료 시 큐에 남은 로그를 모두 출력
+    atexit.register(_listener.stop)
+
+
+# ==========================================
+# 요청 ID 미들웨어
+# ==========================================
+class RequestIdMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-request-id", request_id.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+
+# ==========================================
+# 업로드 스킵 요약
+# ==========================================
+class SkipSummary:
+    """
+    업로드 중 건너뛴 행을 모아 두었다가 사유별 건수와 일부 행 번호를 한 줄로 로그에 남깁니다.
+    (행마다 경고를 남기면 대량 업로드 시 로그가 처리 시간을 잡아먹음)
+    """
+    def __init__(self, logger: logging.Logger, upload: str, sample_size: int = 20):
+        self.logger = logger
+        self.upload = upload
+        self.sample_size = sample_size
+        self.counts: Counter = Counter()
+        self.samples = defaultdict(list)
+
+    def add(self, row_no, reason: str, detail: Optional[str] = None):
+        self.counts[reason] += 1
+        if len(self.samples[reason]) < self.sample_size:
+            self.samples[reason].append(row_no if detail is None else f"{row_no}: {detail}")
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def log(self, level: int = logging.WARNING):
+        if not self.counts:
+            return
+        self.logger.log(
+            level, f"{self.upload}: {self.total} rows skipped",
+            extra={"upload": self.upload, "skipped": dict(self.counts), "sample_rows": dict(self.samples)},
+        )
@@ -0,0 +1,186 @@
+# app/core/metrics.py
+"""
+요청 지표 수집 (Prometheus 텍스트 포맷, GET /metrics)
+
+- opex_http_request_duration_seconds : 라우트/메서드/상태코드별 응답 시간 히스토그램
+- opex_http_request_size_bytes       : 요청 본문 크기 히스토그램
+- opex_http_response_size_bytes      : 응답 본문 크기 히스토그램 (압축 후, 실제 전송 크기)
+- opex_http_requests_in_flight       : 처리 중인 요청 수
+- opex_cache_requests_total          : 조회 캐시 적중/실패 (app/core/cache.py)
+- opex_cache_evictions_total         : 조회 캐시 축출
+
+NOTE: 값은 워커 프로세스 단위로 집계됩니다. (워커가 여러 개면 워커별로 수집)
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+SIZE_BUCKETS = [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: List[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # labels -> [버킷별 카운트..., +Inf 카운트], 합계
+        self._counts: Dict[tuple, List[int]] = {}
+        self._sums: Dict[tuple, float] = {}
+
+    def observe(self, labels: tuple, value: float):
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+                self._sums[labels] = 0.0
+            counts[idx] += 1
+            self._sums[labels] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(counts), self._sums[labels]) for labels, counts in self._counts.items()]
+
+        for labels, counts, total in sorted(snapshot):
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {total}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, int] = {}
+
+    def inc(self, labels: tuple, amount: int = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self) -> Dict[tuple, int]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.snapshot().items()):
+            lines.append(f"{self.name}{{{_format_labels(self.label_names, labels)}}} {value}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        self._value = 0
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: int = 1):
+        with self._lock:
+            self._value -= amount
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {self._value}"]
+
+
+def _format_labels(names: Tuple[str, ...], values: tuple) -> str:
+    def escape(v):
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{n}="{escape(v)}"' for n, v in zip(names, values))
+
+
+REQUEST_LATENCY = Histogram(
+    "opex_http_request_duration_seconds", "HTTP request latency by route",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+REQUEST_SIZE = Histogram(
+    "opex_http_request_size_bytes", "HTTP request body size by route",
+    ("method", "route"), SIZE_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "opex_http_response_size_bytes", "HTTP response body size by route",
+    ("method", "route", "status"), SIZE_BUCKETS,
+)
+IN_FLIGHT = Gauge("opex_http_requests_in_flight", "HTTP requests currently being processed")
+CACHE_REQUESTS = Counter(
+    "opex_cache_requests_total", "Cache lookups by cache name, layer (memory/shared) and result (hit/miss)",
+    ("cache", "layer", "result"),
+)
+CACHE_EVICTIONS = Counter(
+    "opex_cache_evictions_total", "Cache entries evicted by cache name and layer",
+    ("cache", "layer"),
+)
+
+_COLLECTORS = [REQUEST_LATENCY, REQUEST_SIZE, RESPONSE_SIZE, IN_FLIGHT, CACHE_REQUESTS, CACHE_EVICTIONS]
+
+
+def render_metrics() -> str:
+    lines = []
+    for collector in _COLLECTORS:
+        lines.extend(collector.render())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI 미들웨어: 요청 단위로 시간/크기를 재서 히스토그램에 기록합니다.
+    라우트 라벨은 실제 경로가 아니라 라우트 템플릿(/api/v1/execution/{yyyymm})을 사용합니다.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = {"status": 500, "request_bytes": 0, "response_bytes": 0}
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                state["request_bytes"] += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["response_bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+
+            route = scope.get("route")
+            # 매칭되지 않은 경로(404 등)는 하나로 묶어 라벨 수 폭증 방지
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            status = str(state["status"])
+
+            REQUEST_LATENCY.observe((method, route_label, status), elapsed)
+            REQUEST_SIZE.observe((method, route_label), state["request_bytes"])
+            RESPONSE_SIZE.observe((method, route_label, status), state["response_bytes"])
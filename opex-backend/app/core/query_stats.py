@@ -0,0 +1,138 @@
+# app/core/query_stats.py
+"""
+요청 단위 SQL 실행 통계.
+
+- database.py의 엔진 이벤트(before/after_cursor_execute)가 현재 요청의 QueryStats에 기록
+- QueryStatsMiddleware가 요청마다 QueryStats를 만들고, 응답에 Server-Timing 헤더를 붙이며
+  같은 SQL이 반복 실행된 경우(N+1 의심) 경고 로그를 남김
+- assert_query_budget(): 테스트에서 라우트가 허용 쿼리 수를 넘으면 실패시키는 헬퍼
+"""
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.count = 0
+        self.total_time = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int):
+        """threshold회 이상 반복된 SQL 목록 [(sql, 횟수), ...]"""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+    def summary(self) -> str:
+        top = "\n".join(f"  {n}x {sql[:200]}" for sql, n in self.statements.most_common(5))
+        return f"{self.label}: {self.count} queries, {self.total_time * 1000:.1f}ms\n{top}"
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def record_query(statement: str, elapsed: float):
+    """엔진 이벤트에서 호출"""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+# ==========================================
+# 테스트용: 쿼리 예산(budget) 검사
+# ==========================================
+_watchers_lock = threading.Lock()
+_watchers: List[List[QueryStats]] = []
+
+
+def _report_to_watchers(stats: QueryStats):
+    with _watchers_lock:
+        for collected in _watchers:
+            collected.append(stats)
+
+
+@contextmanager
+def assert_query_budget(max_queries: int):
+    """
+    블록 안에서 처리된 요청(또는 직접 호출한 함수) 하나라도 max_queries를 넘는 SQL을
+    실행하면 AssertionError를 발생시킵니다.
+
+        with assert_query_budget(3):
+            client.get("/api/v1/projects/?fiscal_year=2025")
+    """
+    collected: List[QueryStats] = []
+    local_stats = QueryStats("direct call")
+    token = _current_stats.set(local_stats)
+    with _watchers_lock:
+        _watchers.append(collected)
+    try:
+        yield collected
+    finally:
+        _current_stats.reset(token)
+        with _watchers_lock:
+            _watchers.remove(collected)
+
+    if local_stats.count:
+        collected.append(local_stats)
+    over = [s for s in collected if s.count > max_queries]
+    if over:
+        details = "\n".join(s.summary() for s in over)
+        raise AssertionError(f"query budget {max_queries} exceeded:\n{details}")
+
+
+# ==========================================
+# 미들웨어
+# ==========================================
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(f"{scope['method']} {scope['path']}")
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # 응답 헤더 전송 시점까지의 DB 사용량 (스트리밍 응답의 이후 쿼리는 미포함)
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.total_time * 1000:.1f};desc="{stats.count} queries"'.encode(),
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+
+            route = scope.get("route")
+            if route is not None:
+                stats.label = f"{scope['method']} {route.path}"
+
+            for sql, n in stats.repeated(settings.QUERY_REPEAT_WARN_THRESHOLD):
+                logger.warning(f"N+1 suspected on {stats.label}: {n}x {' '.join(sql.split())[:200]}")
+
+            if _watchers:
+                _report_to_watchers(stats)
+
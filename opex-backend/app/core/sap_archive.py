@@ -0,0 +1,192 @@
+# app/core/sap_archive.py
+"""
+마감 완료 연도의 SAP 원장(tb_sap_upload_raw)을 Parquet 파일로 보관하는 모듈.
+
+저장 구조: {SAP_ARCHIVE_DIR}/fiscal_year=2024/yyyymm=202401/part-*.parquet
+(hive 파티셔닝이므로 연도/월 조건 조회 시 해당 폴더만 읽습니다.)
+"""
+import os
+import uuid
+from typing import Iterator, List, Optional
+
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.sap import SapUploadRaw
+from app.models.closing import MonthlyClose
+
+# Parquet 파일에 기록하는 컬럼 (fiscal_year, yyyymm은 폴더명으로 저장됨)
+ARCHIVE_COLUMNS = [
+    "raw_id", "slip_no", "line_item", "gl_account", "gl_desc", "header_text",
+    "amt_val", "currency", "vendor_text", "ref_key", "cost_center",
+    "mapped_proj_id", "mapping_status", "upload_dt",
+]
+PARTITION_COLUMNS = ["fiscal_year", "yyyymm"]
+
+# 한 번에 읽어서 RecordBatch로 만드는 행 수
+ARCHIVE_BATCH_SIZE = 5000
+
+
+def _archive_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ("raw_id", pa.int64()),
+        ("slip_no", pa.string()),
+        ("line_item", pa.int64()),
+        ("gl_account", pa.string()),
+        ("gl_desc", pa.string()),
+        ("header_text", pa.string()),
+        ("amt_val", pa.int64()),
+        ("currency", pa.string()),
+        ("vendor_text", pa.string()),
+        ("ref_key", pa.string()),
+        ("cost_center", pa.string()),
+        ("mapped_proj_id", pa.string()),
+        ("mapping_status", pa.string()),
+        ("upload_dt", pa.timestamp("us")),
+        ("fiscal_year", pa.string()),
+        ("yyyymm", pa.string()),
+    ])
+
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    # 연도/월을 문자열로 고정 (자동 추론 시 정수로 바뀌어 '202401' 비교가 깨짐)
+    return ds.partitioning(
+        pa.schema([("fiscal_year", pa.string()), ("yyyymm", pa.string())]),
+        flavor="hive",
+    )
+
+
+def has_archive() -> bool:
+    """보관된 Parquet 파일이 하나라도 있는지 확인합니다. (없으면 pyarrow를 로드하지 않음)"""
+    return os.path.isdir(settings.SAP_ARCHIVE_DIR) and any(os.scandir(settings.SAP_ARCHIVE_DIR))
+
+
+def archived_years() -> List[str]:
+    """보관 완료된 회계연도 목록"""
+    if not os.path.isdir(settings.SAP_ARCHIVE_DIR):
+        return []
+    return sorted(
+        entry.name.split("=", 1)[1]
+        for entry in os.scandir(settings.SAP_ARCHIVE_DIR)
+        if entry.is_dir() and entry.name.startswith("fiscal_year=")
+    )
+
+
+def is_year_fully_closed(db: Session, fiscal_year: str) -> bool:
+    """해당 연도 1~12월이 모두 CLOSED 상태인지 확인합니다."""
+    months = [f"{fiscal_year}{m:02d}" for m in range(1, 13)]
+    closed_count = db.query(MonthlyClose).filter(
+        MonthlyClose.yyyymm.in_(months),
+        MonthlyClose.close_status == 'CLOSED'
+    ).count()
+    return closed_count == len(months)
+
+
+def _iter_record_batches(db: Session, fiscal_year: str):
+    import pyarrow as pa
+    schema = _archive_schema()
+    cols = [getattr(SapUploadRaw, c) for c in ARCHIVE_COLUMNS + PARTITION_COLUMNS]
+    stmt = select(*cols).where(SapUploadRaw.fiscal_year == fiscal_year)
+    result = db.execute(stmt.execution_options(yield_per=ARCHIVE_BATCH_SIZE))
+    amt_idx = ARCHIVE_COLUMNS.index("amt_val")
+
+    for partition in result.partitions():
+        rows = [list(r) for r in partition]
+        for row in rows:
+            if row[amt_idx] is not None:
+                row[amt_idx] = int(row[amt_idx])
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+            schema=schema,
+        )
+
+
+def archive_fiscal_year(db: Session, fiscal_year: str) -> dict:
+    """
+    마감 완료된 연도의 SAP 원장을 Parquet로 기록한 뒤 원본 테이블에서 삭제합니다.
+    파일 기록 후 삭제/커밋에 실패하면 이번에 기록한 파일을 지워 원상 복구합니다.
+    """
+    import pyarrow.dataset as ds
+
+    if not is_year_fully_closed(db, fiscal_year):
+        raise ValueError(f"{fiscal_year}년은 12개월이 모두 마감되지 않아 보관할 수 없습니다.")
+
+    row_count = db.query(SapUploadRaw).filter(SapUploadRaw.fiscal_year == fiscal_year).count()
+    if row_count == 0:
+        return {"fiscal_year": fiscal_year, "archived_rows": 0, "files": 0}
+
+    os.makedirs(settings.SAP_ARCHIVE_DIR, exist_ok=True)
+    written_files = []
+    # 재실행 시 기존 파일을 덮어쓰지 않도록 실행마다 고유한 파일명 사용
+    run_token = uuid.uuid4().hex[:8]
+
+    ds.write_dataset(
+        _iter_record_batches(db, fiscal_year),
+        base_dir=settings.SAP_ARCHIVE_DIR,
+        schema=_archive_schema(),
+        format="parquet",
+        partitioning=_partitioning(),
+        basename_template=f"part-{run_token}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_visitor=lambda f: written_files.append(f.path),
+    )
+
+    try:
+        archived_rows = ds.dataset(written_files, format="parquet").count_rows()
+        if archived_rows != row_count:
+            raise RuntimeError(f"보관 건수 불일치 (DB {row_count}건, 파일 {archived_rows}건)")
+
+        db.execute(delete(SapUploadRaw).where(SapUploadRaw.fiscal_year == fiscal_year))
+        db.commit()
+    except Exception:
+        db.rollback()
+        for path in written_files:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    return {"fiscal_year": fiscal_year, "archived_rows": archived_rows, "files": len(written_files)}
+
+
+def iter_archived_rows(
+    columns: List[str],
+    fiscal_year: Optional[str] = None,
+    yyyymm: Optional[str] = None,
+    mapping_status: Optional[str] = None,
+    mapped_proj_id: Optional[str] = None,
+) -> Iterator[list]:
+    """
+    보관된 원장을 조건에 맞게 읽어 columns 순서의 리스트로 넘겨줍니다.
+    연도/월 조건은 폴더 단위로, 나머지 조건은 Parquet row group 통계로 걸러집니다.
+    """
+    if not has_archive():
+        return
+
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        settings.SAP_ARCHIVE_DIR, format="parquet", partitioning=_partitioning()
+    )
+
+    conditions = []
+    if fiscal_year:
+        conditions.append(ds.field("fiscal_year") == fiscal_year)
+    if yyyymm:
+        conditions.append(ds.field("yyyymm") == yyyymm)
+    if mapping_status:
+        conditions.append(ds.field("mapping_status") == mapping_status)
+    if mapped_proj_id:
+        conditions.append(ds.field("mapped_proj_id") == mapped_proj_id)
+
+    flt = None
+    for cond in conditions:
+        flt = cond if flt is None else (flt & cond)
+
+    for batch in dataset.to_batches(columns=columns, filter=flt, batch_size=ARCHIVE_BATCH_SIZE):
+        data = batch.to_pydict()
+        yield from (list(r) for r in zip(*(data[c] for c in columns)))
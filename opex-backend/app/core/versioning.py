@@ -0,0 +1,72 @@
+# app/core/versioning.py
+"""
+테이블(및 캐시 태그)별 데이터 버전 카운터와 ETag(조건부 GET) 처리.
+
+버전은 tb_data_version 테이블의 이름별 정수이며, 쓰기 작업이 commit하기 직전에
+같은 트랜잭션 안에서 bump_version(db, ...)으로 올립니다.
+데이터 변경과 버전 증가가 함께 commit/rollback되므로 rollback된 쓰기는 버전을 올리지 않고,
+commit된 변경은 모든 uvicorn 워커에서 바로 새 버전으로 보입니다.
+"""
+from typing import Dict
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import get_read_db
+from app.models.version import DataVersion
+
+
+def _upsert(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(DataVersion)
+
+
+def bump_version(db: Session, *names: str):
+    """쓰기 작업의 db.commit() 직전에 호출하여 해당 테이블의 버전을 올립니다. (commit은 호출한 쪽에서)"""
+    # 이름 순으로 갱신 (동시에 여러 버전을 올리는 트랜잭션끼리 교착 방지)
+    for name in sorted(set(n for n in names if n)):
+        stmt = _upsert(db).values(name=name, version=1)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"version": DataVersion.version + 1, "updated_at": func.now()},
+        ))
+
+
+def get_versions(db: Session, *names: str) -> Dict[str, int]:
+    """이름별 현재 버전 (한 번도 올리지 않은 이름은 0)"""
+    if not names:
+        return {}
+    rows = db.execute(
+        select(DataVersion.name, DataVersion.version).where(DataVersion.name.in_(set(names)))
+    ).all()
+    found = dict(rows)
+    return {name: found.get(name, 0) for name in names}
+
+
+def get_version(db: Session, name: str) -> int:
+    return get_versions(db, name)[name]
+
+
+def etag_guard(*tables: str):
+    """
+    GET 라우터 의존성: 테이블 버전으로 ETag를 만들고,
+    If-None-Match가 일치하면 본문 조회 없이 304를 반환합니다.
+    (라우터와 같은 조회 세션을 사용하므로 버전 → 데이터 순으로 읽음)
+    """
+    def dependency(request: Request, response: Response, db: Session = Depends(get_read_db)):
+        versions = get_versions(db, *tables)
+        etag = '"' + ".".join(f"{t}:{versions[t]}" for t in tables) + '"'
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        # 브라우저가 매번 재검증하도록 (변경이 없으면 304로 본문 없이 응답)
+        response.headers["Cache-Control"] = "no-cache"
+
+    return dependency
@@ -0,0 +1,66 @@
+# app/core/writes.py
+"""
+월 데이터를 바꾸는 쓰기 API의 공통 마무리 (commit 포함).
+
+각 라우터는 데이터 변경까지만 하고 아래 중 하나로 끝냅니다. 순서는 항상 같습니다.
+  commit 전 (같은 트랜잭션): 예실 경보 재평가 → 큐브 재집계 대상 월 표시 → 테이블 버전/캐시 태그 증가
+  commit 후: 큐브 백그라운드 재집계 요청 → 변경 알림(SSE) 발행
+
+- after_monthly_write : (사업, 월) 칸 단위 변경 (추정 수정, SAP 실적 반영, 예산 전용)
+- after_project_write : 사업 등록/수정/삭제/일괄 등록 (사업의 모든 월 대상)
+- after_closing_write : 마감/마감 해제 (스냅샷 변경)
+"""
+from typing import Callable, Iterable, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.alerts import evaluate_alerts
+from app.core.cache import invalidate, monthly_tags
+from app.core.cube import mark_dirty, mark_projects_dirty, request_cube_refresh
+from app.core.events import publish, publish_cells
+from app.core.versioning import bump_version
+from app.models.closing import MonthlyClose
+from app.models.project import ProjectMaster, MonthlyData
+
+
+def _commit_and_notify(db: Session, tables: Iterable[str], tags: Iterable[str], notify: Callable[[], None]):
+    bump_version(db, *tables)
+    invalidate(db, *tags)
+    db.commit()
+    request_cube_refresh()
+    notify()
+
+
+def after_monthly_write(db: Session, source: str, cells: Iterable[Tuple[str, str]]):
+    """변경된 (proj_id, yyyymm) 칸 기준으로 경보/큐브/캐시를 갱신하고 commit"""
+    cells: List[Tuple[str, str]] = list(dict.fromkeys(cells))
+    months = {m for _, m in cells}
+    evaluate_alerts(db, cells)
+    mark_dirty(db, months)
+    _commit_and_notify(
+        db, [MonthlyData.__tablename__], monthly_tags(months),
+        lambda: publish_cells(MonthlyData.__tablename__, source, cells),
+    )
+
+
+def after_project_write(db: Session, source: str, fiscal_year: str, proj_ids: Iterable[str], mark: bool = True):
+    """
+    사업 단위 변경 후 commit. 사업 목록/해당 연도 월 데이터 캐시를 무효화합니다.
+    삭제는 월 데이터를 지우기 전에 mark_projects_dirty()를 직접 호출하고 mark=False로 넘깁니다.
+    """
+    proj_ids = sorted(set(proj_ids))
+    if mark:
+        mark_projects_dirty(db, proj_ids)
+    _commit_and_notify(
+        db, [ProjectMaster.__tablename__, MonthlyData.__tablename__], ["projects", f"monthly:{fiscal_year}"],
+        lambda: publish(ProjectMaster.__tablename__, source, fiscal_year=fiscal_year, proj_ids=proj_ids),
+    )
+
+
+def after_closing_write(db: Session, yyyymm: str):
+    """마감 스냅샷이 바뀐 월 기준으로 큐브/예실 대비 캐시를 갱신하고 commit (월 데이터 자체는 그대로)"""
+    mark_dirty(db, [yyyymm])
+    _commit_and_notify(
+        db, [], [f"monthly:{yyyymm[:4]}"],
+        lambda: publish(MonthlyClose.__tablename__, "closing", fiscal_year=yyyymm[:4], yyyymm=[yyyymm]),
+    )
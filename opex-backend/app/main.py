@@ -1,18 +1,27 @@
 # app/main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.api.v1 import vendors, services, projects, execution, sap, report, utils, accounts
+from app.core.database import init_db, SessionLocal
+from app.core.lineage import backfill_lineage_roots
+from app.core.cube import ensure_cube, refresh_cube, cube_refresher
+from app.api.v1 import vendors, services, projects, execution, sap, report, utils, accounts, export, events
 from app.api.v1 import sap as sap_api
 from app.api.v1 import closing as closing_api # <--- API 라우터를 closing_api로 임포트!
-from app.models import vendor, service, project, sap, transfer, account   # (테이블 생성용)
+from app.models import vendor, service, project, sap, transfer, account, sequence, cube, alert, history, version   # (테이블 생성용)
 from logging.config import dictConfig # logging용
-from app.core.logging_setup import setup_logging # logging용
+from app.core.logging_setup import setup_logging, RequestIdMiddleware # logging용
 from fastapi.exceptions import RequestValidationError 
 #from fastapi.exception_handlers import request_validation_error_handler
 from starlette.requests import Request
 from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from app.core.responses import FastJSONResponse
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.query_stats import QueryStatsMiddleware
+from fastapi.responses import PlainTextResponse
 
 import logging
 
@@ -21,14 +30,33 @@ import logging
 
 setup_logging()
 
-logger = logging.getLogger("uvicorn.error")
-
-
-# DB 테이블 자동 생성
-Base.metadata.create_all(bind=engine)
-
-
-app = FastAPI(title=settings.PROJECT_NAME)
+# uvicorn.error 로거는 uvicorn 자체 핸들러로 바로 출력되므로, 큐 파이프라인을 타는 앱 로거 사용
+logger = logging.getLogger("app")
+
+
+# DB 테이블 자동 생성 (import 시점이 아니라 워커 시작 시 실행)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    # 계보 인덱스가 비어 있는 사업(컬럼 추가 이전 데이터 등) 채우기
+    db = SessionLocal()
+    try:
+        backfill_lineage_roots(db)
+    finally:
+        db.close()
+    # 지출 분석 큐브 변경 추적 트리거 + 큐브에 없는/변경된 월 집계 (이후에는 백그라운드 스레드에서 갱신)
+    ensure_cube()
+    db = SessionLocal()
+    try:
+        refresh_cube(db)
+    finally:
+        db.close()
+    cube_refresher.start()
+    yield
+    cube_refresher.stop()
+
+
+app = FastAPI(title=settings.PROJECT_NAME, default_response_class=FastJSONResponse, lifespan=lifespan)
 
 # ▼▼▼ 2. CORS 미들웨어 설정 추가 (여기부터) ▼▼▼
 origins = [
@@ -45,6 +73,36 @@ app.add_middleware(
 )
 # ▲▲▲ (여기까지) ▲▲▲
 
+# 응답 압축: Accept-Encoding에 따라 br 우선, 미지원 클라이언트는 gzip
+# (brotli-asgi가 없으면 gzip만 사용)
+# SSE 스트림은 압축기가 버퍼링하면 알림이 늦게 도착하므로 압축 제외
+UNCOMPRESSED_PATHS = ("/api/v1/events",)
+
+class StreamAwareGZipMiddleware(GZipMiddleware):
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(UNCOMPRESSED_PATHS):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(
+        BrotliMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE, gzip_fallback=True,
+        excluded_handlers=[f"^{path}" for path in UNCOMPRESSED_PATHS],
+    )
+except ImportError:
+    app.add_middleware(StreamAwareGZipMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# 요청별 SQL 실행 수/시간 (Server-Timing 헤더, N+1 경고 로그)
+app.add_middleware(QueryStatsMiddleware)
+
+# 라우트별 응답 시간/크기 수집 (압축 후 전송 크기까지 측정)
+app.add_middleware(MetricsMiddleware)
+
+# 요청 ID (가장 바깥: 다른 미들웨어가 남기는 로그에도 request_id가 붙도록)
+app.add_middleware(RequestIdMiddleware)
+
 # app/main.py (validation_exception_handler 함수 내부 수정)
 
 @app.exception_handler(RequestValidationError)
@@ -53,18 +111,10 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     # 1. Pydantic 에러 상세 정보 가져오기
     error_details = exc.errors()
 
-    # 2. 로깅 (기존 코드 유지)
-    print("\n=============================================")
-    print("🚨 FATAL VALIDATION ERROR (422) TRACE:")
-    
-    # 3. JSON 직렬화 가능하도록 에러 객체 정리 (핵심 수정)
+    # 2. JSON 직렬화 가능하도록 에러 객체 정리 (핵심 수정)
     # NOTE: Pydantic errors() 리스트를 순회하며 JSON 호환 형태로 만듭니다.
     json_compatible_errors = []
     for error in error_details:
-        print(f"  [FIELD REQUIRED/TYPE ERROR] Path: {' -> '.join(map(str, error['loc']))}")
-        print(f"  Message: {error['msg']}")
-        print(f"  Input received: {error['input']}")
-        
         # JSON 직렬화 가능하도록 정리 (ValueError를 제거)
         json_compatible_errors.append({
             "type": error['type'],
@@ -73,8 +123,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             # 'input' 필드는 복잡하므로 여기서는 제외하거나 문자열로 처리하는 것이 안전함.
             # 하지만, error['input']에는 문제 필드도 들어있으므로, JSON 직렬화가 가능한 부분만 포함시킵니다.
         })
-        
-    print("---------------------------------------------")
+
+    # 3. 로깅 (요청당 한 줄, 출력은 로그 스레드에서 처리)
+    logger.warning(
+        f"Validation error (422) on {request.method} {request.url.path}",
+        extra={"errors": [
+            {"loc": " -> ".join(map(str, e["loc"])), "msg": e["msg"], "input": repr(e.get("input"))[:200]}
+            for e in error_details
+        ]},
+    )
 
     # 4. JSONResponse를 정리된 데이터로 반환
     return JSONResponse(
@@ -89,6 +146,11 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 def health_check():
     return {"status": "ok", "message": "IT Opex Backend (SQLite) is Running!"}
 
+# Prometheus 지표
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # 라우터 등록
 app.include_router(vendors.router, prefix="/api/v1/vendors", tags=["Vendors"])
 app.include_router(services.router, prefix="/api/v1/services", tags=["Services"])
@@ -98,4 +160,6 @@ app.include_router(sap_api.router, prefix="/api/v1/sap", tags=["SAP"])
 app.include_router(report.router, prefix="/api/v1/report", tags=["Report"])
 app.include_router(utils.router, prefix="/api/v1/utils", tags=["Utilities"])
 app.include_router(closing_api.router, prefix="/api/v1/closing", tags=["Closing"]) # <--- closing 라우터 등록 
-app.include_router(accounts.router, prefix="/api/v1/accounts", tags=["Accounts & Codes"])
\ No newline at end of file
+app.include_router(accounts.router, prefix="/api/v1/accounts", tags=["Accounts & Codes"])
+app.include_router(export.router, prefix="/api/v1/export", tags=["Export"])
+app.include_router(events.router, prefix="/api/v1/events", tags=["Events"])
\ No newline at end of file
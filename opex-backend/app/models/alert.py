@@ -0,0 +1,30 @@
+# app/models/alert.py
+from sqlalchemy import Column, String, Integer, Numeric, Float, TIMESTAMP, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+# 예실 차이 경보 (활성 경보만 보관, 조건이 해소되면 삭제 / app/core/alerts.py에서 갱신)
+class VarianceAlert(Base):
+    __tablename__ = "tb_variance_alert"
+    __table_args__ = (
+        # 사업 × 경보 종류 × 대상 기간(월 경보는 YYYYMM, 연간 경보는 YYYY)당 1건
+        UniqueConstraint("proj_id", "alert_type", "period", name="uq_tb_variance_alert_scope"),
+        Index("ix_tb_variance_alert_year_severity", "fiscal_year", "severity"),
+    )
+
+    alert_id = Column(Integer, primary_key=True, autoincrement=True)
+    proj_id = Column(String(20), nullable=False)
+    fiscal_year = Column(String(4), nullable=False)
+    period = Column(String(6), nullable=False)      # 202503 (월 경보) / 2025 (연간 경보)
+    alert_type = Column(String(30), nullable=False) # MONTH_OVER_PLAN, UNPLANNED_SPEND, BURN_RATE, FORECAST_OVER_PLAN
+    severity = Column(String(10), nullable=False)   # WARNING, CRITICAL
+
+    metric_pct = Column(Float, nullable=True)       # 계획 대비 비율(%)
+    threshold_pct = Column(Float, nullable=True)    # 적용된 기준(%)
+    plan_amt = Column(Numeric(15,0), default=0)
+    actual_amt = Column(Numeric(15,0), default=0)
+    forecast_amt = Column(Numeric(15,0), default=0) # 실적 + 잔여 추정 (연간 경보)
+
+    detected_at = Column(TIMESTAMP, server_default=func.now())  # 최초 발생
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
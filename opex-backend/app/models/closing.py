@@ -1,5 +1,5 @@
 # app/models/closing.py
-from sqlalchemy import Column, String, TIMESTAMP
+from sqlalchemy import Column, String, TIMESTAMP, Numeric
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -9,4 +9,24 @@ class MonthlyClose(Base):
     yyyymm = Column(String(6), primary_key=True, index=True) # 202501
     close_status = Column(String(20), default='OPEN')       # OPEN, CLOSED
     closed_by = Column(String(50), nullable=True)           # 마감 처리자
-    closed_at = Column(TIMESTAMP, server_default=func.now())
\ No newline at end of file
+    closed_at = Column(TIMESTAMP, server_default=func.now())
+
+
+# 마감 시점의 사업별 계획/실적/추정 스냅샷 (마감 해제 시 삭제)
+class MonthlyCloseSnapshot(Base):
+    __tablename__ = "tb_monthly_close_snapshot"
+
+    yyyymm = Column(String(6), primary_key=True, index=True) # 마감 월
+    proj_id = Column(String(20), primary_key=True)
+
+    # 당월 금액
+    plan_amt = Column(Numeric(15,0), default=0)
+    actual_amt = Column(Numeric(15,0), default=0)
+    est_amt = Column(Numeric(15,0), default=0)
+
+    # 연초 ~ 당월 누계 (YTD)
+    ytd_plan_amt = Column(Numeric(15,0), default=0)
+    ytd_actual_amt = Column(Numeric(15,0), default=0)
+    ytd_est_amt = Column(Numeric(15,0), default=0)
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
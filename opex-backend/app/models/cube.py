@@ -0,0 +1,36 @@
+# app/models/cube.py
+from sqlalchemy import Column, String, Integer, Numeric, Index
+from app.core.database import Base
+
+
+# 지출 분석 큐브: (월 × 분석 속성 조합)별 계획/실적/추정 합계 (app/core/cube.py에서 갱신)
+class SpendCube(Base):
+    __tablename__ = "tb_spend_cube"
+    __table_args__ = (
+        Index("ix_tb_spend_cube_year_month", "year", "yyyymm"),
+    )
+
+    cube_id = Column(Integer, primary_key=True, autoincrement=True)
+    year = Column(String(4), nullable=False)      # 2025
+    yyyymm = Column(String(6), nullable=False)    # 202501
+
+    # 분석 속성 (사업 마스터 기준)
+    dept_code = Column(String(10), nullable=True)
+    budget_l2 = Column(String(100), nullable=True)
+    budget_nature_type = Column(String(50), nullable=True)
+    report_class_type = Column(String(50), nullable=True)
+    vendor_id = Column(String(20), nullable=True)
+    svc_id = Column(String(50), nullable=True)
+    cost_center_code = Column(String(20), nullable=True)
+
+    plan_amt = Column(Numeric(15,0), default=0)
+    actual_amt = Column(Numeric(15,0), default=0)
+    est_amt = Column(Numeric(15,0), default=0)
+    proj_count = Column(Integer, default=0)       # 해당 칸에 속한 사업 수 (월 단위)
+
+
+# 큐브 재계산이 필요한 월 (월 데이터/마감 스냅샷/사업 속성 변경 시 트리거가 기록)
+class SpendCubeDirty(Base):
+    __tablename__ = "tb_spend_cube_dirty"
+
+    yyyymm = Column(String(6), primary_key=True)
@@ -0,0 +1,25 @@
+# app/models/history.py
+from sqlalchemy import Column, String, Integer, Numeric, TIMESTAMP, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+# 월별 데이터(계획/실적/추정) 변경 이력 (추가만 하고 수정/삭제하지 않음, app/core/history.py에서 기록)
+class MonthlyDataHistory(Base):
+    __tablename__ = "tb_monthly_data_history"
+    __table_args__ = (
+        # 시점 조회(as_of): 기준 시각 이후 변경분
+        Index("ix_tb_monthly_data_history_changed_at", "changed_at"),
+        # 사업별 기간 조회
+        Index("ix_tb_monthly_data_history_proj_changed_at", "proj_id", "changed_at"),
+    )
+
+    hist_id = Column(Integer, primary_key=True, autoincrement=True)
+    proj_id = Column(String(20), nullable=False)
+    yyyymm = Column(String(6), nullable=False)
+    field = Column(String(10), nullable=False)      # plan_amt, actual_amt, est_amt
+    old_value = Column(Numeric(15,0), default=0)
+    new_value = Column(Numeric(15,0), default=0)
+    changed_at = Column(TIMESTAMP, server_default=func.now())  # DB 시각 (SQLite: UTC)
+    changed_by = Column(String(50), nullable=True)
+    source = Column(String(30), nullable=True)      # update_forecast, transfer, sync_monthly_actuals ...
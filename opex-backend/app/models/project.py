@@ -1,5 +1,5 @@
 # app/models/project.py
-from sqlalchemy import Column, String, Date, Text, Numeric, ForeignKey, CHAR, TIMESTAMP, Integer, Float
+from sqlalchemy import Column, String, Date, Text, Numeric, ForeignKey, CHAR, TIMESTAMP, Integer, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -16,7 +16,8 @@ class ProjectMaster(Base):
     dept_code = Column(String(10), nullable=False)
 
     # 2. AUDIT & CONTINUITY
-    prev_proj_id = Column(String(20), nullable=True)          # 전년도 Index
+    prev_proj_id = Column(String(20), nullable=True, index=True)  # 전년도 Index
+    lineage_root_id = Column(String(20), nullable=True, index=True)  # 연속 사업 계보의 최초 사업 Index (app/core/lineage.py에서 갱신)
     continuity_status = Column(String(20), nullable=True)     # 사업 연속성 (계속, 신규)
     status_prev_year = Column(String(50), nullable=True)      # 전년도 사업상태 (비용집행중)
     
@@ -66,6 +67,10 @@ class ProjectMaster(Base):
 # 2. 월별 데이터 테이블 (Detail)
 class MonthlyData(Base):
     __tablename__ = "tb_monthly_data"
+    __table_args__ = (
+        # 사업별 월 데이터 조회/조인용
+        Index("ix_tb_monthly_data_proj_yyyymm", "proj_id", "yyyymm"),
+    )
 
     data_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     proj_id = Column(String(20), ForeignKey("tb_project_master.proj_id"), nullable=False)
@@ -0,0 +1,12 @@
+# app/models/sequence.py
+from sqlalchemy import Column, String, Integer, TIMESTAMP
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# 채번 테이블 (사업 Index, 예산 분류 코드 등 순번 관리)
+class IdSequence(Base):
+    __tablename__ = "tb_id_sequence"
+
+    seq_key = Column(String(50), primary_key=True)   # 예: PROJ:A, CODE:BUDGET_L1
+    last_value = Column(Integer, nullable=False, default=0) # 마지막으로 발급된 번호
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
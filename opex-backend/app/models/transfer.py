@@ -9,12 +9,12 @@ class BudgetTransfer(Base):
     transfer_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     
     # 보내는 사업 (Source)
-    from_proj_id = Column(String(20), ForeignKey("tb_project_master.proj_id"), nullable=False)
+    from_proj_id = Column(String(20), ForeignKey("tb_project_master.proj_id"), nullable=False, index=True)
     # 받는 사업 (Target)
-    to_proj_id = Column(String(20), ForeignKey("tb_project_master.proj_id"), nullable=False)
+    to_proj_id = Column(String(20), ForeignKey("tb_project_master.proj_id"), nullable=False, index=True)
     
     transfer_amount = Column(Numeric(15, 0), nullable=False) # 전용 금액
-    transfer_yyyymm = Column(String(6), nullable=False)      # 전용 발생 월
+    transfer_yyyymm = Column(String(6), nullable=False, index=True) # 전용 발생 월
     
     reason = Column(Text, nullable=True)                     # 전용 사유
     status = Column(String(20), default='APPLIED')           # 상태 (REQUESTED, APPLIED)
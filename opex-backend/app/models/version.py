@@ -0,0 +1,12 @@
+# app/models/version.py
+from sqlalchemy import Column, String, Integer, TIMESTAMP
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# 데이터 버전 카운터 (ETag/캐시 무효화용, 쓰기 작업과 같은 트랜잭션에서 증가)
+class DataVersion(Base):
+    __tablename__ = "tb_data_version"
+
+    name = Column(String(100), primary_key=True)          # 예: tb_monthly_data, tag:monthly:2025
+    version = Column(Integer, nullable=False, default=0)  # 마지막으로 commit된 변경의 번호
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 # --- G/L Account Schemas ---
@@ -65,6 +65,12 @@ class BudgetCode(BudgetCodeBase):
         from_attributes = True        
 
 
+# 트리 조회용 (GET /accounts/budget-code/tree)
+class BudgetCodeNode(BudgetCodeBase):
+    created_at: Optional[datetime] = None
+    children: List["BudgetCodeNode"] = []
+
+
 # --- [신규] Cost Center Schemas ---
 class CostCenterBase(BaseModel):
     cc_code: str = Field(..., description="코스트 센터 코드")
@@ -1,6 +1,6 @@
 # app/schemas/transfer.py
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 class TransferRequest(BaseModel):
@@ -20,4 +20,37 @@ class TransferLog(BaseModel):
     transferred_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# 전용 이력 조회용 (대장/사업별 이력)
+class TransferHistory(TransferLog):
+    reason: Optional[str] = None
+    status: Optional[str] = None
+    transferred_by: Optional[str] = None
+
+# 사업-월별 순전용액 및 누계
+class TransferBalancePoint(BaseModel):
+    proj_id: str
+    yyyymm: str
+    net_amount: int          # 해당 월 순전용액 (받은 금액 - 보낸 금액)
+    running_net_amount: int  # 연초부터의 누계
+
+
+# 다건(배치) 전용: 한 번의 요청으로 여러 건의 전용을 원자적으로 처리
+class TransferLeg(BaseModel):
+    from_proj_id: str
+    to_proj_id: str
+    transfer_amount: int
+    transfer_yyyymm: str
+    reason: Optional[str] = None # 비우면 배치 공통 사유 사용
+
+class TransferBatchRequest(BaseModel):
+    legs: List[TransferLeg]
+    reason: Optional[str] = None
+    transferred_by: Optional[str] = "admin" # 임시 사용자 ID
+
+class TransferBatchResult(BaseModel):
+    leg_count: int
+    total_amount: int
+    transfers: List[TransferLog]
@@ -0,0 +1,81 @@
+# benchmarks/bench_hot_paths.py
+"""
+핫패스 마이크로 벤치마크 (pytest-benchmark)
+
+API 핸들러 함수를 HTTP 계층 없이 직접 호출해 DB 처리 시간만 측정합니다.
+규모별(small/medium/large) 결과를 비교하면 건수 증가에 따른 증가율(N+1 여부)이 드러납니다.
+실행 방법은 benchmarks/conftest.py 참고.
+"""
+import io
+
+from sqlalchemy import delete
+from starlette.datastructures import UploadFile
+
+from app.api.v1.sap import upload_sap_excel, run_auto_mapping, sync_monthly_actuals
+from app.api.v1.projects import read_projects, upload_bulk_project_master
+from app.api.v1.report import get_budget_vs_actual
+from app.models.sap import SapUploadRaw
+
+
+def _upload(filename: str, content: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+def _clear_sap_lines(db):
+    db.execute(delete(SapUploadRaw))
+
+
+def _map_sap_lines(db):
+    run_auto_mapping(db)
+
+
+# ==========================================
+# SAP 전표
+# ==========================================
+def test_upload_sap_excel(run_bench, bench_db):
+    content = bench_db.excel("sap")
+    result = run_bench(
+        lambda db: upload_sap_excel(_upload("sap.xlsx", content), db),
+        prepare=_clear_sap_lines,
+    )
+    assert result["status"] == "success"
+
+
+def test_upload_sap_excel_duplicates(run_bench, bench_db):
+    """이미 적재된 전표를 다시 올리는 경우 (전건 중복 체크)"""
+    content = bench_db.excel("sap")
+    result = run_bench(lambda db: upload_sap_excel(_upload("sap.xlsx", content), db))
+    assert result["status"] == "success"
+
+
+def test_run_auto_mapping(run_bench):
+    result = run_bench(run_auto_mapping)
+    assert result["status"] == "success"
+
+
+def test_sync_monthly_actuals(run_bench):
+    run_bench(sync_monthly_actuals, prepare=_map_sap_lines)
+
+
+# ==========================================
+# 사업 / 리포트 조회
+# ==========================================
+def test_read_projects(run_bench, bench_db):
+    n_projects = len(bench_db.dataset["projects"])
+    result = run_bench(lambda db: read_projects(fiscal_year=bench_db.dataset["fiscal_year"], limit=n_projects, db=db))
+    assert len(result) == n_projects
+
+
+def test_get_budget_vs_actual(run_bench, bench_db):
+    result = run_bench(lambda db: get_budget_vs_actual(year=bench_db.dataset["fiscal_year"], db=db))
+    assert len(result) == len(bench_db.dataset["projects"])
+
+
+# ==========================================
+# 사업 계획 일괄 등록
+# ==========================================
+def test_upload_bulk_project_master(run_bench, bench_db):
+    content = bench_db.excel("plan")
+    year = bench_db.dataset["fiscal_year"]
+    result = run_bench(lambda db: upload_bulk_project_master(_upload("plan.xlsx", content), year, db))
+    assert result["status"] == "success"
@@ -0,0 +1,144 @@
+# benchmarks/bench_json_compression.py
+"""
+JSON 직렬화 / 응답 압축 벤치마크
+
+응답 크기가 큰 5개 API의 응답 형태를 실제 규모로 만들어,
+- 직렬화 시간: 기존 JSONResponse(json) vs FastJSONResponse(orjson)
+- 전송 크기: 무압축 vs gzip vs br
+을 비교합니다.
+
+실행: (opex-backend 폴더에서) python -m benchmarks.bench_json_compression
+"""
+import gzip
+import random
+import statistics
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 br 컬럼 생략
+    brotli = None
+
+N_PROJECTS = 2000
+N_SAP_LINES = 20000
+N_TRANSFERS = 5000
+REPEAT = 7
+
+rng = random.Random(42)
+DEPTS = ["A", "B", "C"]
+NOW = datetime(2025, 6, 30, 12, 0, 0)
+
+
+def _amt(max_value=50_000_000):
+    return Decimal(rng.randrange(0, max_value, 1000))
+
+
+def project_list():
+    """GET /projects/ (월별 계획 포함)"""
+    rows = []
+    for i in range(N_PROJECTS):
+        dept = DEPTS[i % 3]
+        rows.append({
+            "proj_id": f"{dept}-{i:03d}", "proj_name": f"IT 운영 사업 {i}", "fiscal_year": "2025",
+            "dept_code": dept, "prev_proj_id": f"{dept}-{i:03d}", "continuity_status": "계속",
+            "gl_account": "6663600", "gl_account_name": "관리비-지급수수료",
+            "cost_center_code": "11001121", "cost_center_name": "DX개발운영팀",
+            "vendor_id": f"V{i % 200:04d}", "vendor_name_text": f"협력업체 {i % 200}",
+            "contract_period": "2025.01~2025.12", "responsible_user": "홍길동",
+            "budget_l2": "IT서비스 운영", "budget_nature_type": "IT_TYPE_001",
+            "report_class_type": "운영", "proj_status": "PENDING", "is_prepay": "N",
+            "shared_ratio": 0.0, "memo": None, "created_at": NOW, "updated_at": NOW,
+            "monthly_plans": {f"2025{m:02d}": float(_amt()) for m in range(1, 13)},
+        })
+    return rows
+
+
+def unmapped_sap_lines():
+    """GET /sap/unmapped"""
+    return [{
+        "raw_id": i, "yyyymm": f"2025{rng.randint(1, 12):02d}", "fiscal_year": "2025",
+        "slip_no": f"51{i:08d}", "line_item": i % 5, "gl_account": "6663600",
+        "gl_desc": "관리비-지급수수료", "header_text": f"유지보수 {i} 월정액",
+        "amt_val": _amt(), "currency": "KRW", "vendor_text": f"협력업체 {i % 200}",
+        "ref_key": "담당자", "cost_center": "11001121", "mapped_proj_id": None,
+        "mapping_status": "UNMAPPED", "upload_dt": NOW,
+    } for i in range(N_SAP_LINES)]
+
+
+def execution_grid():
+    """GET /execution/{yyyymm}"""
+    return [{
+        "proj_id": f"{DEPTS[i % 3]}-{i:03d}", "proj_name": f"IT 운영 사업 {i}", "dept_code": DEPTS[i % 3],
+        "vendor_name": f"V{i % 200:04d}", "plan_amt": int(_amt()), "actual_amt": int(_amt()), "est_amt": int(_amt()),
+    } for i in range(N_PROJECTS)]
+
+
+def budget_vs_actual():
+    """GET /report/budget-vs-actual"""
+    return [{
+        "dept_code": DEPTS[i % 3], "proj_id": f"{DEPTS[i % 3]}-{i:03d}", "proj_name": f"IT 운영 사업 {i}",
+        "plan_amt": int(_amt(600_000_000)), "actual_amt": int(_amt(600_000_000)),
+        "diff_amt": int(_amt()), "burn_rate": round(rng.random() * 120, 1),
+    } for i in range(N_PROJECTS)]
+
+
+def transfer_register():
+    """GET /projects/transfers"""
+    return [{
+        "transfer_id": i, "from_proj_id": f"A-{i % 500:03d}", "to_proj_id": f"B-{(i * 7) % 500:03d}",
+        "transfer_amount": int(_amt(5_000_000)), "transfer_yyyymm": f"2025{rng.randint(1, 12):02d}",
+        "transferred_at": NOW, "reason": "분기 재배분", "status": "APPLIED", "transferred_by": "admin",
+    } for i in range(N_TRANSFERS)]
+
+
+PAYLOADS = [
+    ("GET /projects/", project_list),
+    ("GET /sap/unmapped", unmapped_sap_lines),
+    ("GET /execution/{yyyymm}", execution_grid),
+    ("GET /report/budget-vs-actual", budget_vs_actual),
+    ("GET /projects/transfers", transfer_register),
+]
+
+
+def _median_ms(fn):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    header = f"{'endpoint':<30}{'json ms':>10}{'orjson ms':>11}{'raw KB':>10}{'gzip KB':>10}"
+    if brotli:
+        header += f"{'br KB':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for name, build in PAYLOADS:
+        # FastAPI가 응답 직전에 수행하는 변환과 동일하게 맞춤
+        content = jsonable_encoder(build())
+
+        json_ms = _median_ms(lambda: JSONResponse(content))
+        orjson_ms = _median_ms(lambda: FastJSONResponse(content))
+
+        body = FastJSONResponse(content).body
+        line = (
+            f"{name:<30}{json_ms:>10.1f}{orjson_ms:>11.1f}"
+            f"{len(body) / 1024:>10.0f}{len(gzip.compress(body, compresslevel=9)) / 1024:>10.0f}"
+        )
+        if brotli:
+            line += f"{len(brotli.compress(body, quality=4)) / 1024:>10.0f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/conftest.py
+"""
+핫패스 벤치마크 공용 fixture
+
+- 규모(scale)별로 합성 데이터를 한 번 적재한 템플릿 DB를 만들어 두고,
+  각 측정 라운드 전에 템플릿을 복사해 같은 상태에서 시작합니다. (복사 시간은 측정에서 제외)
+- 측정 규모는 OPEX_BENCH_SCALES 환경변수로 선택 (기본: small,medium / 전체: small,medium,large)
+
+실행: (opex-backend 폴더에서, pip install -r requirements-dev.txt 후)
+    python -m pytest benchmarks/bench_hot_paths.py
+    python -m pytest benchmarks/bench_hot_paths.py --benchmark-autosave      # 결과 저장
+    python -m pytest benchmarks/bench_hot_paths.py --benchmark-compare       # 직전 저장 결과와 비교
+"""
+import os
+import shutil
+import tempfile
+
+# app 설정은 import 시점에 DATABASE_URL을 요구하므로 먼저 지정 (벤치마크는 자체 엔진 사용)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'opex_bench_unused.db')}")
+# 조회 캐시는 끄고(라운드마다 실제 조회를 측정), 공유 캐시 파일도 작업 폴더 밖 임시 폴더로
+os.environ["CACHE_ENABLED"] = "false"
+os.environ["CACHE_SHARED_PATH"] = os.path.join(tempfile.mkdtemp(prefix="opex_bench_cache_"), "opex_cache.db")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import memory_cache, shared_cache
+from benchmarks.datagen import SCALES, build_scale, load_dataset, sap_excel_bytes, plan_excel_bytes
+
+BENCH_SCALES = [s.strip() for s in os.environ.get("OPEX_BENCH_SCALES", "small,medium").split(",") if s.strip()]
+BENCH_ROUNDS = int(os.environ.get("OPEX_BENCH_ROUNDS", "3"))
+
+
+class BenchDB:
+    """템플릿 DB + 라운드마다 초기화되는 작업 DB"""
+    def __init__(self, workdir: str, scale: str):
+        self.scale = scale
+        self.dataset = build_scale(scale)
+        self.template_path = os.path.join(workdir, f"{scale}-template.db")
+        self.work_path = os.path.join(workdir, f"{scale}-work.db")
+        load_dataset(create_engine(f"sqlite:///{self.template_path}"), self.dataset)
+
+        self.engine = create_engine(f"sqlite:///{self.work_path}", connect_args={"check_same_thread": False})
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self._excel = {}
+
+    def reset(self, prepare=None):
+        """작업 DB를 템플릿 상태로 되돌리고, 필요하면 prepare(session)로 사전 상태를 만듭니다."""
+        self.engine.dispose()
+        shutil.copyfile(self.template_path, self.work_path)
+        memory_cache.clear()
+        if shared_cache is not None:
+            shared_cache.clear()
+        if prepare:
+            db = self.Session()
+            try:
+                prepare(db)
+                db.commit()
+            finally:
+                db.close()
+
+    def excel(self, kind: str) -> bytes:
+        if kind not in self._excel:
+            build = {"sap": sap_excel_bytes, "plan": plan_excel_bytes}[kind]
+            self._excel[kind] = build(self.dataset)
+        return self._excel[kind]
+
+
+@pytest.fixture(scope="session")
+def bench_workdir():
+    path = tempfile.mkdtemp(prefix="opex_bench_")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+_bench_dbs = {}
+
+
+@pytest.fixture(params=[s for s in BENCH_SCALES if s in SCALES])
+def bench_db(request, bench_workdir) -> BenchDB:
+    scale = request.param
+    if scale not in _bench_dbs:
+        _bench_dbs[scale] = BenchDB(bench_workdir, scale)
+    return _bench_dbs[scale]
+
+
+@pytest.fixture
+def run_bench(benchmark, bench_db):
+    """
+    run_bench(fn, prepare=None): 라운드마다 DB를 초기화한 뒤 fn(session)을 측정합니다.
+    """
+    def runner(fn, prepare=None):
+        state = {}
+
+        def setup():
+            if "db" in state:
+                state["db"].close()
+            bench_db.reset(prepare)
+            state["db"] = bench_db.Session()
+            return (state["db"],), {}
+
+        try:
+            benchmark.extra_info["scale"] = bench_db.scale
+            return benchmark.pedantic(fn, setup=setup, rounds=BENCH_ROUNDS, iterations=1)
+        finally:
+            if "db" in state:
+                state["db"].close()
+
+    return runner
@@ -0,0 +1,253 @@
+# benchmarks/datagen.py
+"""
+벤치마크/부하 테스트용 합성 데이터 생성기
+
+같은 seed면 항상 같은 데이터가 만들어집니다.
+- 사업 마스터: 부서(A/B/C)별로 나눠 생성 (Index는 A-001 형식이므로 부서당 최대 999건)
+- 월별 데이터: 사업당 12개월 (계획 전체, 실적은 ACTUAL_MONTHS개월까지)
+- SAP 전표: 대부분 텍스트에 사업 Index 포함([A-001] / A-001), 일부는 매핑 불가 텍스트
+- 협력업체, 예산 분류 코드(BUDGET_L1 / BUDGET_L2 / IT_TYPE)
+- 업로드 API에 그대로 넣을 수 있는 SAP 전표 / 사업 계획 엑셀 파일
+
+실행: (opex-backend 폴더에서)
+    python -m benchmarks.datagen --scale medium --db ./bench.db --out ./bench_data
+"""
+import argparse
+import io
+import os
+import random
+from datetime import datetime
+from typing import Dict, List
+
+import pandas as pd
+from sqlalchemy import create_engine, insert
+
+from app.core.database import Base
+from app.models.project import ProjectMaster, MonthlyData
+from app.models.sap import SapUploadRaw
+from app.models.vendor import VendorMaster
+from app.models.account import BudgetCodeMaster
+from app.models import service, transfer, closing, sequence, cube, alert, history, version  # noqa: F401  (테이블 생성용)
+
+# 규모별 (사업 수, SAP 전표 수)
+SCALES = {
+    "small": (150, 3_000),
+    "medium": (600, 15_000),
+    "large": (2_400, 60_000),
+}
+
+DEPTS = ["A", "B", "C"]
+# derive_dept_code()가 부서코드로 역산할 수 있는 CC명칭
+CC_BY_DEPT = {
+    "A": ("11001121", "DX개발운영팀"),
+    "B": ("11001122", "DX기획팀"),
+    "C": ("11001123", "정보보안팀"),
+}
+GL_ACCOUNTS = [("6663600", "관리비-지급수수료"), ("6663700", "관리비-전산유지보수"), ("6663800", "관리비-통신비")]
+ACTUAL_MONTHS = 6
+UNMAPPABLE_RATIO = 0.1
+
+
+def build_dataset(n_projects: int, n_sap_lines: int, fiscal_year: str = "2025", seed: int = 42) -> Dict[str, List[dict]]:
+    """테이블별 행(dict) 목록을 반환합니다."""
+    if n_projects > 999 * len(DEPTS):
+        raise ValueError(f"사업 수는 최대 {999 * len(DEPTS)}건까지 생성할 수 있습니다.")
+
+    rng = random.Random(seed)
+    now = datetime(int(fiscal_year), 1, 2, 9, 0, 0)
+
+    budget_codes = []
+    for i in range(1, 6):
+        budget_codes.append({"code_id": f"BUDGET_L1_{i:03d}", "code_name": f"예산 대분류 {i}",
+                             "parent_code_id": None, "code_type": "BUDGET_L1", "sort_order": i})
+    for i in range(1, 21):
+        budget_codes.append({"code_id": f"BUDGET_L2_{i:03d}", "code_name": f"예산 소분류 {i}",
+                             "parent_code_id": f"BUDGET_L1_{(i - 1) % 5 + 1:03d}", "code_type": "BUDGET_L2", "sort_order": i})
+    for i in range(1, 6):
+        budget_codes.append({"code_id": f"IT_TYPE_{i:03d}", "code_name": f"IT 분류 {i}",
+                             "parent_code_id": None, "code_type": "IT_TYPE", "sort_order": i})
+
+    n_vendors = max(n_projects // 10, 5)
+    vendors = [{
+        "vendor_id": f"V{i:04d}", "biz_reg_no": f"{100 + i:03d}-{i % 90 + 10:02d}-{i:05d}",
+        "vendor_name": f"협력업체 {i}", "sap_vendor_cd": f"S{i:06d}",
+    } for i in range(1, n_vendors + 1)]
+
+    projects, monthly = [], []
+    for i in range(n_projects):
+        dept = DEPTS[i % len(DEPTS)]
+        proj_id = f"{dept}-{i // len(DEPTS) + 1:03d}"
+        cc_code, cc_name = CC_BY_DEPT[dept]
+        gl_code, gl_name = rng.choice(GL_ACCOUNTS)
+        vendor = rng.choice(vendors)
+        continuing = rng.random() < 0.7
+        projects.append({
+            "proj_id": proj_id, "proj_name": f"IT 운영 사업 {proj_id}", "fiscal_year": fiscal_year,
+            "dept_code": dept,
+            "prev_proj_id": proj_id if continuing else None,
+            "continuity_status": "계속" if continuing else "신규",
+            "gl_account": gl_code, "gl_account_name": gl_name,
+            "cost_center_code": cc_code, "cost_center_name": cc_name,
+            "vendor_id": vendor["vendor_id"], "vendor_name_text": vendor["vendor_name"],
+            "contract_period": f"{fiscal_year}.01~{fiscal_year}.12",
+            "responsible_user": f"담당자{i % 40}",
+            "business_allocation": rng.choice(["본사", "안동", "공통"]),
+            "budget_l2": f"BUDGET_L2_{rng.randint(1, 20):03d}",
+            "budget_nature_type": f"IT_TYPE_{rng.randint(1, 5):03d}",
+            "report_class_type": rng.choice(["운영", "투자", "신규"]),
+            "shared_ratio": rng.choice([0.0, 0.0, 0.3, 0.5]),
+            "created_at": now, "updated_at": now,
+        })
+
+        base = rng.randrange(1_000_000, 50_000_000, 10_000)
+        for m in range(1, 13):
+            plan = base + rng.randrange(-base // 5, base // 5 + 1, 10_000)
+            actual = plan + rng.randrange(-base // 10, base // 10 + 1, 1_000) if m <= ACTUAL_MONTHS else 0
+            monthly.append({
+                "proj_id": proj_id, "yyyymm": f"{fiscal_year}{m:02d}",
+                "plan_amt": plan, "actual_amt": actual, "est_amt": 0 if m <= ACTUAL_MONTHS else plan,
+            })
+
+    sap_lines = []
+    for i in range(n_sap_lines):
+        proj = projects[rng.randrange(n_projects)]
+        month = rng.randint(1, ACTUAL_MONTHS)
+        roll = rng.random()
+        if roll < UNMAPPABLE_RATIO:
+            text = f"기타 경비 정산 {i}"
+        elif roll < 0.6:
+            text = f"[{proj['proj_id']}] {month}월 유지보수료"
+        else:
+            text = f"{proj['proj_id']} {month}월 용역 대금"
+        sap_lines.append({
+            "yyyymm": f"{fiscal_year}{month:02d}", "fiscal_year": fiscal_year,
+            "slip_no": f"51{i // 3:08d}", "line_item": i % 3 + 1,
+            "gl_account": proj["gl_account"], "gl_desc": proj["gl_account_name"],
+            "header_text": text, "amt_val": rng.randrange(100_000, 20_000_000, 1_000), "currency": "KRW",
+            "vendor_text": proj["vendor_name_text"], "ref_key": proj["responsible_user"],
+            "cost_center": proj["cost_center_code"], "mapping_status": "UNMAPPED",
+        })
+
+    return {
+        "fiscal_year": fiscal_year,
+        "budget_codes": budget_codes, "vendors": vendors,
+        "projects": projects, "monthly": monthly, "sap_lines": sap_lines,
+    }
+
+
+def build_scale(scale: str, fiscal_year: str = "2025", seed: int = 42) -> Dict[str, List[dict]]:
+    n_projects, n_sap_lines = SCALES[scale]
+    return build_dataset(n_projects, n_sap_lines, fiscal_year, seed)
+
+
+# ==========================================
+# DB 적재
+# ==========================================
+def load_dataset(engine, dataset: Dict[str, List[dict]]):
+    """빈 DB에 테이블을 만들고 데이터셋을 executemany로 적재합니다."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for model, key in [
+            (BudgetCodeMaster, "budget_codes"), (VendorMaster, "vendors"),
+            (ProjectMaster, "projects"), (MonthlyData, "monthly"), (SapUploadRaw, "sap_lines"),
+        ]:
+            if dataset[key]:
+                conn.execute(insert(model), dataset[key])
+
+
+# ==========================================
+# 업로드용 엑셀 파일
+# ==========================================
+def _to_xlsx(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_excel(buf, index=False, engine="openpyxl")
+    return buf.getvalue()
+
+
+def sap_excel_bytes(dataset: Dict[str, List[dict]]) -> bytes:
+    """POST /api/v1/sap/upload 형식의 SAP 전표 엑셀"""
+    rows = [{
+        "회계연도": line["fiscal_year"],
+        "전표 번호": line["slip_no"],
+        "개별 항목": line["line_item"],
+        "전기일": f"{line['yyyymm'][:4]}-{line['yyyymm'][4:]}-25",
+        "G/L 계정": line["gl_account"],
+        "G/L 계정과목명": line["gl_desc"],
+        "텍스트": line["header_text"],
+        "금액(현지 통화)": f"{line['amt_val']:,}",
+        "현지 통화": line["currency"],
+        "상계계정 명칭": line["vendor_text"],
+        "참조 키(헤더) 1": line["ref_key"],
+        "코스트 센터": line["cost_center"],
+    } for line in dataset["sap_lines"]]
+    return _to_xlsx(pd.DataFrame(rows))
+
+
+def plan_excel_bytes(dataset: Dict[str, List[dict]], new_ratio: float = 0.1, seed: int = 7) -> bytes:
+    """
+    POST /api/v1/projects/master/bulk 형식의 사업 계획 엑셀
+    (기존 사업 갱신 행 + Index가 비어 있는 신규 사업 행 new_ratio 비율)
+    """
+    rng = random.Random(seed)
+    year = dataset["fiscal_year"]
+    months = [f"{year}{m:02d}" for m in range(1, 13)]
+
+    plans = {}
+    for md in dataset["monthly"]:
+        plans.setdefault(md["proj_id"], {})[md["yyyymm"]] = md["plan_amt"]
+
+    def row(index, name, dept, prev_id, month_amts):
+        cc_code, cc_name = CC_BY_DEPT[dept]
+        data = {
+            "연도": year, "Index": index, "사업명": name, "전년도 Index": prev_id,
+            "사업 연속성": "계속" if prev_id else "신규", "협력업체명": f"협력업체 {rng.randint(1, 50)}",
+            f"{year}년 계약기간(필수확인)": f"{year}.01~{year}.12", "협력": "본사",
+            "계정": GL_ACCOUNTS[0][0], "계정명칭": GL_ACCOUNTS[0][1],
+            "CC코드": cc_code, "CC명칭": cc_name, "담당부서": cc_name, "담당자": "홍길동",
+            "예산 분류(대2)": "IT서비스 운영", "예산 성격": "경상", "Shared비율": 0.0,
+        }
+        data.update(zip(months, month_amts))
+        return data
+
+    rows = [
+        row(p["proj_id"], p["proj_name"], p["dept_code"], p["prev_proj_id"],
+            [plans[p["proj_id"]].get(m, 0) for m in months])
+        for p in dataset["projects"]
+    ]
+    for i in range(int(len(rows) * new_ratio)):
+        dept = DEPTS[i % len(DEPTS)]
+        rows.append(row(None, f"신규 사업 {i}", dept, None,
+                        [rng.randrange(1_000_000, 30_000_000, 10_000) for _ in months]))
+
+    # 연도/Index가 첫 두 컬럼이어야 함 (업로드 API가 위치로 읽음)
+    return _to_xlsx(pd.DataFrame(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 데이터 생성")
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--year", default="2025")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="적재할 SQLite 파일 경로 (새로 생성)")
+    parser.add_argument("--out", help="업로드용 엑셀 파일을 저장할 폴더")
+    args = parser.parse_args()
+
+    dataset = build_scale(args.scale, args.year, args.seed)
+    print(f"projects={len(dataset['projects'])} monthly={len(dataset['monthly'])} sap_lines={len(dataset['sap_lines'])}")
+
+    if args.db:
+        if os.path.exists(args.db):
+            raise SystemExit(f"{args.db} 파일이 이미 있습니다.")
+        load_dataset(create_engine(f"sqlite:///{args.db}"), dataset)
+        print(f"DB 적재 완료: {args.db}")
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        for name, content in [("sap_upload.xlsx", sap_excel_bytes(dataset)), ("plan_upload.xlsx", plan_excel_bytes(dataset))]:
+            with open(os.path.join(args.out, name), "wb") as f:
+                f.write(content)
+        print(f"엑셀 파일 저장 완료: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
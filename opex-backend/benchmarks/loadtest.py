@@ -0,0 +1,253 @@
+# benchmarks/loadtest.py
+"""
+API 동시 부하 테스트 (마감 주간 시나리오)
+
+합성 데이터 DB로 uvicorn을 띄운 뒤, 비동기 HTTP 클라이언트(httpx)로 가상 사용자 N명이
+조회/추정 입력을 섞어 호출하고, 동시에 SAP 전표 업로드와 자동 매핑을 주기적으로 실행합니다.
+종료 후 라우트별 처리량과 p50/p95/p99 응답 시간을 출력합니다. (외부 서비스 불필요)
+
+실행: (opex-backend 폴더에서, httpx 필요: pip install -r requirements-dev.txt)
+    python -m benchmarks.loadtest --scale medium --users 50 --duration 60
+    python -m benchmarks.loadtest --url http://localhost:8000 --users 20   # 이미 떠 있는 서버 대상
+    python -m benchmarks.loadtest --scale large --bulk-interval 5           # 사업 계획 일괄 업로드 동시 실행
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import create_engine
+
+from benchmarks.datagen import SCALES, ACTUAL_MONTHS, build_scale, load_dataset, sap_excel_bytes, plan_excel_bytes
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 일반 사용자 시나리오 가중치 (라벨, 가중치)
+USER_MIX = [
+    ("GET /report/budget-vs-actual", 20),
+    ("GET /execution/{yyyymm}", 25),
+    ("GET /projects/", 15),
+    ("GET /vendors/", 5),
+    ("GET /closing/status/{yyyymm}", 5),
+    ("GET /sap/unmapped", 5),
+    ("POST /execution/update-forecast", 25),
+]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def add(self, label: str, elapsed: float, ok: bool):
+        self.samples[label].append(elapsed)
+        if not ok:
+            self.errors[label] += 1
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def print_report(recorder: Recorder, elapsed: float):
+    header = f"{'route':<36}{'count':>8}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+    total = 0
+    for label in sorted(recorder.samples):
+        values = sorted(recorder.samples[label])
+        total += len(values)
+        print(
+            f"{label:<36}{len(values):>8}{recorder.errors[label]:>8}{len(values) / elapsed:>9.1f}"
+            f"{_percentile(values, 50) * 1000:>10.1f}{_percentile(values, 95) * 1000:>10.1f}"
+            f"{_percentile(values, 99) * 1000:>10.1f}{values[-1] * 1000:>10.1f}"
+        )
+    print("-" * len(header))
+    print(f"{'total':<36}{total:>8}{sum(recorder.errors.values()):>8}{total / elapsed:>9.1f}")
+
+
+# ==========================================
+# 시나리오
+# ==========================================
+async def _call(client: httpx.AsyncClient, recorder: Recorder, label: str, method: str, url: str, **kwargs):
+    start = time.perf_counter()
+    try:
+        resp = await client.request(method, url, **kwargs)
+        ok = resp.status_code < 400
+    except httpx.HTTPError:
+        ok = False
+    recorder.add(label, time.perf_counter() - start, ok)
+
+
+async def user_session(client, recorder, rng: random.Random, ctx: dict, deadline: float, think: float):
+    labels = [label for label, _ in USER_MIX]
+    weights = [weight for _, weight in USER_MIX]
+    year = ctx["year"]
+
+    while time.perf_counter() < deadline:
+        label = rng.choices(labels, weights)[0]
+        yyyymm = f"{year}{rng.randint(1, 12):02d}"
+
+        if label == "GET /report/budget-vs-actual":
+            await _call(client, recorder, label, "GET", "/api/v1/report/budget-vs-actual", params={"year": year})
+        elif label == "GET /execution/{yyyymm}":
+            await _call(client, recorder, label, "GET", f"/api/v1/execution/{yyyymm}")
+        elif label == "GET /projects/":
+            await _call(client, recorder, label, "GET", "/api/v1/projects/", params={"fiscal_year": year, "limit": 100})
+        elif label == "GET /vendors/":
+            await _call(client, recorder, label, "GET", "/api/v1/vendors/")
+        elif label == "GET /closing/status/{yyyymm}":
+            await _call(client, recorder, label, "GET", f"/api/v1/closing/status/{yyyymm}")
+        elif label == "GET /sap/unmapped":
+            await _call(client, recorder, label, "GET", "/api/v1/sap/unmapped")
+        else:
+            # 실적이 없는 이후 월만 추정치 입력
+            body = {
+                "proj_id": rng.choice(ctx["proj_ids"]),
+                "yyyymm": f"{year}{rng.randint(ACTUAL_MONTHS + 1, 12):02d}",
+                "est_amt": rng.randrange(1_000_000, 50_000_000, 10_000),
+            }
+            await _call(client, recorder, label, "POST", "/api/v1/execution/update-forecast", json=body)
+
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+
+
+async def periodic(client, recorder, deadline: float, interval: float, label: str, method: str, url: str, **kwargs):
+    """SAP 업로드 / 자동 매핑처럼 한 명이 주기적으로 실행하는 작업"""
+    while time.perf_counter() < deadline:
+        await _call(client, recorder, label, method, url, **kwargs)
+        await asyncio.sleep(interval)
+
+
+async def run_load(base_url: str, ctx: dict, users: int, duration: float, think: float,
+                   upload_interval: float, mapping_interval: float, seed: int,
+                   bulk_interval: float = 0) -> Tuple[Recorder, float]:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=users + 4, max_keepalive_connections=users + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        tasks = [
+            user_session(client, recorder, random.Random(seed + i), ctx, deadline, think)
+            for i in range(users)
+        ]
+        if ctx.get("sap_excel") and upload_interval > 0:
+            files = {"file": ("sap_upload.xlsx", ctx["sap_excel"],
+                              "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+            tasks.append(periodic(client, recorder, deadline, upload_interval,
+                                  "POST /sap/upload", "POST", "/api/v1/sap/upload", files=files))
+        if mapping_interval > 0:
+            tasks.append(periodic(client, recorder, deadline, mapping_interval,
+                                  "POST /sap/run-mapping", "POST", "/api/v1/sap/run-mapping"))
+        if ctx.get("plan_excel") and bulk_interval > 0:
+            files = {"file": ("plan_upload.xlsx", ctx["plan_excel"],
+                              "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+            tasks.append(periodic(client, recorder, deadline, bulk_interval,
+                                  "POST /projects/master/bulk", "POST", "/api/v1/projects/master/bulk",
+                                  files=files, data={"year": ctx["year"]}))
+        await asyncio.gather(*tasks)
+        return recorder, time.perf_counter() - start
+
+
+# ==========================================
+# 서버 기동
+# ==========================================
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workdir: str, db_path: str, workers: int) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "CACHE_SHARED_PATH": os.path.join(workdir, "cache", "opex_cache.db"),
+        "SAP_ARCHIVE_DIR": os.path.join(workdir, "archive"),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env,
+        # 앱 로깅 설정이 접근 로그를 stdout으로 출력하므로 결과표와 섞이지 않게 버림 (오류는 stderr)
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+
+    for _ in range(300):
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn 기동 실패 (exit code {proc.returncode})")
+        try:
+            if httpx.get(f"{base_url}/", timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+
+    proc.terminate()
+    raise RuntimeError("uvicorn이 30초 안에 응답하지 않습니다.")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="OPEX API 동시 부하 테스트")
+    parser.add_argument("--scale", choices=list(SCALES), default="medium")
+    parser.add_argument("--users", type=int, default=50, help="동시 가상 사용자 수")
+    parser.add_argument("--duration", type=float, default=60, help="측정 시간(초)")
+    parser.add_argument("--think", type=float, default=1.0, help="요청 간 평균 대기 시간(초)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--upload-interval", type=float, default=20, help="SAP 업로드 주기(초), 0이면 생략")
+    parser.add_argument("--mapping-interval", type=float, default=15, help="자동 매핑 주기(초), 0이면 생략")
+    parser.add_argument("--bulk-interval", type=float, default=0, help="사업 계획 일괄 업로드 주기(초), 0이면 생략")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (지정 시 서버/DB를 새로 만들지 않음)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    dataset = build_scale(args.scale, seed=args.seed)
+    # 업로드 파일은 기존 전표와 겹치지 않도록 전표 번호를 바꿔 신규 전표로 만듦
+    upload_set = {**dataset, "sap_lines": [{**line, "slip_no": "9" + line["slip_no"][1:]} for line in dataset["sap_lines"]]}
+    ctx = {
+        "year": dataset["fiscal_year"],
+        "proj_ids": [p["proj_id"] for p in dataset["projects"]],
+        "sap_excel": sap_excel_bytes(upload_set),
+        "plan_excel": plan_excel_bytes(dataset) if args.bulk_interval > 0 else None,
+    }
+
+    proc, workdir = None, None
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            workdir = tempfile.mkdtemp(prefix="opex_load_")
+            db_path = os.path.join(workdir, "opex.db")
+            load_dataset(create_engine(f"sqlite:///{db_path}"), dataset)
+            proc, base_url = start_server(workdir, db_path, args.workers)
+
+        print(f"target={base_url} scale={args.scale} users={args.users} duration={args.duration}s workers={args.workers}")
+        recorder, elapsed = asyncio.run(run_load(
+            base_url, ctx, args.users, args.duration, args.think,
+            args.upload_interval, args.mapping_interval, args.seed, args.bulk_interval,
+        ))
+        print_report(recorder, elapsed)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
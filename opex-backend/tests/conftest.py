@@ -0,0 +1,82 @@
+# tests/conftest.py
+"""
+API 동작 테스트 공용 fixture
+
+- 작은 합성 데이터(benchmarks.datagen)를 한 번 적재한 템플릿 DB를 만들어 두고,
+  테스트마다 템플릿을 복사해 같은 상태에서 시작합니다.
+- app 설정은 import 시점에 읽으므로 DB/캐시/보관 경로를 임시 폴더로 먼저 지정합니다.
+
+실행: (opex-backend 폴더에서, pip install -r requirements-dev.txt 후)
+    python -m pytest
+"""
+import os
+import shutil
+import tempfile
+
+WORKDIR = tempfile.mkdtemp(prefix="opex_test_")
+DB_PATH = os.path.join(WORKDIR, "opex.db")
+TEMPLATE_PATH = os.path.join(WORKDIR, "template.db")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["CACHE_SHARED_PATH"] = os.path.join(WORKDIR, "cache", "opex_cache.db")
+os.environ["SAP_ARCHIVE_DIR"] = os.path.join(WORKDIR, "archive")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from benchmarks.datagen import build_dataset, load_dataset
+
+# 사업 30건(부서 A/B/C × 10), SAP 전표 300행
+N_PROJECTS = 30
+N_SAP_LINES = 300
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    ds = build_dataset(N_PROJECTS, N_SAP_LINES)
+    template_engine = create_engine(f"sqlite:///{TEMPLATE_PATH}")
+    load_dataset(template_engine, ds)
+    template_engine.dispose()
+    yield ds
+    shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+def reset_database():
+    """작업 DB를 템플릿 상태로 되돌리고 캐시/보관 파일을 비웁니다."""
+    from app.core.cache import memory_cache, shared_cache
+    from app.core.config import settings
+    from app.core.database import engine, read_engine
+
+    engine.dispose()
+    read_engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    shutil.copyfile(TEMPLATE_PATH, DB_PATH)
+    shutil.rmtree(settings.SAP_ARCHIVE_DIR, ignore_errors=True)
+    memory_cache.clear()
+    if shared_cache is not None:
+        shared_cache.clear()
+
+
+@pytest.fixture
+def client(dataset):
+    """템플릿 상태의 DB로 앱을 기동한 TestClient (lifespan 포함)"""
+    from app.main import app
+
+    reset_database()
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def db(client):
+    """테스트 검증용 쓰기 세션 (client와 같은 DB)"""
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,66 @@
+# tests/test_allocation.py
+"""공통비 배분: 배분 후 합계가 원천 금액(사업 계획/실적 합계)과 같은지"""
+from collections import defaultdict
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.project import ProjectMaster, MonthlyData
+
+YEAR = "2025"
+URL = "/api/v1/report/allocation"
+
+
+def _source_totals(db):
+    """월별 (계획, 실적) 원천 합계"""
+    db.expire_all()
+    rows = db.execute(
+        select(MonthlyData.yyyymm, func.sum(MonthlyData.plan_amt), func.sum(MonthlyData.actual_amt))
+        .join(ProjectMaster, ProjectMaster.proj_id == MonthlyData.proj_id)
+        .where(ProjectMaster.fiscal_year == YEAR)
+        .group_by(MonthlyData.yyyymm)
+    ).all()
+    return {yyyymm: (int(plan or 0), int(actual or 0)) for yyyymm, plan, actual in rows}
+
+
+def _assert_conserved(rows, plan, actual):
+    # 그룹별 반올림 오차(그룹당 1원 이내)만 허용
+    assert abs(sum(r["total_plan_amt"] for r in rows) - plan) <= len(rows)
+    assert abs(sum(r["total_actual_amt"] for r in rows) - actual) <= len(rows)
+    assert abs(sum(r["alloc_weight"] for r in rows) - 1) < 1e-4
+
+
+@pytest.mark.parametrize("by", ["site", "dept", "site_dept"])
+def test_allocation_conserves_source_amounts(client, db, by):
+    source = _source_totals(db)
+    rows = client.get(URL, params={"year": YEAR, "by": by}).json()["rows"]
+
+    assert {r.get("site") for r in rows} & {"공통"} == set()
+    assert sum(r["allocated_plan_amt"] for r in rows) > 0
+    _assert_conserved(rows, sum(p for p, _ in source.values()), sum(a for _, a in source.values()))
+
+
+def test_allocation_conserves_each_month(client, db):
+    source = _source_totals(db)
+    rows = client.get(URL, params={"year": YEAR, "by": "site_dept", "monthly": True}).json()["rows"]
+
+    by_month = defaultdict(list)
+    for r in rows:
+        by_month[r["yyyymm"]].append(r)
+    assert sorted(by_month) == sorted(source)
+    for yyyymm, month_rows in by_month.items():
+        plan, actual = source[yyyymm]
+        assert abs(sum(r["total_plan_amt"] for r in month_rows) - plan) <= len(month_rows)
+        assert abs(sum(r["total_actual_amt"] for r in month_rows) - actual) <= len(month_rows)
+
+
+def test_allocation_recomputed_after_write(client, db):
+    first = client.get(URL, params={"year": YEAR}).json()
+
+    r = client.patch("/api/v1/projects/A-001", json={"monthly_amounts": [5_000_000] * 12})
+    assert r.status_code == 200, r.text
+
+    second = client.get(URL, params={"year": YEAR}).json()
+    assert second["version"] != first["version"]
+    source = _source_totals(db)
+    _assert_conserved(second["rows"], sum(p for p, _ in source.values()), sum(a for _, a in source.values()))
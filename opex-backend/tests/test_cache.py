@@ -0,0 +1,89 @@
+# tests/test_cache.py
+"""조회 캐시: 반복 조회는 캐시 적중, 쓰기 API 이후에는 (다른 워커의 공유 캐시 포함) 새 값으로 조회"""
+import pytest
+
+from app.core.cache import cache_stats, memory_cache
+
+YEAR = "2025"
+MONTH = f"{YEAR}11"
+
+
+def _hits(name):
+    stats = cache_stats().get(name, {})
+    return stats.get("memory_hit", 0) + stats.get("shared_hit", 0)
+
+
+def _get(client, url):
+    r = client.get(url)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _forecast(client):
+    r = client.post("/api/v1/execution/update-forecast", json={"proj_id": "A-002", "yyyymm": MONTH, "est_amt": 7_777_000})
+    assert r.status_code == 200, r.text
+
+
+def _transfer(client):
+    r = client.post("/api/v1/projects/transfer", json={
+        "from_proj_id": "A-001", "to_proj_id": "B-001", "transfer_amount": 300_000, "transfer_yyyymm": MONTH,
+    })
+    assert r.status_code == 200, r.text
+
+
+def _replan(client):
+    r = client.patch("/api/v1/projects/B-002", json={"monthly_amounts": [5_000_000] * 12})
+    assert r.status_code == 200, r.text
+
+
+def _new_vendor(client):
+    r = client.post("/api/v1/vendors/", json={"vendor_id": "W-NEW", "vendor_name": "신규 업체"})
+    assert r.status_code == 200, r.text
+
+
+def _field(proj_id, field):
+    return lambda rows: {r["proj_id"]: r[field] for r in rows}[proj_id]
+
+
+# (캐시 이름, 조회 URL, 쓰기, 조회 결과에서 확인할 값)
+CASES = [
+    ("execution.monthly_status", f"/api/v1/execution/{MONTH}", _forecast, _field("A-002", "est_amt")),
+    ("execution.monthly_status", f"/api/v1/execution/{MONTH}", _transfer, _field("A-001", "plan_amt")),
+    ("report.budget_vs_actual", f"/api/v1/report/budget-vs-actual?year={YEAR}", _replan, _field("B-002", "plan_amt")),
+    ("vendors.list", "/api/v1/vendors/", _new_vendor, lambda rows: "W-NEW" in {v["vendor_id"] for v in rows}),
+]
+
+
+@pytest.mark.parametrize("name,url,write,value", CASES, ids=["forecast", "transfer", "report-replan", "vendor"])
+@pytest.mark.parametrize("other_worker", [False, True], ids=["same-worker", "shared-cache"])
+def test_write_invalidates_cached_reads(client, name, url, write, value, other_worker):
+    hits = _hits(name)
+    before = _get(client, url)
+    assert _get(client, url) == before
+    assert _hits(name) == hits + 1
+
+    write(client)
+    if other_worker:
+        # 다른 워커: 메모리 캐시에는 아무것도 없고 공유 캐시만 있음
+        memory_cache.clear()
+
+    after = _get(client, url)
+    assert value(after) != value(before)
+    assert _hits(name) == hits + 1  # 무효화된 항목은 적중하지 않음
+    assert _get(client, url) == after
+    assert _hits(name) == hits + 2
+
+
+def test_failed_write_keeps_cache(client):
+    url = f"/api/v1/execution/{MONTH}"
+    before = _get(client, url)
+    hits = _hits("execution.monthly_status")
+
+    # 잔액 부족으로 거절된 전용: 무효화 없음
+    r = client.post("/api/v1/projects/transfer", json={
+        "from_proj_id": "A-001", "to_proj_id": "B-001", "transfer_amount": 10 ** 12, "transfer_yyyymm": MONTH,
+    })
+    assert r.status_code == 400
+
+    assert _get(client, url) == before
+    assert _hits("execution.monthly_status") == hits + 1
@@ -0,0 +1,100 @@
+# tests/test_closing_run.py
+"""월 마감 일괄 처리: 점검(dry_run), 차단 시 전체 취소, force 마감, 경고 항목"""
+from sqlalchemy import func, select, update
+
+from app.models.closing import MonthlyClose, MonthlyCloseSnapshot
+from app.models.project import MonthlyData
+from app.models.sap import SapUploadRaw
+
+YEAR = "2025"
+BLOCKED_MONTH = f"{YEAR}02"  # 미매핑 SAP 전표, 실적 ≠ SAP 합계
+CLEAN_MONTH = f"{YEAR}12"    # SAP 전표/실적 없음
+
+
+def _run(client, yyyymm, **body):
+    r = client.post(f"/api/v1/closing/{yyyymm}/run", json=body)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _state(db, yyyymm):
+    """(마감 상태, 실적 확정 행 수, 스냅샷 행 수)"""
+    db.expire_all()
+    status = db.execute(select(MonthlyClose.close_status).where(MonthlyClose.yyyymm == yyyymm)).scalar()
+    finalized = db.execute(
+        select(func.count()).where(MonthlyData.yyyymm == yyyymm, MonthlyData.is_actual_finalized == 'Y')
+    ).scalar_one()
+    snapshot = db.execute(
+        select(func.count()).select_from(MonthlyCloseSnapshot).where(MonthlyCloseSnapshot.yyyymm == yyyymm)
+    ).scalar_one()
+    return status, finalized, snapshot
+
+
+def _month_rows(db, yyyymm):
+    return db.execute(select(func.count()).where(MonthlyData.yyyymm == yyyymm)).scalar_one()
+
+
+def test_dry_run_reports_blocking_checks_without_changes(client, db):
+    result = _run(client, BLOCKED_MONTH, dry_run=True)
+
+    assert result["ready"] is False
+    assert result["closed"] is False
+    checks = result["checks"]
+    assert checks["unmapped_sap"]["passed"] is False and checks["unmapped_sap"]["count"] > 0
+    assert checks["actual_mismatch"]["passed"] is False and checks["actual_mismatch"]["items"]
+    assert _state(db, BLOCKED_MONTH) == (None, 0, 0)
+
+
+def test_blocked_run_rolls_back(client, db):
+    result = _run(client, BLOCKED_MONTH)
+
+    assert result["ready"] is False
+    assert result["closed"] is False
+    assert result["finalized_rows"] == 0
+    assert _state(db, BLOCKED_MONTH) == (None, 0, 0)
+
+
+def test_force_closes_blocked_month(client, db):
+    result = _run(client, BLOCKED_MONTH, force=True, user_id="kim")
+
+    rows = _month_rows(db, BLOCKED_MONTH)
+    assert result["closed"] is True
+    assert result["forced"] is True
+    assert result["finalized_rows"] == rows
+    assert _state(db, BLOCKED_MONTH) == ("CLOSED", rows, rows)
+    assert client.get(f"/api/v1/closing/status/{BLOCKED_MONTH}").json()["status"] == "CLOSED"
+
+    # 이미 마감된 월은 다시 실행할 수 없음
+    assert client.post(f"/api/v1/closing/{BLOCKED_MONTH}/run", json={}).status_code == 409
+
+
+def test_ready_month_closes_and_warnings_do_not_block(client, db):
+    # 계획 없이 실적이 있는 사업(경고): 실적과 같은 금액의 매핑된 SAP 전표가 있으므로 차단 항목은 통과
+    db.execute(
+        update(MonthlyData).where(MonthlyData.proj_id == "A-001", MonthlyData.yyyymm == CLEAN_MONTH)
+        .values(plan_amt=0, actual_amt=120_000)
+    )
+    db.add(SapUploadRaw(
+        yyyymm=CLEAN_MONTH, fiscal_year=YEAR, slip_no="5199999999", line_item=1, header_text="[A-001] 12월",
+        amt_val=120_000, currency="KRW", mapped_proj_id="A-001", mapping_status="MAPPED",
+    ))
+    db.commit()
+
+    preview = _run(client, CLEAN_MONTH, dry_run=True)
+    assert preview["ready"] is True
+    assert preview["closed"] is False
+    warning = preview["checks"]["actual_without_plan"]
+    assert warning["passed"] is False
+    assert warning["items"] == [{"proj_id": "A-001", "actual_amt": 120_000}]
+    assert _state(db, CLEAN_MONTH) == (None, 0, 0)
+
+    result = _run(client, CLEAN_MONTH)
+    rows = _month_rows(db, CLEAN_MONTH)
+    assert result["closed"] is True
+    assert result["forced"] is False
+    assert _state(db, CLEAN_MONTH) == ("CLOSED", rows, rows)
+
+
+def test_invalid_month(client):
+    assert client.post("/api/v1/closing/2025ab/run", json={}).status_code == 400
+    assert client.post("/api/v1/closing/202513/run", json={}).status_code == 400
@@ -0,0 +1,52 @@
+# tests/test_closing_snapshot.py
+"""마감 스냅샷: 마감 월은 예실 대비에서 스냅샷 금액으로 집계, 마감 해제 시 스냅샷 삭제"""
+from sqlalchemy import func, select
+
+from app.models.closing import MonthlyCloseSnapshot
+from app.models.project import MonthlyData
+
+YEAR = "2025"
+CLOSED_MONTH = f"{YEAR}03"
+PROJ = "A-001"
+NEW_PLAN = 5_000_000
+
+
+def _set_status(client, status):
+    r = client.post("/api/v1/closing/update", json={"yyyymm": CLOSED_MONTH, "status": status})
+    assert r.status_code == 200, r.text
+
+
+def _report_plan(client):
+    rows = client.get("/api/v1/report/budget-vs-actual", params={"year": YEAR}).json()
+    return {r["proj_id"]: r["plan_amt"] for r in rows}[PROJ]
+
+
+def _snapshot_rows(db):
+    db.expire_all()
+    return db.execute(
+        select(func.count()).select_from(MonthlyCloseSnapshot).where(MonthlyCloseSnapshot.yyyymm == CLOSED_MONTH)
+    ).scalar_one()
+
+
+def test_closed_month_reads_snapshot_until_reopened(client, db):
+    closed_plan = int(db.execute(
+        select(MonthlyData.plan_amt).where(MonthlyData.proj_id == PROJ, MonthlyData.yyyymm == CLOSED_MONTH)
+    ).scalar_one())
+    assert closed_plan != NEW_PLAN
+
+    _set_status(client, "CLOSED")
+    assert _snapshot_rows(db) > 0
+    snapshot = {r["proj_id"]: r for r in client.get(f"/api/v1/closing/snapshot/{CLOSED_MONTH}").json()}
+    assert snapshot[PROJ]["plan_amt"] == closed_plan
+
+    # 마감 후 사업 수정으로 마감 월의 운영 데이터도 바뀜 (연도 1월만 마감 여부를 확인)
+    r = client.patch(f"/api/v1/projects/{PROJ}", json={"monthly_amounts": [NEW_PLAN] * 12})
+    assert r.status_code == 200, r.text
+
+    # 마감 월은 스냅샷 금액, 나머지 11개월은 수정된 금액
+    assert _report_plan(client) == NEW_PLAN * 11 + closed_plan
+
+    _set_status(client, "OPEN")
+    assert _snapshot_rows(db) == 0
+    assert client.get(f"/api/v1/closing/snapshot/{CLOSED_MONTH}").json() == []
+    assert _report_plan(client) == NEW_PLAN * 12
@@ -0,0 +1,134 @@
+# tests/test_cube.py
+"""지출 분석 큐브: 백그라운드로 변경 월만 재집계한 결과가 전체 재집계와 같은지, 쓰기/조회 요청은 재집계하지 않는지"""
+import time
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.core.cube import _TRIGGERS, mark_all_dirty, refresh_cube
+from app.core.query_stats import assert_query_budget
+from app.models.cube import SpendCube, SpendCubeDirty
+
+YEAR = "2025"
+
+
+def _cube_rows(db):
+    db.expire_all()
+    columns = [c for c in SpendCube.__table__.columns if c.name != "cube_id"]
+    return sorted(tuple(str(v) for v in row) for row in db.execute(select(*columns)).all())
+
+
+def _pending_months(db):
+    db.expire_all()
+    return db.execute(select(func.count()).select_from(SpendCubeDirty)).scalar_one()
+
+
+def _wait_refreshed(db, timeout=10.0):
+    """백그라운드 재집계가 표시된 월을 모두 처리할 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while _pending_months(db):
+        assert time.monotonic() < deadline, "cube refresher did not run"
+        time.sleep(0.05)
+
+
+def _get_cube(client, **params):
+    r = client.get("/api/v1/report/cube", params={"year": YEAR, **params})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _write_through_api(client):
+    legs = [
+        {"from_proj_id": "A-001", "to_proj_id": "B-001", "transfer_amount": 300_000, "transfer_yyyymm": f"{YEAR}02"},
+        {"from_proj_id": "C-002", "to_proj_id": "A-003", "transfer_amount": 100_000, "transfer_yyyymm": f"{YEAR}07"},
+    ]
+    assert client.post("/api/v1/projects/transfer/batch", json={"legs": legs}).status_code == 200
+    assert client.post("/api/v1/projects/transfer", json={
+        "from_proj_id": "B-002", "to_proj_id": "C-001", "transfer_amount": 50_000, "transfer_yyyymm": f"{YEAR}05",
+    }).status_code == 200
+    assert client.post("/api/v1/execution/update-forecast", json={
+        "proj_id": "A-002", "yyyymm": f"{YEAR}11", "est_amt": 7_777_000,
+    }).status_code == 200
+
+    # 사업 분석 속성 변경 (모든 월의 칸이 옮겨감)
+    assert client.patch("/api/v1/projects/B-003", json={"dept_code": "C", "vendor_id": "V0001"}).status_code == 200
+    r = client.post("/api/v1/projects/", json={
+        "proj_name": "큐브 신규 사업", "fiscal_year": YEAR, "dept_code": "A", "monthly_amounts": [1_000_000] * 12,
+    })
+    assert r.status_code == 200, r.text
+    assert client.delete("/api/v1/projects/C-004").status_code == 204
+
+    # 마감 스냅샷 (마감 월은 스냅샷 금액으로 집계)
+    assert client.post("/api/v1/closing/update", json={"yyyymm": f"{YEAR}03", "status": "CLOSED"}).status_code == 200
+    assert client.post("/api/v1/execution/update-forecast", json={
+        "proj_id": "A-001", "yyyymm": f"{YEAR}04", "est_amt": 1_000,
+    }).status_code == 200
+
+
+@pytest.mark.parametrize("with_triggers", [True, False], ids=["sqlite-triggers", "api-marks-only"])
+def test_incremental_refresh_matches_full_rebuild(client, db, with_triggers):
+    if not with_triggers:
+        # 트리거가 없는 DB(Postgres 등)와 같은 조건: 쓰기 API의 mark_dirty만으로 추적
+        for name in _TRIGGERS:
+            db.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        db.commit()
+
+    refresh_cube(db)
+    before = _cube_rows(db)
+    assert before
+
+    _write_through_api(client)
+    _wait_refreshed(db)
+    incremental = _cube_rows(db)
+    assert incremental != before
+
+    mark_all_dirty(db)
+    refresh_cube(db)
+    assert _cube_rows(db) == incremental
+
+
+def test_writes_leave_refresh_to_background(client, db):
+    before = _get_cube(client, dims="yyyymm")
+
+    # 쓰기 요청은 변경 표시만 하고 큐브 테이블은 건드리지 않음
+    with assert_query_budget(100) as requests:
+        r = client.post("/api/v1/execution/update-forecast", json={
+            "proj_id": "A-002", "yyyymm": f"{YEAR}11", "est_amt": 7_777_000,
+        })
+    assert r.status_code == 200
+    statements = list(requests[0].statements)
+    assert any("tb_spend_cube_dirty" in sql for sql in statements)
+    assert not any("tb_spend_cube " in sql or "tb_spend_cube(" in sql or sql.startswith("DELETE FROM tb_spend_cube_dirty")
+                   for sql in statements)
+    _wait_refreshed(db)
+
+    # 조회는 큐브 SELECT 한 번 (재집계/쓰기 없음)
+    with assert_query_budget(1):
+        after = _get_cube(client, dims="yyyymm")
+    assert after["total"]["est_amt"] != before["total"]["est_amt"]
+    assert after["total"] == _get_cube(client, dims="dept_code,vendor_id")["total"]
+
+
+def test_refresh_endpoint_applies_direct_changes(client, db):
+    before = _get_cube(client)
+    db.execute(text(f"UPDATE tb_monthly_data SET plan_amt = plan_amt + 1000 WHERE yyyymm = '{YEAR}07'"))
+    db.commit()
+    assert _pending_months(db) == 1  # SQLite 트리거가 표시만 하고, 조회 결과는 그대로
+    assert _get_cube(client) == before
+
+    r = client.post("/api/v1/report/cube/refresh")
+    assert r.status_code == 200
+    assert r.json()["months"] == 1
+    assert _get_cube(client)["total"]["plan_amt"] > before["total"]["plan_amt"]
+
+
+def test_rebuild_endpoint(client, db):
+    refresh_cube(db)
+    before = _cube_rows(db)
+    db.execute(text("DELETE FROM tb_spend_cube"))
+    db.commit()
+
+    r = client.post("/api/v1/report/cube/rebuild")
+    assert r.status_code == 200
+    assert r.json()["months"] == 12
+    assert _cube_rows(db) == before
@@ -0,0 +1,40 @@
+# tests/test_etag.py
+"""조건부 GET: ETag 304 왕복, 쓰기 commit 시에만 ETag가 바뀌는지"""
+from app.core.versioning import bump_version
+from app.models.vendor import VendorMaster
+
+URL = "/api/v1/vendors/"
+
+
+def test_etag_round_trip(client):
+    first = client.get(URL)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get(URL, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    r = client.post(URL, json={"vendor_id": "999-99-99999", "vendor_name": "신규 협력업체"})
+    assert r.status_code == 200, r.text
+
+    changed = client.get(URL, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert "999-99-99999" in [v["vendor_id"] for v in changed.json()]
+
+    assert client.get(URL, headers={"If-None-Match": changed.headers["ETag"]}).status_code == 304
+
+
+def test_rolled_back_write_keeps_etag(client, db):
+    etag = client.get(URL).headers["ETag"]
+
+    # 버전은 쓰기와 같은 트랜잭션에서 올리므로 rollback되면 ETag도 그대로
+    bump_version(db, VendorMaster.__tablename__)
+    db.rollback()
+    assert client.get(URL, headers={"If-None-Match": etag}).status_code == 304
+
+    bump_version(db, VendorMaster.__tablename__)
+    db.commit()
+    assert client.get(URL, headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,83 @@
+# tests/test_export.py
+"""CSV/XLSX 스트리밍 내보내기: 헤더/행 수, 보관(Parquet) 원장 + 운영 테이블 이어 붙이기"""
+import csv
+import io
+
+import pytest
+from openpyxl import load_workbook
+
+from app.api.v1.export import SAP_LEDGER_COLUMNS
+from app.models.closing import MonthlyClose
+from app.models.sap import SapUploadRaw
+
+YEAR = "2025"
+NEXT_YEAR = "2026"
+
+BVA_HEADERS = ["부서", "Index", "사업명", "계획", "실적", "잔여예산", "집행률(%)"]
+EXECUTION_HEADERS = ["부서", "Index", "사업명", "업체", "연월", "계획", "실적", "추정", "실적확정"]
+LEDGER_HEADERS = [label for _, label in SAP_LEDGER_COLUMNS]
+
+
+def _export(client, url, fmt, **params):
+    """내보내기 응답을 [헤더, 행...] 목록으로 읽음"""
+    r = client.get(url, params={"fmt": fmt, **params})
+    assert r.status_code == 200, r.text
+    assert r.headers["content-disposition"].endswith(f'.{fmt}"')
+    if fmt == "csv":
+        text = r.content.decode("utf-8")
+        assert text.startswith("\ufeff")
+        return list(csv.reader(io.StringIO(text[1:])))
+    ws = load_workbook(io.BytesIO(r.content), read_only=True).active
+    return [list(row) for row in ws.iter_rows(values_only=True)]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "xlsx"])
+def test_budget_vs_actual_export(client, fmt):
+    report = client.get("/api/v1/report/budget-vs-actual", params={"year": YEAR}).json()
+
+    rows = _export(client, "/api/v1/export/budget-vs-actual", fmt, year=YEAR)
+    assert rows[0] == BVA_HEADERS
+    assert len(rows) - 1 == len(report)
+    assert sorted(r[1] for r in rows[1:]) == sorted(r["proj_id"] for r in report)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "xlsx"])
+def test_execution_grid_export(client, dataset, fmt):
+    rows = _export(client, f"/api/v1/export/execution/{YEAR}", fmt)
+    assert rows[0] == EXECUTION_HEADERS
+    assert len(rows) - 1 == len(dataset["monthly"])
+
+
+@pytest.mark.parametrize("fmt", ["csv", "xlsx"])
+def test_sap_ledger_export(client, dataset, fmt):
+    rows = _export(client, "/api/v1/export/sap-ledger", fmt, fiscal_year=YEAR)
+    assert rows[0] == LEDGER_HEADERS
+    assert len(rows) - 1 == len(dataset["sap_lines"])
+
+
+def test_sap_ledger_chains_archived_then_live_rows(client, db, dataset):
+    # 2025년 12개월 마감 → 보관, 운영 테이블에는 2026년 전표만 남김
+    db.add_all(MonthlyClose(yyyymm=f"{YEAR}{m:02d}", close_status="CLOSED") for m in range(1, 13))
+    db.commit()
+    r = client.post("/api/v1/sap/archive", json={"fiscal_year": YEAR})
+    assert r.status_code == 200, r.text
+    assert r.json()["archived_rows"] == len(dataset["sap_lines"])
+
+    db.add(SapUploadRaw(
+        yyyymm=f"{NEXT_YEAR}01", fiscal_year=NEXT_YEAR, slip_no="5100000001", line_item=1,
+        amt_val=1_000, currency="KRW", mapping_status="UNMAPPED",
+    ))
+    db.commit()
+
+    rows = _export(client, "/api/v1/export/sap-ledger", "csv")
+    assert rows[0] == LEDGER_HEADERS
+    fiscal_years = [r[1] for r in rows[1:]]
+    assert fiscal_years == [YEAR] * len(dataset["sap_lines"]) + [NEXT_YEAR]
+
+    # 연도 조건은 보관분/운영 테이블 모두에 적용
+    assert len(_export(client, "/api/v1/export/sap-ledger", "xlsx", fiscal_year=YEAR)) - 1 == len(dataset["sap_lines"])
+    assert len(_export(client, "/api/v1/export/sap-ledger", "csv", fiscal_year=NEXT_YEAR)) - 1 == 1
+
+
+def test_unknown_format(client):
+    assert client.get("/api/v1/export/budget-vs-actual", params={"fmt": "pdf"}).status_code == 400
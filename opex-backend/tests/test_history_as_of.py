@@ -0,0 +1,84 @@
+# tests/test_history_as_of.py
+"""월 데이터 변경 이력: 이전 값 기록과 as_of 재현 (이력이 없는 데이터셋 기준)"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
+
+from app.models.history import MonthlyDataHistory
+from app.models.project import MonthlyData
+
+YEAR = "2025"
+MONTH = f"{YEAR}05"
+# 데이터셋의 사업 등록 시각(2025-01-02) 이후, 테스트의 모든 변경보다 이전
+BEFORE_WRITES = f"{YEAR}-06-01T00:00:00"
+
+
+def _execution(client, yyyymm=MONTH, **params):
+    r = client.get(f"/api/v1/execution/{yyyymm}", params=params)
+    assert r.status_code == 200, r.text
+    return {row["proj_id"]: row for row in r.json()}
+
+
+def _budget_vs_actual(client, **params):
+    r = client.get("/api/v1/report/budget-vs-actual", params={"year": YEAR, **params})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _history(db, proj_id, field):
+    db.expire_all()
+    return db.execute(
+        select(MonthlyDataHistory.old_value, MonthlyDataHistory.new_value)
+        .where(MonthlyDataHistory.proj_id == proj_id, MonthlyDataHistory.yyyymm == MONTH,
+               MonthlyDataHistory.field == field)
+    ).all()
+
+
+def _load_expired(db):
+    row = db.execute(select(MonthlyData).where(MonthlyData.proj_id == "A-001", MonthlyData.yyyymm == MONTH)).scalar_one()
+    original = int(row.plan_amt)
+    db.commit()  # expire_on_commit: 이전 값을 다시 읽지 않은 채 수정하게 됨
+    return row, original
+
+
+def _load_without_amounts(db):
+    row = db.execute(
+        select(MonthlyData).options(load_only(MonthlyData.data_id))
+        .where(MonthlyData.proj_id == "A-001", MonthlyData.yyyymm == MONTH)
+    ).scalar_one()
+    original = int(db.execute(select(MonthlyData.plan_amt).where(MonthlyData.data_id == row.data_id)).scalar_one())
+    return row, original
+
+
+@pytest.mark.parametrize("load", [_load_expired, _load_without_amounts], ids=["expired", "load-only"])
+def test_unloaded_old_value_is_recorded(client, db, load):
+    row, original = load(db)
+    assert original != 0
+
+    row.plan_amt = original + 1_000_000
+    db.commit()
+
+    assert [(int(old), int(new)) for old, new in _history(db, "A-001", "plan_amt")] == [(original, original + 1_000_000)]
+    assert _execution(client, as_of=BEFORE_WRITES)["A-001"]["plan_amt"] == original
+    assert _execution(client)["A-001"]["plan_amt"] == original + 1_000_000
+
+
+def test_as_of_reproduces_state_before_api_writes(client):
+    execution = {m: _execution(client, f"{YEAR}{m:02d}") for m in (2, 5, 11)}
+    report = _budget_vs_actual(client)
+
+    assert client.post("/api/v1/projects/transfer/batch", json={"legs": [
+        {"from_proj_id": "A-001", "to_proj_id": "B-001", "transfer_amount": 300_000, "transfer_yyyymm": f"{YEAR}02"},
+        {"from_proj_id": "A-001", "to_proj_id": "C-001", "transfer_amount": 200_000, "transfer_yyyymm": MONTH},
+    ]}).status_code == 200
+    assert client.post("/api/v1/execution/update-forecast", json={
+        "proj_id": "A-002", "yyyymm": f"{YEAR}11", "est_amt": 7_777_000,
+    }).status_code == 200
+    assert client.patch("/api/v1/projects/B-002", json={"monthly_amounts": [5_000_000] * 12}).status_code == 200
+
+    assert _execution(client, f"{YEAR}11")["A-002"]["est_amt"] == 7_777_000
+    assert _budget_vs_actual(client) != report
+
+    for m, rows in execution.items():
+        assert _execution(client, f"{YEAR}{m:02d}", as_of=BEFORE_WRITES) == rows
+    assert _budget_vs_actual(client, as_of=BEFORE_WRITES) == report
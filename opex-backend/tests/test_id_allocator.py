@@ -0,0 +1,119 @@
+# tests/test_id_allocator.py
+"""채번: 병렬 등록 시 번호가 겹치지 않는지, 직접 지정한 번호 이후로 발급되는지"""
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from sqlalchemy import select
+
+from app.core.id_allocator import next_project_id, reserve_budget_code_ids
+from app.models.account import BudgetCodeMaster
+from app.models.project import ProjectMaster
+from benchmarks.datagen import CC_BY_DEPT
+
+YEAR = "2025"
+# 부서별 최대 번호 999 이내
+PARALLEL_CREATES = 2400
+WORKERS = 16
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _create(client, dept, name):
+    return client.post("/api/v1/projects/", json={
+        "proj_name": name, "fiscal_year": YEAR, "dept_code": dept, "monthly_amounts": [0] * 12,
+    })
+
+
+def test_parallel_creates_get_distinct_ids(client, db):
+    existing = set(db.execute(select(ProjectMaster.proj_id)).scalars())
+
+    def create(i):
+        r = _create(client, "ABC"[i % 3], f"병렬 등록 {i}")
+        return r.status_code, r.json().get("proj_id")
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        results = list(pool.map(create, range(PARALLEL_CREATES)))
+
+    assert [status for status, _ in results] == [200] * PARALLEL_CREATES
+    ids = [proj_id for _, proj_id in results]
+    assert len(set(ids)) == PARALLEL_CREATES
+    assert not set(ids) & existing
+    db.expire_all()
+    assert len(set(db.execute(select(ProjectMaster.proj_id)).scalars())) == len(existing) + PARALLEL_CREATES
+
+
+def test_explicit_id_advances_sequence(client, db):
+    first = next_project_id(db, "A")  # 채번 시작 (기존 최대 번호 + 1)
+    explicit = f"A-{int(first.split('-')[1]) + 2:03d}"
+    db.add(ProjectMaster(proj_id=explicit, proj_name="직접 지정", fiscal_year=YEAR, dept_code="A"))
+    db.commit()
+
+    assert next_project_id(db, "A") == f"A-{int(explicit.split('-')[1]) + 1:03d}"
+
+
+def test_explicit_budget_code_advances_sequence(client, db):
+    first = reserve_budget_code_ids(db, "IT_TYPE")[0]
+    db.add(BudgetCodeMaster(code_id="IT_TYPE_050", code_name="직접 지정", code_type="IT_TYPE"))
+    db.commit()
+
+    assert first != "IT_TYPE_050"
+    r = client.post("/api/v1/accounts/budget-code", json={"code_type": "IT_TYPE", "name": "자동 채번"})
+    assert r.status_code == 200, r.text
+    assert r.json()["code_id"] == "IT_TYPE_051"
+
+
+def _upload_plan(client, year, rows):
+    r = client.post(
+        "/api/v1/projects/master/bulk",
+        data={"year": year},
+        files={"file": ("plan.xlsx", _plan_excel(year, rows), XLSX)},
+    )
+    assert r.status_code == 200, r.text
+
+
+def _plan_excel(year: str, rows) -> bytes:
+    cc_code, cc_name = CC_BY_DEPT["A"]
+    df = pd.DataFrame([
+        {"연도": year, "Index": index, "사업명": name, "CC코드": cc_code, "CC명칭": cc_name, f"{year}01": 1_000_000}
+        for index, name in rows
+    ])
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def test_bulk_upload_mixes_explicit_and_auto_ids(client, db, dataset):
+    year = dataset["fiscal_year"]
+    existing = db.execute(select(ProjectMaster.proj_id).where(ProjectMaster.dept_code == "A")).scalars().all()
+    next_id = f"A-{max(int(pid.split('-')[1]) for pid in existing) + 1:03d}"
+
+    # 다음 자동 번호(next_id)를 같은 파일에서 Index로 직접 지정
+    rows = [(None, "자동 1"), (next_id, "직접 지정"), (None, "자동 2"), (None, "자동 3")]
+    _upload_plan(client, year, rows)
+
+    db.expire_all()
+    names = dict(db.execute(
+        select(ProjectMaster.proj_id, ProjectMaster.proj_name)
+        .where(ProjectMaster.proj_id.notin_(existing), ProjectMaster.dept_code == "A")
+    ).all())
+    assert names[next_id] == "직접 지정"
+    assert sorted(v for k, v in names.items() if k != next_id) == ["자동 1", "자동 2", "자동 3"]
+    assert len(names) == 4
+
+    # 이후 단건 등록도 예약된 번호와 겹치지 않음
+    r = client.post("/api/v1/projects/", json={
+        "proj_name": "단건 등록", "fiscal_year": year, "dept_code": "A", "monthly_amounts": [0] * 12,
+    })
+    assert r.status_code in (200, 201), r.text
+    assert r.json()["proj_id"] not in set(existing) | set(names)
+
+
+def test_bulk_upload_explicit_id_after_sequence_started(client, db):
+    # 채번이 이미 시작된 뒤 엑셀 Index로 더 큰 번호를 직접 지정
+    first = _create(client, "A", "단건 등록").json()["proj_id"]
+    explicit = f"A-{int(first.split('-')[1]) + 5:03d}"
+    _upload_plan(client, YEAR, [(explicit, "직접 지정")])
+
+    r = _create(client, "A", "직접 지정 이후 등록")
+    assert r.status_code == 200, r.text
+    assert r.json()["proj_id"] == f"A-{int(explicit.split('-')[1]) + 1:03d}"
@@ -0,0 +1,74 @@
+# tests/test_import_time.py
+"""
+워커 기동(import) 시간 예산 검사
+
+새 프로세스에서 `python -X importtime -c "import app.main"`을 실행해 app.main의 누적 import 시간을
+측정하고, 예산(OPEX_IMPORT_BUDGET_MS, 기본 1100ms = 측정치 약 880ms + 여유)을 넘으면 실패합니다.
+업로드/내보내기/추정 계산 전용 무거운 모듈(pandas, openpyxl, pyarrow, numpy)이 기동 시 로드되지 않는지도 확인합니다.
+
+import 시간 상위 모듈은 `python -X importtime -c "import app.main"` 출력으로 직접 확인합니다.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGET_MS = float(os.environ.get("OPEX_IMPORT_BUDGET_MS", "1100"))
+RUNS = 3
+LAZY_MODULES = ["pandas", "openpyxl", "pyarrow", "numpy"]
+
+
+def _run(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    env = {
+        **os.environ,
+        # import 시점에 DB에 접근하면 이 파일이 생기므로 함께 검사
+        "DATABASE_URL": f"sqlite:///{os.path.join(tempfile.gettempdir(), 'opex_import_check.db')}",
+    }
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(cmd, cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+
+
+def measure_import() -> List[Tuple[int, int, str]]:
+    """-X importtime 결과를 (self us, cumulative us, 모듈명) 목록으로 반환"""
+    result = _run("import app.main", importtime=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            rows.append((int(parts[0]), int(parts[1]), parts[2].rstrip()))
+        except ValueError:
+            continue  # 헤더 행
+    return rows
+
+
+def app_import_ms() -> float:
+    """여러 번 측정한 app.main 누적 import 시간 중 최솟값(ms)"""
+    samples = []
+    for _ in range(RUNS):
+        cumulative = {name.strip(): cum for _, cum, name in measure_import()}
+        samples.append(cumulative["app.main"] / 1000)
+    return min(samples)
+
+
+def test_app_import_within_budget():
+    elapsed = app_import_ms()
+    assert elapsed <= IMPORT_BUDGET_MS, f"app.main import {elapsed:.0f}ms > 예산 {IMPORT_BUDGET_MS:.0f}ms"
+
+
+def test_heavy_modules_are_lazy():
+    result = _run(f"import sys, app.main; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))")
+    loaded = result.stdout.strip()
+    assert not loaded, f"기동 시 로드되면 안 되는 모듈: {loaded}"
+
+
+def test_import_does_not_touch_db():
+    db_path = os.path.join(tempfile.gettempdir(), "opex_import_check.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    _run("import app.main")
+    assert not os.path.exists(db_path), "app.main import 중에 DB 접속/테이블 생성이 실행되었습니다."
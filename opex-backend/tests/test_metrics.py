@@ -0,0 +1,71 @@
+# tests/test_metrics.py
+"""GET /metrics: Prometheus 텍스트 포맷, 라우트 템플릿 라벨 (실제 경로의 ID가 라벨에 들어가지 않는지)"""
+import re
+
+from app.core.metrics import LATENCY_BUCKETS
+
+YEAR = "2025"
+EXECUTION_ROUTE = "/api/v1/execution/{yyyymm}"
+TRANSFERS_ROUTE = "/api/v1/projects/{proj_id}/transfers"
+
+SAMPLE = re.compile(r'^(?P<name>[a-z_]+)(?:\{(?P<labels>.*)\})? (?P<value>[0-9.e+-]+)$')
+
+
+def _samples(text):
+    """(이름, 라벨 dict, 값) 목록. 주석(# HELP/# TYPE) 외의 줄은 모두 샘플 형식이어야 함"""
+    samples = []
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        m = SAMPLE.match(line)
+        assert m, line
+        labels = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', m["labels"] or ""))
+        samples.append((m["name"], labels, float(m["value"])))
+    return samples
+
+
+def test_metrics_exposition(client):
+    for _ in range(2):
+        assert client.get(f"/api/v1/execution/{YEAR}02").status_code == 200
+    assert client.get("/api/v1/projects/A-001/transfers", params={"year": YEAR}).status_code == 200
+    assert client.get("/api/v1/no-such-route/12345").status_code == 404
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    text = r.text
+
+    for name, kind in [
+        ("opex_http_request_duration_seconds", "histogram"),
+        ("opex_http_request_size_bytes", "histogram"),
+        ("opex_http_response_size_bytes", "histogram"),
+        ("opex_http_requests_in_flight", "gauge"),
+        ("opex_cache_requests_total", "counter"),
+        ("opex_cache_evictions_total", "counter"),
+    ]:
+        assert f"# TYPE {name} {kind}\n" in text
+        assert f"# HELP {name} " in text
+
+    samples = _samples(text)
+
+    # 라우트 라벨은 템플릿만 (실제 경로의 월/사업 Index 없음), 매칭 안 된 경로는 unmatched
+    routes = {labels["route"] for _, labels, _ in samples if "route" in labels}
+    assert {EXECUTION_ROUTE, TRANSFERS_ROUTE, "unmatched"} <= routes
+    assert not any(f"{YEAR}02" in route or "A-001" in route or "12345" in route for route in routes)
+
+    # 히스토그램: 버킷별 누적 값, +Inf 버킷 = _count
+    labels = {"method": "GET", "route": EXECUTION_ROUTE, "status": "200"}
+    buckets = [(l["le"], v) for n, l, v in samples
+               if n == "opex_http_request_duration_seconds_bucket" and {k: l[k] for k in labels} == labels]
+    assert [le for le, _ in buckets] == [str(b) for b in LATENCY_BUCKETS] + ["+Inf"]
+    counts = [v for _, v in buckets]
+    assert counts == sorted(counts)
+    count = next(v for n, l, v in samples if n == "opex_http_request_duration_seconds_count" and l == labels)
+    assert counts[-1] == count >= 2
+    assert any(n == "opex_http_request_duration_seconds_sum" and l == labels and v > 0 for n, l, v in samples)
+
+    # 처리 중인 요청 = 지금 이 /metrics 요청 하나
+    assert ("opex_http_requests_in_flight", {}, 1.0) in samples
+    # 두 번째 조회는 캐시 적중
+    assert any(n == "opex_cache_requests_total" and l == {"cache": "execution.monthly_status", "layer": "memory", "result": "hit"}
+               for n, l, _ in samples)
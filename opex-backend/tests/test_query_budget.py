@@ -0,0 +1,42 @@
+# tests/test_query_budget.py
+"""핫 조회 라우트의 요청당 SQL 수 상한 (N+1 회귀 방지, 캐시 미적중 기준)"""
+import pytest
+
+from app.core.query_stats import assert_query_budget
+
+YEAR = "2025"
+
+# (URL, 허용 쿼리 수) - 캐시되는 라우트는 태그 버전 조회 1회 포함
+HOT_ROUTES = [
+    (f"/api/v1/execution/{YEAR}02", 2),
+    (f"/api/v1/execution/{YEAR}02?as_of={YEAR}-06-01T00:00:00", 2),
+    (f"/api/v1/report/budget-vs-actual?year={YEAR}", 2),
+    (f"/api/v1/report/budget-vs-actual?year={YEAR}&as_of={YEAR}-06-01T00:00:00", 2),
+    (f"/api/v1/projects/transfers?year={YEAR}", 1),
+    (f"/api/v1/projects/A-001/transfers?year={YEAR}", 1),
+    (f"/api/v1/projects/transfers/timeline?year={YEAR}", 1),
+    (f"/api/v1/projects/?fiscal_year={YEAR}", 2),
+]
+
+
+@pytest.fixture
+def client_with_transfers(client):
+    # 사업/월이 여러 개 걸친 전용 이력 (행 수가 늘어도 쿼리 수는 그대로여야 함)
+    legs = [
+        {"from_proj_id": f"A-{i:03d}", "to_proj_id": f"B-{i:03d}", "transfer_amount": 10_000,
+         "transfer_yyyymm": f"{YEAR}{m:02d}"}
+        for i in range(1, 6) for m in range(1, 4)
+    ]
+    legs.append({"from_proj_id": "B-001", "to_proj_id": "A-001", "transfer_amount": 5_000, "transfer_yyyymm": f"{YEAR}02"})
+    r = client.post("/api/v1/projects/transfer/batch", json={"legs": legs})
+    assert r.status_code == 200, r.text
+    return client
+
+
+@pytest.mark.parametrize("url,budget", HOT_ROUTES)
+def test_hot_route_query_budget(client_with_transfers, url, budget):
+    with assert_query_budget(budget) as requests:
+        r = client_with_transfers.get(url)
+    assert r.status_code == 200, r.text
+    assert r.json()
+    assert len(requests) == 1
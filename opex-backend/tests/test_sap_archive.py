@@ -0,0 +1,75 @@
+# tests/test_sap_archive.py
+"""마감 연도 SAP 원장 보관: Parquet 보관 → 원장 조회에 포함, 보관 연도는 재업로드 제외"""
+from sqlalchemy import func, select
+
+from app.core.sap_archive import archived_years
+from app.models.closing import MonthlyClose
+from app.models.sap import SapUploadRaw
+from benchmarks.datagen import sap_excel_bytes
+
+YEAR = "2025"
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _close_year(db):
+    db.add_all(MonthlyClose(yyyymm=f"{YEAR}{m:02d}", close_status="CLOSED") for m in range(1, 13))
+    db.commit()
+
+
+def _live_rows(db):
+    db.expire_all()
+    return db.execute(select(func.count()).select_from(SapUploadRaw).where(SapUploadRaw.fiscal_year == YEAR)).scalar_one()
+
+
+def _archive(client):
+    return client.post("/api/v1/sap/archive", json={"fiscal_year": YEAR})
+
+
+def _ledger(client, **params):
+    r = client.get("/api/v1/sap/ledger", params={"fiscal_year": YEAR, "limit": 100_000, **params})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_open_year_cannot_be_archived(client, db):
+    r = _archive(client)
+    assert r.status_code == 400
+    assert archived_years() == []
+    assert _live_rows(db) > 0
+
+
+def test_archived_rows_are_returned_by_ledger(client, db, dataset):
+    before = _ledger(client)
+    assert len(before) == len(dataset["sap_lines"])
+    assert not any(r["archived"] for r in before)
+
+    _close_year(db)
+    r = _archive(client)
+    assert r.status_code == 200, r.text
+    assert r.json()["archived_rows"] == len(dataset["sap_lines"])
+    assert archived_years() == [YEAR]
+    assert _live_rows(db) == 0
+
+    after = _ledger(client)
+    assert all(r["archived"] for r in after)
+    key = lambda r: (r["slip_no"], r["line_item"])
+    strip = lambda rows: sorted(({k: v for k, v in r.items() if k != "archived"} for r in rows), key=key)
+    assert strip(after) == strip(before)
+
+    # 월/매핑 조건도 보관 파일에 적용
+    month = f"{YEAR}03"
+    assert len(_ledger(client, yyyymm=month)) == sum(1 for r in before if r["yyyymm"] == month)
+    unmapped = [r for r in before if r["mapping_status"] == "UNMAPPED"]
+    assert unmapped
+    assert len(_ledger(client, mapping_status="UNMAPPED")) == len(unmapped)
+
+
+def test_upload_skips_archived_year(client, db, dataset):
+    _close_year(db)
+    assert _archive(client).status_code == 200
+
+    r = client.post("/api/v1/sap/upload", files={"file": ("sap.xlsx", sap_excel_bytes(dataset), XLSX)})
+    assert r.status_code == 200, r.text
+    assert f"신규: 0, 중복제외: {len(dataset['sap_lines'])}" in r.json()["message"]
+    assert _live_rows(db) == 0
+    assert len(_ledger(client)) == len(dataset["sap_lines"])
@@ -0,0 +1,102 @@
+# tests/test_transfer_batch.py
+"""다건(배치) 예산 전용: 원자성, 낙관적 갱신(409), 계획 금액이 NULL인 월"""
+import sqlite3
+
+from sqlalchemy import event, func, select, update
+
+from app.core.database import engine
+from app.models.project import MonthlyData
+from app.models.transfer import BudgetTransfer
+
+URL = "/api/v1/projects/transfer/batch"
+MONTH = "202502"
+
+
+def _plans(db, *proj_ids):
+    db.expire_all()
+    rows = db.execute(
+        select(MonthlyData.proj_id, MonthlyData.plan_amt)
+        .where(MonthlyData.proj_id.in_(proj_ids), MonthlyData.yyyymm == MONTH)
+    ).all()
+    return {proj_id: plan_amt for proj_id, plan_amt in rows}
+
+
+def _transfer_count(db):
+    return db.execute(select(func.count()).select_from(BudgetTransfer)).scalar_one()
+
+
+def _leg(src, dst, amount):
+    return {"from_proj_id": src, "to_proj_id": dst, "transfer_amount": amount, "transfer_yyyymm": MONTH}
+
+
+def test_batch_applies_net_deltas(client, db):
+    before = _plans(db, "A-001", "A-002", "A-003")
+    r = client.post(URL, json={"reason": "Q1", "legs": [
+        _leg("A-001", "A-002", 500_000), _leg("A-002", "A-003", 200_000), _leg("A-001", "A-003", 100_000),
+    ]})
+    assert r.status_code == 200, r.text
+    assert r.json()["leg_count"] == 3
+
+    after = _plans(db, "A-001", "A-002", "A-003")
+    assert after["A-001"] == before["A-001"] - 600_000
+    assert after["A-002"] == before["A-002"] + 300_000
+    assert after["A-003"] == before["A-003"] + 300_000
+    assert _transfer_count(db) == 3
+
+
+def test_batch_is_all_or_nothing(client, db):
+    before = _plans(db, "A-001", "A-002")
+    legs = [_leg("A-001", "A-002", 500_000), _leg("A-001", "Z-999", 100_000)]
+    r = client.post(URL, json={"legs": legs})
+    assert r.status_code == 404
+    assert _plans(db, "A-001", "A-002") == before
+    assert _transfer_count(db) == 0
+
+    legs = [_leg("A-001", "A-002", 500_000), _leg("A-002", "A-003", int(before["A-002"]) + 10_000_000)]
+    r = client.post(URL, json={"legs": legs})
+    assert r.status_code == 400
+    assert _plans(db, "A-001", "A-002") == before
+    assert _transfer_count(db) == 0
+
+
+def test_concurrent_edit_returns_409(client, db):
+    before = _plans(db, "A-001", "A-002")
+
+    # 조회 이후 반영 직전에 다른 연결이 A-001 금액을 수정한 상황
+    def edit_in_between(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE tb_monthly_data SET plan_amt"):
+            other = sqlite3.connect(engine.url.database)
+            other.execute(
+                "UPDATE tb_monthly_data SET plan_amt = plan_amt + 1 WHERE proj_id = 'A-001' AND yyyymm = ?", (MONTH,)
+            )
+            other.commit()
+            other.close()
+
+    event.listen(engine, "before_cursor_execute", edit_in_between)
+    try:
+        r = client.post(URL, json={"legs": [_leg("A-001", "A-002", 500_000)]})
+    finally:
+        event.remove(engine, "before_cursor_execute", edit_in_between)
+
+    assert r.status_code == 409
+    after = _plans(db, "A-001", "A-002")
+    assert after["A-001"] == before["A-001"] + 1
+    assert after["A-002"] == before["A-002"]
+    assert _transfer_count(db) == 0
+
+
+def test_transfer_through_month_with_null_plan(client, db):
+    db.execute(
+        update(MonthlyData).where(MonthlyData.proj_id == "A-002", MonthlyData.yyyymm == MONTH).values(plan_amt=None)
+    )
+    db.commit()
+    before = _plans(db, "A-001", "A-003")
+
+    # A-002는 계획 금액이 NULL(0)인 월에서 받은 금액의 일부를 다시 보냄
+    r = client.post(URL, json={"legs": [_leg("A-001", "A-002", 500_000), _leg("A-002", "A-003", 200_000)]})
+    assert r.status_code == 200, r.text
+
+    after = _plans(db, "A-001", "A-002", "A-003")
+    assert after["A-001"] == before["A-001"] - 500_000
+    assert after["A-002"] == 300_000
+    assert after["A-003"] == before["A-003"] + 200_000
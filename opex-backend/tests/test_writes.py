@@ -0,0 +1,69 @@
+# tests/test_writes.py
+"""쓰기 API 공통 마무리: 변경 알림은 commit 이후에 (다른 세션에서 새 버전이 보이는 시점에) 발행"""
+import pytest
+
+from app.core.database import ReadSessionLocal
+from app.core.events import EventBroker, broker
+from app.core.versioning import get_version
+
+YEAR = "2025"
+MONTH = f"{YEAR}11"
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """발행된 알림과, 발행 시점에 다른 세션에서 읽은 tb_monthly_data 버전"""
+    seen = []
+
+    def record(event):
+        with ReadSessionLocal() as session:
+            seen.append((event, get_version(session, "tb_monthly_data")))
+
+    monkeypatch.setattr(EventBroker, "client_count", property(lambda self: 1))
+    monkeypatch.setattr(broker, "publish", record)
+    return seen
+
+
+def _version(db):
+    db.expire_all()
+    return get_version(db, "tb_monthly_data")
+
+
+def test_cell_write_publishes_after_commit(client, db, events):
+    before = _version(db)
+    r = client.post("/api/v1/execution/update-forecast", json={"proj_id": "A-002", "yyyymm": MONTH, "est_amt": 1_234_000})
+    assert r.status_code == 200, r.text
+
+    (event, version), = events
+    assert event["table"] == "tb_monthly_data"
+    assert event["source"] == "update_forecast"
+    assert (event["yyyymm"], event["proj_ids"]) == ([MONTH], ["A-002"])
+    assert version == _version(db) == before + 1
+
+
+def test_project_write_publishes_after_commit(client, db, events):
+    before = _version(db)
+    r = client.patch("/api/v1/projects/B-002", json={"monthly_amounts": [5_000_000] * 12})
+    assert r.status_code == 200, r.text
+
+    (event, version), = events
+    assert event["table"] == "tb_project_master"
+    assert (event["source"], event["fiscal_year"], event["proj_ids"]) == ("project_update", YEAR, ["B-002"])
+    assert version == _version(db) == before + 1
+
+
+def test_closing_publishes_month(client, events):
+    r = client.post("/api/v1/closing/update", json={"yyyymm": MONTH, "status": "CLOSED"})
+    assert r.status_code == 200, r.text
+
+    (event, _), = events
+    assert event["table"] == "tb_monthly_close"
+    assert (event["fiscal_year"], event["yyyymm"]) == (YEAR, [MONTH])
+
+
+def test_rejected_write_publishes_nothing(client, events):
+    r = client.post("/api/v1/projects/transfer", json={
+        "from_proj_id": "A-001", "to_proj_id": "B-001", "transfer_amount": 10 ** 12, "transfer_yyyymm": MONTH,
+    })
+    assert r.status_code == 400
+    assert events == []